@@ -36,12 +36,28 @@ def create_app(config_name='default'):
     # Register error handlers
     register_error_handlers(app)
 
+    # Register CLI commands (flask --app run <command>)
+    from app.commands import register_commands
+    register_commands(app)
+
     # Create database tables if they don't exist
     # (In production, use migrations instead)
     with app.app_context():
         from app.models.database import init_db
         init_db()
 
+    # Bind a unit of work (one connection, one commit) to each request
+    from app.models.database import Database
+    Database.init_app(app)
+
+    # Opt-in per-request SQL profiling
+    from app.models.profiler import QueryProfiler
+    QueryProfiler.init_app(app)
+
+    # In-memory product typeahead index
+    from app.models.suggest import ProductSuggest
+    ProductSuggest.init_app(app)
+
     return app
 
 
@@ -55,6 +71,7 @@ def register_blueprints(app):
     from app.routes.transaction_routes import transaction_bp
     from app.routes.report_routes import report_bp
     from app.routes.auth_routes import auth_bp
+    from app.routes.system_routes import system_bp
 
     # Register API blueprints
     app.register_blueprint(product_bp, url_prefix='/api/products')
@@ -64,6 +81,7 @@ def register_blueprints(app):
     app.register_blueprint(transaction_bp, url_prefix='/api/transactions')
     app.register_blueprint(report_bp, url_prefix='/api/reports')
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(system_bp, url_prefix='/api/system')
 
     # Register main routes (for serving HTML pages)
     register_main_routes(app)
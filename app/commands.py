@@ -0,0 +1,195 @@
+"""
+CLI Commands
+============
+Maintenance commands run through the Flask CLI (flask --app run <command>)
+"""
+
+import os
+
+import click
+
+from app.models.bulk_import import IMPORT_FORMATS, BulkImporter, read_rows
+from app.models.daily_agg import TransactionDailyAgg
+from app.models.migrations import MigrationRunner
+from app.models.partitioning import TransactionArchive, TransactionPartitions
+from app.models import query_plans
+
+# Import format implied by a file extension
+EXTENSION_FORMATS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+
+def register_commands(app):
+    """Register the application's CLI commands"""
+    app.cli.add_command(import_data)
+    app.cli.add_command(migrations)
+    app.cli.add_command(transaction_partitions)
+    app.cli.add_command(transaction_agg)
+    app.cli.add_command(check_query_plans)
+
+
+@click.command('import-data')
+@click.argument('entity', type=click.Choice(list(BulkImporter.ENTITIES)))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(IMPORT_FORMATS),
+              help='File format (defaults to the file extension).')
+@click.option('--chunk-size', type=int, default=None, help='Rows per insert chunk (IMPORT_CHUNK_SIZE).')
+def import_data(entity, path, file_format, chunk_size):
+    """Bulk import categories, suppliers or products from a CSV / NDJSON file."""
+    file_format = file_format or EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower())
+    if file_format is None:
+        raise click.UsageError(f"Cannot tell the format of {path}, use --format")
+
+    def progress(report):
+        click.echo(f"  chunk {report['chunks']}: {report['rows']} rows read, "
+                   f"{report['imported']} imported, {report['failed']} failed")
+
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        report = BulkImporter(entity, chunk_size=chunk_size, progress=progress).run(read_rows(stream, file_format))
+
+    for error in report['errors']:
+        click.echo(f"  row {error['row']}: {error['error']}", err=True)
+    if report['failed'] > len(report['errors']):
+        click.echo(f"  ... {report['failed'] - len(report['errors'])} more errors", err=True)
+    click.echo(f"✓ Imported {report['imported']} of {report['rows']} {entity} in {report['elapsed_ms'] / 1000:.1f}s")
+
+
+@click.group('transaction-partitions')
+def transaction_partitions():
+    """Manage the monthly partitions of the transactions table."""
+
+
+@transaction_partitions.command('list')
+def list_partitions():
+    """Show partitions (with estimated rows) and archived months."""
+    for partition in TransactionPartitions.list():
+        click.echo(f"  {partition['partition']:<8} {partition['month'] or '':<8} ~{partition['rows']} rows")
+    months = TransactionArchive.months()
+    click.echo(f"Archived months: {', '.join(months) if months else 'none'}")
+
+
+@transaction_partitions.command('maintain')
+@click.option('--months-ahead', type=int, default=None,
+              help='Future months to create (TRANSACTION_PARTITION_MONTHS_AHEAD).')
+def maintain_partitions(months_ahead):
+    """Split partitions for the coming months off pmax (run monthly)."""
+    try:
+        created = TransactionPartitions.maintain(months_ahead)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"✓ Created {len(created)} partitions{': ' + ', '.join(created) if created else ''}")
+
+
+@transaction_partitions.command('archive')
+@click.option('--hot-months', type=int, default=None,
+              help='Months kept in the table, the current one included (TRANSACTION_HOT_MONTHS).')
+@click.option('--dry-run', is_flag=True, help='Only list the partitions that would be archived.')
+def archive_partitions(hot_months, dry_run):
+    """Move old months to gzip files in TRANSACTION_ARCHIVE_DIR and drop their partitions."""
+    if dry_run:
+        for partition in TransactionPartitions.archive(hot_months, dry_run=True):
+            click.echo(f"  would archive {partition['partition']} (~{partition['rows']} rows)")
+        return
+
+    try:
+        archived = TransactionPartitions.archive(hot_months)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    for partition in archived:
+        click.echo(f"  {partition['partition']}: {partition['rows']} rows -> {partition['file']} "
+                   f"({partition['bytes'] / 1024:.0f} KiB)")
+    click.echo(f"✓ Archived {len(archived)} partitions")
+
+
+@click.group('transaction-agg')
+def transaction_agg():
+    """Maintain the daily transaction aggregates read by summary reports."""
+
+
+@transaction_agg.command('backfill')
+@click.option('--start-date', type=click.DateTime(['%Y-%m-%d']), default=None,
+              help='First day (defaults to the oldest transaction).')
+@click.option('--end-date', type=click.DateTime(['%Y-%m-%d']), default=None, help='Last day (defaults to today).')
+@click.option('--chunk-days', type=int, default=None, help='Days per transaction (TRANSACTION_AGG_CHUNK_DAYS).')
+@click.option('--workers', type=int, default=None, help='Chunks rebuilt concurrently (TRANSACTION_AGG_WORKERS).')
+def backfill_agg(start_date, end_date, chunk_days, workers):
+    """Recompute transaction_daily_agg from raw transactions (idempotent)."""
+    def progress(chunk, rows):
+        click.echo(f"  {chunk[0]} .. {chunk[1]}: {rows} rows")
+
+    report = TransactionDailyAgg.backfill(
+        start_date.date() if start_date else None, end_date.date() if end_date else None,
+        chunk_days, workers, progress
+    )
+    click.echo(f"✓ Rebuilt {report['days']} days ({report['start_date']} to {report['end_date']}) in "
+               f"{report['chunks']} chunks: {report['rows']} rows in {report['elapsed_ms'] / 1000:.1f}s")
+
+
+@click.command('check-query-plans')
+@click.option('--max-rows', type=int, default=query_plans.DEFAULT_MAX_EXAMINED_ROWS,
+              help='Examined-row budget per statement.')
+@click.option('--scan-min-rows', type=int, default=query_plans.DEFAULT_SCAN_MIN_ROWS,
+              help='Tables estimated smaller than this may be scanned and sorted.')
+@click.option('--match', default=None, help='Only check shapes whose name contains this text.')
+@click.option('--verbose', is_flag=True, help='Also list the statements that pass.')
+def check_query_plans(max_rows, scan_min_rows, match, verbose):
+    """EXPLAIN every model query shape; exit 1 on scans, filesorts or row budget overruns."""
+    try:
+        shapes = query_plans.model_shapes(query_plans.sample_values())
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    for shape in shapes:
+        if shape.max_rows is not None:
+            shape.max_rows = max_rows
+    if match:
+        shapes = [shape for shape in shapes if match.lower() in shape.name.lower()]
+
+    results = query_plans.check_shapes(shapes, scan_min_rows)
+    failed = [result for result in results if result['violations']]
+    for result in results:
+        if result['violations']:
+            click.echo(f"✗ {result['shape']}: {'; '.join(result['violations'])}")
+            if result['sql']:
+                click.echo(f"    {result['sql'][:300]}")
+        elif verbose:
+            click.echo(f"✓ {result['shape']} (~{result['rows']} rows)")
+
+    click.echo(f"{len(shapes)} shapes, {len(results)} statements, {len(failed)} with plan violations")
+    if failed:
+        raise SystemExit(1)
+
+
+@click.group('migrations')
+def migrations():
+    """Apply and inspect the versioned scripts in database/migrations/."""
+
+
+@migrations.command('status')
+def migration_status():
+    """List migrations and when they were applied."""
+    for version, record in MigrationRunner().status():
+        if record is None:
+            click.echo(f"  pending  {version}")
+        else:
+            took = f" ({record['duration_ms']} ms)" if record['duration_ms'] is not None else ""
+            click.echo(f"  applied  {version}  {record['applied_at']}{took}")
+
+
+@migrations.command('apply')
+@click.option('--benchmark-runs', type=int, default=3, help='Runs per benchmark query (the best is recorded).')
+def apply_migrations(benchmark_runs):
+    """Apply pending migrations, timing their benchmark queries before and after."""
+    def progress(migration, record):
+        click.echo(f"✓ {migration.version} applied in {record['duration_ms']} ms")
+        for timing in record['timings']:
+            click.echo(f"    {timing['before_ms']:>10.3f} ms -> {timing['after_ms']:>10.3f} ms  {timing['query'][:80]}")
+
+    applied = MigrationRunner(benchmark_runs=benchmark_runs).apply(progress)
+    click.echo(f"{len(applied)} migrations applied" if applied else "Database is up to date")
+
+
+@migrations.command('baseline')
+@click.argument('version')
+def baseline_migrations(version):
+    """Record migrations up to VERSION (e.g. 003) as applied without running them."""
+    recorded = MigrationRunner().baseline(version)
+    click.echo(f"✓ Recorded {len(recorded)} migrations as applied{': ' + ', '.join(recorded) if recorded else ''}")
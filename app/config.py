@@ -11,6 +11,27 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def parse_replica_hosts(hosts, base_config):
+    """
+    Build read-replica connection configs from a host list
+
+    Args:
+        hosts (str): Comma-separated "host" or "host:port" entries
+        base_config (dict): Primary connection config to inherit credentials from
+
+    Returns:
+        list: One connection config dict per replica
+    """
+    replicas = []
+    for entry in (hosts or '').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, port = entry.partition(':')
+        replicas.append({**base_config, 'host': host, 'port': int(port or base_config['port'])})
+    return replicas
+
+
 class Config:
     """Base configuration class"""
 
@@ -31,6 +52,51 @@ class Config:
         'raise_on_warnings': True
     }
 
+    # Connection Pool Configuration
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_POOL_MAX_OVERFLOW = int(os.getenv('DB_POOL_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_PING_INTERVAL = int(os.getenv('DB_POOL_PING_INTERVAL', 60))
+    DB_POOL_RESET_SESSION = os.getenv('DB_POOL_RESET_SESSION', 'False') == 'True'
+
+    # Deadlock / lock wait timeout retries (attempts in total, first backoff in ms)
+    DB_RETRY_ATTEMPTS = int(os.getenv('DB_RETRY_ATTEMPTS', 4))
+    DB_RETRY_BACKOFF_MS = float(os.getenv('DB_RETRY_BACKOFF_MS', 20))
+
+    # Server-side prepared statements kept open per pooled connection
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', 64))
+
+    # Compiled SQL variants kept per process (least recently used are dropped)
+    QUERY_REGISTRY_MAX_SIZE = int(os.getenv('QUERY_REGISTRY_MAX_SIZE', 512))
+
+    # Read Replicas (SELECTs are routed here, writes always go to DB_CONFIG)
+    DB_REPLICAS = parse_replica_hosts(os.getenv('DB_REPLICA_HOSTS', ''), DB_CONFIG)
+
+    # After a write, keep reading from the primary for this many seconds
+    DB_READ_STICKY_SECONDS = float(os.getenv('DB_READ_STICKY_SECONDS', 5))
+
+    # Query Result Cache (per process; writes through this process invalidate it,
+    # writes made elsewhere become visible after the TTL)
+    QUERY_CACHE_ENABLED = os.getenv('QUERY_CACHE_ENABLED', 'True') == 'True'
+    QUERY_CACHE_MAX_ENTRIES = int(os.getenv('QUERY_CACHE_MAX_ENTRIES', 1024))
+    QUERY_CACHE_TTL = float(os.getenv('QUERY_CACHE_TTL', 60))
+
+    # Lifetime of cached list totals (exact counts and estimates); writes invalidate them
+    TOTAL_CACHE_TTL = float(os.getenv('TOTAL_CACHE_TTL', 300))
+
+    # SQL Profiler (per-request statement counts/timings in X-DB-* headers)
+    SQL_PROFILER_ENABLED = os.getenv('SQL_PROFILER_ENABLED', 'False') == 'True'
+    SQL_PROFILER_SAMPLE_RATE = float(os.getenv('SQL_PROFILER_SAMPLE_RATE', 0.01))
+    SQL_PROFILER_HISTORY = int(os.getenv('SQL_PROFILER_HISTORY', 200))
+    # Let clients force profiling with X-DB-Profile: 1 (profiles expose SQL text)
+    SQL_PROFILER_ALLOW_HEADER = os.getenv('SQL_PROFILER_ALLOW_HEADER', 'False') == 'True'
+
+    # Threads running independent queries of composite endpoints concurrently
+    PARALLEL_QUERY_WORKERS = int(os.getenv('PARALLEL_QUERY_WORKERS', 4))
+
+    # Share one connection and one commit across all model calls in a request
+    DB_REQUEST_UNIT_OF_WORK = os.getenv('DB_REQUEST_UNIT_OF_WORK', 'True') == 'True'
+
     # JWT Configuration
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
     JWT_EXPIRATION_HOURS = int(os.getenv('JWT_EXPIRATION_HOURS', 24))
@@ -42,6 +108,55 @@ class Config:
     # Pagination Settings
     ITEMS_PER_PAGE = 10
 
+    # Search: FULLTEXT (ngram) indexes from migration 002 (or a fresh schema.sql);
+    # off = legacy LIKE '%term%'. Enable only once the indexes exist
+    SEARCH_FULLTEXT_ENABLED = os.getenv('SEARCH_FULLTEXT_ENABLED', 'False') == 'True'
+    # Must match the server's ngram_token_size; shorter terms use prefix matching
+    SEARCH_NGRAM_SIZE = int(os.getenv('SEARCH_NGRAM_SIZE', 2))
+
+    # Product + stock lookup cache for id/SKU lookups (per process). A hit re-reads the
+    # inventory row unless PRODUCT_CACHE_VERIFY_STOCK is off (safe with a single process)
+    PRODUCT_CACHE_ENABLED = os.getenv('PRODUCT_CACHE_ENABLED', 'True') == 'True'
+    PRODUCT_CACHE_MAX_ENTRIES = int(os.getenv('PRODUCT_CACHE_MAX_ENTRIES', 10000))
+    PRODUCT_CACHE_TTL = float(os.getenv('PRODUCT_CACHE_TTL', 60))
+    PRODUCT_CACHE_VERIFY_STOCK = os.getenv('PRODUCT_CACHE_VERIFY_STOCK', 'True') == 'True'
+
+    # In-process product typeahead index (rebuilt every N seconds; 0 = only at startup)
+    SUGGEST_ENABLED = os.getenv('SUGGEST_ENABLED', 'True') == 'True'
+    SUGGEST_LIMIT = int(os.getenv('SUGGEST_LIMIT', 10))
+    SUGGEST_REFRESH_SECONDS = int(os.getenv('SUGGEST_REFRESH_SECONDS', 300))
+    # Candidates examined per requested suggestion before ranking
+    SUGGEST_SCAN_FACTOR = int(os.getenv('SUGGEST_SCAN_FACTOR', 20))
+
+    # Bulk import: rows inserted (and committed) per chunk, rejected rows listed in the report
+    IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', 1000))
+    IMPORT_MAX_ERRORS = int(os.getenv('IMPORT_MAX_ERRORS', 1000))
+
+    # Group commit: stock-in/out calls arriving within the window share one transaction
+    GROUP_COMMIT_ENABLED = os.getenv('GROUP_COMMIT_ENABLED', 'False') == 'True'
+    GROUP_COMMIT_WINDOW_MS = float(os.getenv('GROUP_COMMIT_WINDOW_MS', 5))
+    GROUP_COMMIT_MAX_BATCH = int(os.getenv('GROUP_COMMIT_MAX_BATCH', 200))
+
+    # Monthly transactions partitions: months created ahead, months kept before archival
+    TRANSACTION_PARTITION_MONTHS_AHEAD = int(os.getenv('TRANSACTION_PARTITION_MONTHS_AHEAD', 3))
+    TRANSACTION_HOT_MONTHS = int(os.getenv('TRANSACTION_HOT_MONTHS', 18))
+    TRANSACTION_ARCHIVE_DIR = os.getenv('TRANSACTION_ARCHIVE_DIR', 'archive/transactions')
+
+    # Daily aggregates (migration 005): reports read transaction_daily_agg for
+    # past days once enabled; enable only after `flask transaction-agg backfill`
+    TRANSACTION_AGG_ENABLED = os.getenv('TRANSACTION_AGG_ENABLED', 'False') == 'True'
+    TRANSACTION_AGG_CHUNK_DAYS = int(os.getenv('TRANSACTION_AGG_CHUNK_DAYS', 7))
+    TRANSACTION_AGG_WORKERS = int(os.getenv('TRANSACTION_AGG_WORKERS', 4))
+
+    # Most lines accepted by one batch stock movement request
+    MAX_BATCH_LINES = int(os.getenv('MAX_BATCH_LINES', 1000))
+
+    # Largest page any list endpoint returns, whatever the client asks for
+    MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 100))
+
+    # Rows fetched per round trip by streaming exports
+    STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', 1000))
+
     # File Upload Settings (if needed in future)
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max file size
 
@@ -0,0 +1,298 @@
+"""
+Bulk Import Module
+==================
+Streams CSV / NDJSON catalogs into categories, suppliers and products
+"""
+
+import csv
+import json
+import time
+from decimal import Decimal, InvalidOperation
+
+from app.config import Config
+from app.models.database import Database
+from app.models.suggest import ProductSuggest
+from mysql.connector import Error
+
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+
+def read_rows(stream, file_format):
+    """
+    Parse an import file one row at a time
+
+    Args:
+        stream (file): Text stream
+        file_format (str): 'csv' (header row first) or 'ndjson' (one object per line)
+
+    Yields:
+        tuple: (row number, dict) or (row number, error message)
+    """
+    if file_format == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            yield number, {key.strip(): value for key, value in row.items() if key}
+    elif file_format == 'ndjson':
+        number = 0
+        for line in stream:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield number, 'Invalid JSON'
+                continue
+            yield number, row if isinstance(row, dict) else 'Expected a JSON object'
+    else:
+        raise ValueError(f"Unsupported import format: {file_format}")
+
+
+class BulkImporter:
+    """
+    Chunked importer for one table
+
+    Rows are validated and converted in memory (category and supplier names
+    resolve through maps loaded once per import), then each chunk costs one
+    SELECT ... IN on the table's unique key to find collisions, one batched
+    INSERT through Database.execute_many and, for products, one id lookup
+    and one batched inventory INSERT. Every chunk commits on its own, so a
+    failing chunk is reported and the import carries on with the next one.
+    """
+
+    # table, unique key, inserted columns, required input fields
+    ENTITIES = {
+        'categories': {
+            'table': 'categories',
+            'key': 'category_name',
+            'columns': ('category_name', 'description'),
+            'required': ('category_name',)
+        },
+        'suppliers': {
+            'table': 'suppliers',
+            'key': 'email',
+            'columns': ('company_name', 'contact_person', 'phone', 'email',
+                        'address', 'city', 'state', 'postal_code'),
+            'required': ('company_name', 'contact_person', 'phone', 'email',
+                         'address', 'city', 'state', 'postal_code')
+        },
+        'products': {
+            'table': 'products',
+            'key': 'sku',
+            'columns': ('product_name', 'sku', 'description', 'category_id',
+                        'supplier_id', 'unit_price', 'reorder_level'),
+            'required': ('product_name', 'sku', 'unit_price')
+        }
+    }
+
+    def __init__(self, entity, chunk_size=None, progress=None):
+        """
+        Args:
+            entity (str): 'categories', 'suppliers' or 'products'
+            chunk_size (int): Rows per chunk (defaults to IMPORT_CHUNK_SIZE)
+            progress (callable): Called with the running report after each chunk
+        """
+        if entity not in self.ENTITIES:
+            raise ValueError(f"Unsupported import entity: {entity}")
+        self.entity = entity
+        self.spec = self.ENTITIES[entity]
+        self.chunk_size = chunk_size or Config.IMPORT_CHUNK_SIZE
+        self.progress = progress
+        self.report = {'entity': entity, 'rows': 0, 'imported': 0, 'failed': 0, 'chunks': 0, 'errors': []}
+        self._seen_keys = set()
+        self._category_ids = {}
+        self._supplier_ids = {}
+
+    def run(self, rows):
+        """
+        Import parsed rows
+
+        Args:
+            rows (iterable): (row number, dict or error message) pairs, see read_rows()
+
+        Returns:
+            dict: Report with row, imported and failed counts and per-row errors
+        """
+        start = time.perf_counter()
+        if self.entity == 'products':
+            self._load_reference_maps()
+
+        chunk = []
+        for number, row in rows:
+            self.report['rows'] += 1
+            if isinstance(row, str):
+                self._fail(number, row)
+                continue
+            try:
+                values = self._convert(row)
+            except ValueError as e:
+                self._fail(number, str(e), row.get(self.spec['key']))
+                continue
+
+            key = values[self.spec['key']].lower()
+            if key in self._seen_keys:
+                self._fail(number, f"Duplicate {self.spec['key']} in import", values[self.spec['key']])
+                continue
+            self._seen_keys.add(key)
+
+            chunk.append((number, values))
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk)
+
+        self.report['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        return self.report
+
+    def _load_reference_maps(self):
+        """Map category and supplier ids, names and emails (lower-cased) to ids"""
+        for row in Database.execute_query("SELECT category_id, category_name FROM categories"):
+            self._category_ids[row['category_id']] = row['category_id']
+            self._category_ids[row['category_name'].lower()] = row['category_id']
+
+        for row in Database.execute_query("SELECT supplier_id, company_name, email FROM suppliers"):
+            self._supplier_ids[row['supplier_id']] = row['supplier_id']
+            self._supplier_ids[row['email'].lower()] = row['supplier_id']
+            name = row['company_name'].lower()
+            # Company names are not unique; ambiguous names must be given by email or id
+            self._supplier_ids[name] = None if name in self._supplier_ids else row['supplier_id']
+
+    def _convert(self, row):
+        """
+        Validate one input row and build its column values
+
+        Raises:
+            ValueError: Missing or invalid field
+        """
+        row = {key: value.strip() if isinstance(value, str) else value for key, value in row.items()}
+        for field in self.spec['required']:
+            if row.get(field) in (None, ''):
+                raise ValueError(f"Missing required field: {field}")
+
+        values = {column: row.get(column) for column in self.spec['columns']}
+        values[self.spec['key']] = str(values[self.spec['key']])
+        if self.entity == 'categories':
+            values['description'] = values['description'] or ''
+        elif self.entity == 'products':
+            values['description'] = values['description'] or ''
+            values['category_id'] = self._resolve(row, 'category', self._category_ids, ('category_name',))
+            values['supplier_id'] = self._resolve(row, 'supplier', self._supplier_ids, ('supplier_email', 'supplier_name'))
+            try:
+                values['unit_price'] = Decimal(str(row['unit_price']))
+                values['reorder_level'] = int(row.get('reorder_level') or 10)
+                valid = values['unit_price'].is_finite()
+            except (InvalidOperation, ValueError):
+                valid = False
+            if not valid:
+                raise ValueError("unit_price and reorder_level must be numbers")
+            if values['unit_price'] < 0 or values['reorder_level'] < 0:
+                raise ValueError("unit_price and reorder_level cannot be negative")
+            values['warehouse_location'] = row.get('warehouse_location') or 'N/A'
+        return values
+
+    @staticmethod
+    def _resolve(row, name, ids, name_fields):
+        """
+        Resolve a category/supplier reference given by id, name or email
+
+        Args:
+            row (dict): Input row
+            name (str): 'category' or 'supplier'
+            ids (dict): Known ids and lower-cased names/emails -> id (None when ambiguous)
+            name_fields (tuple): Row fields that may carry the name or email
+
+        Returns:
+            int: Referenced id
+
+        Raises:
+            ValueError: Missing, unknown or ambiguous reference
+        """
+        if row.get(f'{name}_id') not in (None, ''):
+            try:
+                reference = int(row[f'{name}_id'])
+            except (TypeError, ValueError):
+                raise ValueError(f"{name}_id must be a number")
+        else:
+            reference = next((str(row[field]).lower() for field in name_fields if row.get(field) not in (None, '')), None)
+            if reference is None:
+                raise ValueError(f"Missing required field: {name}_id or {name_fields[0]}")
+
+        if reference not in ids:
+            raise ValueError(f"Unknown {name}: {reference}")
+        if ids[reference] is None:
+            raise ValueError(f"Ambiguous {name}: {reference}, give the {name}_id")
+        return ids[reference]
+
+    def _import_chunk(self, chunk):
+        """Drop rows colliding with existing keys, then insert the rest in one transaction"""
+        table, key = self.spec['table'], self.spec['key']
+        self.report['chunks'] += 1
+
+        failed_before, errors_before = self.report['failed'], len(self.report['errors'])
+        try:
+            with Database.transaction(independent=True):
+                keys = [values[key] for _, values in chunk]
+                existing = Database.execute_query(
+                    f"SELECT {key} FROM {table} WHERE {key} IN ({', '.join(['%s'] * len(keys))})",
+                    tuple(keys)
+                )
+                existing = {row[key].lower() for row in existing}
+
+                accepted = []
+                for number, values in chunk:
+                    if values[key].lower() in existing:
+                        self._fail(number, f"{key} already exists", values[key])
+                    else:
+                        accepted.append(values)
+                if accepted:
+                    self._insert(accepted)
+            self.report['imported'] += len(accepted)
+        except Error as e:
+            # The chunk was rolled back as a whole
+            self.report['failed'] = failed_before
+            del self.report['errors'][errors_before:]
+            for number, values in chunk:
+                self._fail(number, str(e), values[key])
+
+        if self.progress:
+            self.progress(self.report)
+
+    def _insert(self, rows):
+        """Insert accepted rows (and inventory records for products)"""
+        columns = self.spec['columns']
+        Database.execute_many(
+            f"INSERT INTO {self.spec['table']} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+            [tuple(values[column] for column in columns) for values in rows]
+        )
+        if self.entity != 'products':
+            return
+
+        skus = [values['sku'] for values in rows]
+        ids = Database.execute_query(
+            f"SELECT product_id, sku FROM products WHERE sku IN ({', '.join(['%s'] * len(skus))})",
+            tuple(skus)
+        )
+        ids = {row['sku'].lower(): row['product_id'] for row in ids}
+        Database.execute_many(
+            "INSERT INTO inventory (product_id, quantity_in_stock, warehouse_location) VALUES (%s, 0, %s)",
+            [(ids[values['sku'].lower()], values['warehouse_location']) for values in rows]
+        )
+
+        suggestions = [(ids[values['sku'].lower()], values['product_name'], values['sku']) for values in rows]
+        Database.after_commit(lambda: self._add_suggestions(suggestions))
+
+    @staticmethod
+    def _add_suggestions(suggestions):
+        """Add committed products to the typeahead index"""
+        for product_id, name, sku in suggestions:
+            ProductSuggest.add(product_id, name, sku)
+
+    def _fail(self, number, message, key=None):
+        """Record a failed row (the error list is capped at IMPORT_MAX_ERRORS)"""
+        self.report['failed'] += 1
+        if len(self.report['errors']) < Config.IMPORT_MAX_ERRORS:
+            error = {'row': number, 'error': message}
+            if key is not None:
+                error[self.spec['key']] = key
+            self.report['errors'].append(error)
@@ -5,6 +5,7 @@ Handles all category-related database operations
 """
 
 from app.models.database import Database
+from app.models.product_cache import ProductLookup
 from mysql.connector import Error
 
 
@@ -24,7 +25,7 @@ class Category:
                 GROUP BY c.category_id
                 ORDER BY c.category_name
             """
-            categories = Database.execute_query(query)
+            categories = Database.execute_query(query, cache_tags=('categories', 'products'))
             return {'success': True, 'data': categories}
         except Error as e:
             return {'success': False, 'error': str(e)}
@@ -34,7 +35,7 @@ class Category:
         """Get category by ID"""
         try:
             query = "SELECT * FROM categories WHERE category_id = %s"
-            category = Database.execute_query(query, (category_id,), fetch_one=True)
+            category = Database.execute_query(query, (category_id,), fetch_one=True, cache_tags=('categories',))
 
             if category:
                 return {'success': True, 'data': category}
@@ -75,6 +76,8 @@ class Category:
             rows_affected = Database.execute_update(query, params)
 
             if rows_affected > 0:
+                # Cached product lookups carry the category name
+                ProductLookup.clear()
                 return {'success': True, 'message': 'Category updated successfully'}
             else:
                 return {'success': False, 'error': 'Category not found'}
@@ -85,22 +88,23 @@ class Category:
     def delete(category_id):
         """Delete category"""
         try:
-            # Check if category has products
-            check_query = "SELECT COUNT(*) as count FROM products WHERE category_id = %s"
-            result = Database.execute_query(check_query, (category_id,), fetch_one=True)
+            with Database.transaction():
+                # Check if category has products
+                check_query = "SELECT COUNT(*) as count FROM products WHERE category_id = %s"
+                result = Database.execute_query(check_query, (category_id,), fetch_one=True)
 
-            if result['count'] > 0:
-                return {
-                    'success': False,
-                    'error': 'Cannot delete category with existing products'
-                }
+                if result['count'] > 0:
+                    return {
+                        'success': False,
+                        'error': 'Cannot delete category with existing products'
+                    }
 
-            query = "DELETE FROM categories WHERE category_id = %s"
-            rows_affected = Database.execute_update(query, (category_id,))
+                query = "DELETE FROM categories WHERE category_id = %s"
+                rows_affected = Database.execute_update(query, (category_id,))
 
-            if rows_affected > 0:
-                return {'success': True, 'message': 'Category deleted successfully'}
-            else:
-                return {'success': False, 'error': 'Category not found'}
+                if rows_affected > 0:
+                    return {'success': True, 'message': 'Category deleted successfully'}
+                else:
+                    return {'success': False, 'error': 'Category not found'}
         except Error as e:
             return {'success': False, 'error': str(e)}
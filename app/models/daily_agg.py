@@ -0,0 +1,118 @@
+"""
+Daily Transaction Aggregates Module
+===================================
+Backfill of transaction_daily_agg, the per-day rollup summary reports read
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+
+from app.config import Config
+from app.models.database import Database
+from app.models.partitioning import TransactionArchive, add_months
+
+
+REBUILD_DELETE_SQL = "DELETE FROM transaction_daily_agg WHERE agg_date >= %s AND agg_date < %s"
+
+REBUILD_INSERT_SQL = """
+    INSERT INTO transaction_daily_agg (agg_date, product_id, transaction_type, transaction_count, total_quantity)
+    SELECT DATE(transaction_date), product_id, transaction_type, COUNT(*), SUM(quantity)
+    FROM transactions
+    WHERE transaction_date >= %s AND transaction_date < %s
+    GROUP BY DATE(transaction_date), product_id, transaction_type
+"""
+
+
+class TransactionDailyAgg:
+    """
+    Rebuilds transaction_daily_agg from raw transactions
+
+    New transactions are added by triggers (migration 005); the backfill
+    fills in history by recomputing whole days, chunk_days at a time, each
+    chunk in its own transaction on a worker thread. Recomputing is
+    idempotent, so a backfill can be re-run or restricted to a date range
+    to repair aggregates. INSERT ... SELECT locks the transactions it reads,
+    so movements recorded while a chunk covering today is rebuilt are
+    counted exactly once. Archived months are never rebuilt: their raw rows
+    are gone and their aggregates are all that is left.
+    """
+
+    @staticmethod
+    def chunks(start, end, chunk_days):
+        """
+        Split an inclusive day range into chunks
+
+        Args:
+            start (date): First day
+            end (date): Last day
+            chunk_days (int): Days per chunk
+
+        Returns:
+            list: (first day, day after the last) pairs
+        """
+        chunks = []
+        day = start
+        while day <= end:
+            following = min(day + timedelta(days=chunk_days), end + timedelta(days=1))
+            chunks.append((day, following))
+            day = following
+        return chunks
+
+    @staticmethod
+    def backfill(start_date=None, end_date=None, chunk_days=None, workers=None, progress=None):
+        """
+        Recompute the aggregates of a day range
+
+        Args:
+            start_date (date): First day (defaults to the oldest transaction)
+            end_date (date): Last day, inclusive (defaults to today)
+            chunk_days (int): Days per transaction (TRANSACTION_AGG_CHUNK_DAYS)
+            workers (int): Chunks rebuilt concurrently (TRANSACTION_AGG_WORKERS)
+            progress (callable): Called with (chunk, rows written) as chunks finish
+
+        Returns:
+            dict: Days, chunks, aggregate rows written and elapsed time
+        """
+        chunk_days = chunk_days or Config.TRANSACTION_AGG_CHUNK_DAYS
+        workers = workers or Config.TRANSACTION_AGG_WORKERS
+        if start_date is None:
+            oldest = Database.execute_query(
+                "SELECT MIN(transaction_date) as oldest FROM transactions", fetch_one=True
+            )['oldest']
+            start_date = oldest.date() if oldest else date.today()
+        end_date = end_date or date.today()
+        archived = TransactionArchive.months()
+        if archived:
+            start_date = max(start_date, add_months(date.fromisoformat(f"{archived[-1]}-01"), 1))
+
+        chunks = TransactionDailyAgg.chunks(start_date, end_date, chunk_days)
+        started = time.perf_counter()
+        rows = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='agg-backfill') as executor:
+            futures = {
+                executor.submit(Database.run_with_retry, TransactionDailyAgg._rebuild, *chunk): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                written = future.result()
+                rows += written
+                if progress:
+                    progress(futures[future], written)
+
+        return {
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'days': (end_date - start_date).days + 1,
+            'chunks': len(chunks),
+            'rows': rows,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    @staticmethod
+    def _rebuild(first_day, following_day):
+        """Replace the aggregates of [first_day, following_day) in one transaction"""
+        with Database.transaction(independent=True):
+            Database.execute_update(REBUILD_DELETE_SQL, (first_day, following_day))
+            return Database.execute_update(REBUILD_INSERT_SQL, (first_day, following_day),
+                                           tables=('transaction_daily_agg',))
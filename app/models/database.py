@@ -4,37 +4,168 @@ Database Utility Module
 Manages database connections and provides utility functions
 """
 
-import mysql.connector
-from mysql.connector import pooling, Error
+import contextvars
+import itertools
+import random
+import re
+import threading
+import time
+from mysql.connector import Error
 from app.config import Config
+from app.models.pool import ConnectionPool
+from app.models.query_registry import PreparedStatementCursor
+from app.models.query_cache import QueryCache
+from app.models.profiler import QueryProfiler
 from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+
+# Table written by an INSERT / REPLACE / UPDATE / DELETE statement
+WRITE_TABLE_PATTERN = re.compile(
+    r"^\s*(?:INSERT(?:\s+IGNORE)?\s+INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)`?",
+    re.IGNORECASE
+)
+
+# Tables modified by each stored procedure (unknown procedures clear the whole cache)
+PROCEDURE_TABLES = {
+    'sp_record_stock_in': ('inventory', 'transactions'),
+    'sp_record_stock_out': ('inventory', 'transactions'),
+    'sp_adjust_stock': ('inventory', 'transactions'),
+    'sp_get_low_stock_products': (),
+    'sp_get_stock_valuation': (),
+    'sp_get_product_transaction_history': (),
+    'sp_get_transaction_summary': ()
+}
+
+# Result shapes of execute_query: a dict per row, or one column list plus tuple rows
+ROW_FORMATS = ('rows', 'columns')
+
+# Most sort keys accepted from a client (repeated columns are dropped first)
+MAX_SORT_COLUMNS = 3
+
+# How list endpoints compute their total: cached COUNT(*), planner estimate, or not at all
+TOTAL_MODES = ('exact', 'estimated', 'none')
+
+# Errors after which InnoDB has rolled the transaction back and it can simply be run again
+RETRYABLE_ERRORS = {
+    1213: 'deadlock',           # ER_LOCK_DEADLOCK
+    1205: 'lock wait timeout'   # ER_LOCK_WAIT_TIMEOUT
+}
+
+# Tables changed indirectly through ON DELETE CASCADE foreign keys
+CASCADE_TABLES = {
+    'products': ('inventory',)
+}
+
+
+class UnitOfWork:
+    """
+    One pooled connection shared by every statement until commit or rollback
+
+    The connection is checked out lazily on first use, so a request-scoped
+    unit of work that never touches the database costs nothing.
+    """
+
+    def __init__(self, explicit=False):
+        self.explicit = explicit
+        self.connection = None
+        self.rollback_only = False
+        self.wrote = False
+        self.callbacks = []
+        self.commit_callbacks = []
+
+    def get_connection(self):
+        """Check out the shared connection on first use"""
+        if self.connection is None:
+            self.connection = Database.get_connection()
+        return self.connection
+
+    def finish(self, commit=True):
+        """
+        Commit (or roll back) and return the connection to the pool
+
+        Args:
+            commit (bool): Commit unless the unit was marked rollback-only
+        """
+        connection, self.connection = self.connection, None
+        committed = False
+        try:
+            if connection is None:
+                committed = commit and not self.rollback_only
+            elif commit and not self.rollback_only:
+                connection.commit()
+                committed = True
+            else:
+                connection.rollback()
+        finally:
+            if connection is not None:
+                connection.close()
+            self._run_callbacks(committed)
+
+    def _run_callbacks(self, committed):
+        """Run callbacks registered with after_transaction() (and after_commit() on commit)"""
+        callbacks, self.callbacks = self.callbacks, []
+        commit_callbacks, self.commit_callbacks = self.commit_callbacks, []
+        if committed:
+            callbacks += commit_callbacks
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"✗ Error in after-transaction callback: {e}")
+
+
+class ReadState:
+    """
+    Read-your-writes state of the current request (or thread)
+
+    Held in a context variable so that it follows the request into
+    executor threads; workers update the same object.
+    """
+
+    def __init__(self, primary_until=0.0):
+        self.primary_until = primary_until
+        self.wrote = False
 
 
 class Database:
     """Database connection manager with connection pooling"""
 
     _connection_pool = None
+    _replica_pools = None
+    _query_cache = None
+    _replica_counter = itertools.count()
+    _pool_lock = threading.Lock()
+    _local = threading.local()
+    _read_state = contextvars.ContextVar('db_read_state', default=None)
+    _retry_stats = {'retries': 0, 'exhausted': 0}
+    _retry_lock = threading.Lock()
 
     @classmethod
     def get_connection_pool(cls):
         """
         Get or create connection pool
 
+        Pool size, overflow, wait timeout, idle keepalive ping and session
+        reset are read from Config (DB_POOL_* settings).
+
         Returns:
-            PooledMySQLConnection: Database connection pool
+            ConnectionPool: Database connection pool
         """
         if cls._connection_pool is None:
-            try:
-                cls._connection_pool = pooling.MySQLConnectionPool(
-                    pool_name="inventory_pool",
-                    pool_size=5,
-                    pool_reset_session=True,
-                    **Config.DB_CONFIG
-                )
-                print("✓ Database connection pool created successfully")
-            except Error as e:
-                print(f"✗ Error creating connection pool: {e}")
-                raise
+            with cls._pool_lock:
+                if cls._connection_pool is None:
+                    cls._connection_pool = ConnectionPool(
+                        Config.DB_CONFIG,
+                        pool_name="inventory_pool",
+                        pool_size=Config.DB_POOL_SIZE,
+                        max_overflow=Config.DB_POOL_MAX_OVERFLOW,
+                        timeout=Config.DB_POOL_TIMEOUT,
+                        ping_interval=Config.DB_POOL_PING_INTERVAL,
+                        reset_session=Config.DB_POOL_RESET_SESSION,
+                        statement_cache_size=Config.DB_STATEMENT_CACHE_SIZE
+                    )
+                    print("✓ Database connection pool created successfully")
 
         return cls._connection_pool
 
@@ -43,8 +174,10 @@ class Database:
         """
         Get a connection from the pool
 
+        Waits up to DB_POOL_TIMEOUT seconds when every connection is in use.
+
         Returns:
-            PooledMySQLConnection: Database connection
+            PooledConnection: Database connection
         """
         try:
             pool = cls.get_connection_pool()
@@ -54,25 +187,399 @@ class Database:
             print(f"✗ Error getting connection: {e}")
             raise
 
+    @classmethod
+    def get_replica_pools(cls):
+        """
+        Get or create one connection pool per configured read replica
+
+        Returns:
+            list: ConnectionPool per entry in Config.DB_REPLICAS
+        """
+        if cls._replica_pools is None:
+            with cls._pool_lock:
+                if cls._replica_pools is None:
+                    cls._replica_pools = [
+                        ConnectionPool(
+                            replica_config,
+                            pool_name=f"inventory_replica_{index}",
+                            pool_size=Config.DB_POOL_SIZE,
+                            max_overflow=Config.DB_POOL_MAX_OVERFLOW,
+                            timeout=Config.DB_POOL_TIMEOUT,
+                            ping_interval=Config.DB_POOL_PING_INTERVAL,
+                            reset_session=Config.DB_POOL_RESET_SESSION,
+                            statement_cache_size=Config.DB_STATEMENT_CACHE_SIZE
+                        )
+                        for index, replica_config in enumerate(Config.DB_REPLICAS, start=1)
+                    ]
+
+        return cls._replica_pools
+
+    @classmethod
+    def get_read_connection(cls):
+        """
+        Get a connection from a read replica (round robin)
+
+        Falls back to the next replica, and finally to the primary, when a
+        replica cannot hand out a connection.
+
+        Returns:
+            PooledConnection: Database connection
+        """
+        pools = cls.get_replica_pools()
+        for _ in range(len(pools)):
+            pool = pools[next(cls._replica_counter) % len(pools)]
+            try:
+                return pool.get_connection()
+            except Error as e:
+                print(f"✗ Replica {pool.pool_name} unavailable: {e}")
+        return cls.get_connection()
+
+    @classmethod
+    def get_pool_stats(cls):
+        """
+        Get live connection pool statistics
+
+        Returns:
+            dict: Primary and per-replica pool statistics, deadlock retry counters
+        """
+        with cls._retry_lock:
+            retries = dict(cls._retry_stats)
+        return {
+            'primary': cls.get_connection_pool().stats(),
+            'replicas': [pool.stats() for pool in cls.get_replica_pools()],
+            'retries': retries
+        }
+
+    @classmethod
+    def mark_write(cls):
+        """
+        Pin the caller's reads to the primary for the sticky window
+
+        For writes committed on the caller's behalf by another thread (see
+        GroupCommitQueue); statements run through get_cursor() mark
+        themselves.
+        """
+        cls._mark_write()
+
+    @classmethod
+    def _mark_write(cls):
+        """Pin reads on this thread to the primary for the sticky window"""
+        state = cls.read_state()
+        state.wrote = True
+        state.primary_until = time.time() + Config.DB_READ_STICKY_SECONDS
+
+    @classmethod
+    def read_state(cls):
+        """
+        Get the read-your-writes state of the current context
+
+        Returns:
+            ReadState: State object, created on first use
+        """
+        state = cls._read_state.get()
+        if state is None:
+            state = ReadState()
+            cls._read_state.set(state)
+        return state
+
+    @classmethod
+    def _reads_use_replica(cls, unit):
+        """
+        Decide whether a read may be served by a replica
+
+        Reads stay on the primary inside explicit transactions, after the
+        current unit of work has written, and for DB_READ_STICKY_SECONDS
+        after the caller's last write (read-your-writes).
+        """
+        if not Config.DB_REPLICAS:
+            return False
+        if unit is not None and (unit.explicit or unit.wrote):
+            return False
+        return time.time() >= cls.read_state().primary_until
+
+    @classmethod
+    def get_query_cache(cls):
+        """
+        Get or create the query result cache
+
+        Returns:
+            QueryCache: Process-wide result cache
+        """
+        if cls._query_cache is None:
+            with cls._pool_lock:
+                if cls._query_cache is None:
+                    cls._query_cache = QueryCache(
+                        max_entries=Config.QUERY_CACHE_MAX_ENTRIES,
+                        default_ttl=Config.QUERY_CACHE_TTL
+                    )
+        return cls._query_cache
+
+    @classmethod
+    def invalidate_tables(cls, tables):
+        """
+        Drop cached reads of the given tables
+
+        Inside a unit of work the entries are dropped again when it ends, so
+        a read racing the uncommitted write cannot leave a stale entry behind.
+
+        Args:
+            tables (iterable): Table names that were written
+        """
+        tables = set(tables)
+        for table in list(tables):
+            tables.update(CASCADE_TABLES.get(table, ()))
+        if not tables:
+            return
+
+        cache = cls.get_query_cache()
+        cache.invalidate_tables(tables)
+        if cls.current_unit() is not None:
+            cls.after_transaction(lambda: cache.invalidate_tables(tables))
+
+    @classmethod
+    def after_transaction(cls, callback):
+        """
+        Run a callback once the current unit of work commits or rolls back
+
+        Runs immediately when no unit of work is active.
+
+        Args:
+            callback (callable): Function taking no arguments
+        """
+        unit = cls.current_unit()
+        if unit is None:
+            callback()
+        else:
+            unit.callbacks.append(callback)
+
+    @classmethod
+    def after_commit(cls, callback):
+        """
+        Run a callback once the current unit of work commits
+
+        The callback is dropped if the unit rolls back. Runs immediately when
+        no unit of work is active (the write has already been committed).
+
+        Args:
+            callback (callable): Function taking no arguments
+        """
+        unit = cls.current_unit()
+        if unit is None:
+            callback()
+        else:
+            unit.commit_callbacks.append(callback)
+
+    @classmethod
+    def current_unit(cls):
+        """
+        Get the unit of work bound to the current thread
+
+        Returns:
+            UnitOfWork: Active unit of work, or None
+        """
+        return getattr(cls._local, 'unit', None)
+
+    @classmethod
+    @contextmanager
+    def transaction(cls, independent=False):
+        """
+        Run a block of model calls as a single unit of work
+
+        Every statement inside the block reuses one pooled connection and is
+        committed once when the block exits. If any statement fails, or the
+        block raises, everything is rolled back. Nested blocks (including a
+        block inside a request-scoped unit of work) join the outer unit, which
+        decides the final commit, unless independent is set: the outer unit
+        is then set aside and the block commits on its own connection.
+
+        Args:
+            independent (bool): Commit the block separately from any outer unit
+
+        Yields:
+            UnitOfWork: The active unit of work
+        """
+        previous = cls.current_unit()
+        unit = previous
+        owner = unit is None or independent
+        if owner:
+            unit = UnitOfWork(explicit=True)
+            cls._local.unit = unit
+        try:
+            yield unit
+        except Exception:
+            unit.rollback_only = True
+            raise
+        finally:
+            if owner:
+                cls._local.unit = previous
+                unit.finish()
+
+    @classmethod
+    @contextmanager
+    def snapshot(cls):
+        """
+        Run a block of reads inside one consistent-snapshot transaction
+
+        The block gets its own primary connection in a READ ONLY transaction
+        started WITH CONSISTENT SNAPSHOT, so every query sees the database as
+        of the same instant. Any unit of work already bound to the thread is
+        set aside for the duration of the block (its uncommitted writes are
+        not visible) and restored afterwards.
+
+        Yields:
+            UnitOfWork: The read-only unit of work
+        """
+        previous = cls.current_unit()
+        unit = UnitOfWork(explicit=True)
+        cls._local.unit = unit
+        try:
+            unit.get_connection().start_transaction(consistent_snapshot=True, readonly=True)
+            yield unit
+        finally:
+            cls._local.unit = previous
+            unit.finish(commit=False)
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Bind a request-scoped unit of work to every Flask request
+
+        All model calls made while handling a request share one connection,
+        which is committed once before the response is sent. Disabled when
+        DB_REQUEST_UNIT_OF_WORK is False.
+
+        Args:
+            app (Flask): Application instance
+        """
+        if app.config.get('DB_REPLICAS'):
+            cls._init_read_stickiness(app)
+
+        if not app.config.get('DB_REQUEST_UNIT_OF_WORK', True):
+            return
+
+        from flask import jsonify
+
+        @app.before_request
+        def begin_unit_of_work():
+            cls._local.unit = UnitOfWork()
+
+        @app.after_request
+        def commit_unit_of_work(response):
+            unit = cls.current_unit()
+            if unit is None:
+                return response
+            cls._local.unit = None
+            try:
+                unit.finish(commit=response.status_code < 500)
+            except Error as e:
+                print(f"✗ Error committing request transaction: {e}")
+                return jsonify({'success': False, 'error': str(e)}), 500
+            return response
+
+        @app.teardown_request
+        def release_unit_of_work(exc):
+            unit = cls.current_unit()
+            if unit is None:
+                return
+            cls._local.unit = None
+            try:
+                unit.finish(commit=False)
+            except Error as e:
+                print(f"✗ Error releasing request transaction: {e}")
+
+    @classmethod
+    def _init_read_stickiness(cls, app):
+        """
+        Carry the read-your-writes window across requests in a cookie
+
+        A client that has just written keeps reading from the primary for
+        DB_READ_STICKY_SECONDS, even when its next request lands on another
+        worker thread or process.
+        """
+        from flask import request
+
+        cookie_name = 'db_primary_until'
+
+        @app.before_request
+        def restore_read_stickiness():
+            try:
+                primary_until = float(request.cookies.get(cookie_name, 0))
+            except ValueError:
+                primary_until = 0
+            cls._read_state.set(ReadState(min(primary_until, time.time() + Config.DB_READ_STICKY_SECONDS)))
+
+        @app.after_request
+        def persist_read_stickiness(response):
+            state = cls.read_state()
+            if state.wrote:
+                response.set_cookie(
+                    cookie_name, f"{state.primary_until:.3f}",
+                    max_age=int(Config.DB_READ_STICKY_SECONDS) + 1, httponly=True, samesite='Lax'
+                )
+            return response
+
     @classmethod
     @contextmanager
-    def get_cursor(cls, dictionary=True, buffered=True):
+    def get_cursor(cls, dictionary=True, buffered=True, read_only=False, prepared=False,
+                   tolerate_warnings=False):
         """
         Context manager for database cursor with automatic connection management
 
+        Inside a unit of work the cursor runs on the unit's shared connection
+        and nothing is committed here; otherwise a connection is checked out,
+        committed and returned to the pool around the single cursor.
+        Read-only cursors are served by a replica when one is configured and
+        the caller has not written recently. When the current request is being
+        profiled, the cursor records every statement it runs.
+
         Args:
             dictionary (bool): Return results as dictionaries
             buffered (bool): Use buffered cursor
+            read_only (bool): Statement only reads, may run on a replica
+            prepared (bool): Execute as cached server-side prepared statements
+            tolerate_warnings (bool): Do not raise on warnings (raise_on_warnings)
 
         Yields:
             cursor: Database cursor
         """
+        unit = cls.current_unit()
+        use_replica = read_only and cls._reads_use_replica(unit)
+        if not read_only:
+            cls._mark_write()
+
+        if unit is not None and not use_replica:
+            if not read_only:
+                unit.wrote = True
+            cursor = None
+            try:
+                fresh = unit.connection is None
+                connection = unit.get_connection()
+                cursor = cls._open_cursor(connection, dictionary, buffered, prepared)
+                cursor = QueryProfiler.wrap_cursor(cursor, connection.wait_ms if fresh else 0.0)
+                with cls._warning_mode(connection, tolerate_warnings):
+                    yield cursor
+            except Error as e:
+                # A failed statement is undone on its own; the unit only has to
+                # roll back when InnoDB already rolled back the whole transaction.
+                # Errors leaving a transaction() block mark it there, so models
+                # that catch an error and carry on keep the unit's other writes.
+                if e.errno in RETRYABLE_ERRORS:
+                    unit.rollback_only = True
+                print(f"✗ Database error: {e}")
+                raise
+            finally:
+                if cursor:
+                    cursor.close()
+            return
+
         connection = None
         cursor = None
         try:
-            connection = cls.get_connection()
-            cursor = connection.cursor(dictionary=dictionary, buffered=buffered)
-            yield cursor
+            connection = cls.get_read_connection() if use_replica else cls.get_connection()
+            cursor = cls._open_cursor(connection, dictionary, buffered, prepared)
+            cursor = QueryProfiler.wrap_cursor(cursor, connection.wait_ms)
+            with cls._warning_mode(connection, tolerate_warnings):
+                yield cursor
             connection.commit()
         except Error as e:
             if connection:
@@ -85,62 +592,257 @@ class Database:
             if connection:
                 connection.close()
 
+    @staticmethod
+    @contextmanager
+    def _warning_mode(connection, tolerate_warnings):
+        """Suspend raise_on_warnings on the connection while a tolerant cursor is in use"""
+        if not tolerate_warnings:
+            yield
+            return
+        with connection.warnings_tolerated():
+            yield
+
+    @staticmethod
+    def _open_cursor(connection, dictionary, buffered, prepared):
+        """Open a plain cursor, or a facade over the connection's statement cache"""
+        if prepared:
+            return PreparedStatementCursor(connection.statement_cache(), dictionary)
+        return connection.cursor(dictionary=dictionary, buffered=buffered)
+
     @classmethod
-    def execute_query(cls, query, params=None, fetch_one=False):
+    def execute_query(cls, query, params=None, fetch_one=False, prepared=False,
+                      cache_tags=None, cache_ttl=None, row_format='rows', tolerate_warnings=False):
         """
         Execute a SELECT query and return results
 
+        Runs on a read replica when configured (see get_cursor). Passing
+        cache_tags serves the result from the query cache; any write to one
+        of those tables invalidates it. The 'columns' row format skips the
+        per-row dictionaries: column names are returned once and each row is
+        a plain tuple, which is much smaller for large pages.
+
         Args:
             query (str): SQL query
             params (tuple): Query parameters
             fetch_one (bool): Return single row instead of all rows
+            prepared (bool): Run as a cached server-side prepared statement
+            cache_tags (tuple): Tables the query reads, enables result caching
+            cache_ttl (float): Cache lifetime in seconds (defaults to QUERY_CACHE_TTL)
+            row_format (str): 'rows' (dict per row) or 'columns'
+                ({'columns': [...], 'rows': [tuple, ...]}, fetch_one is ignored)
+            tolerate_warnings (bool): Do not raise on warnings, e.g. the notes of EXPLAIN
 
         Returns:
             dict or list: Query results
         """
-        with cls.get_cursor() as cursor:
-            cursor.execute(query, params or ())
-            if fetch_one:
-                return cursor.fetchone()
-            return cursor.fetchall()
+        if row_format not in ROW_FORMATS:
+            raise ValueError(f"Unsupported row format: {row_format}")
+        columnar = row_format == 'columns'
+        params = tuple(params or ())
+        cache = None
+        if cache_tags and cls._cache_allowed():
+            cache = cls.get_query_cache()
+            key = (query, params, fetch_one, row_format)
+            found, result = cache.get(key)
+            if found:
+                return cls._copy_result(result)
+            versions = cache.versions(cache_tags)
+
+        with cls.get_cursor(dictionary=not columnar, read_only=True, prepared=prepared,
+                            tolerate_warnings=tolerate_warnings) as cursor:
+            cursor.execute(query, params)
+            if columnar:
+                result = {'columns': list(cursor.column_names), 'rows': cursor.fetchall()}
+            else:
+                result = cursor.fetchone() if fetch_one else cursor.fetchall()
+
+        if cache is not None:
+            cache.set(key, result, tuple(cache_tags), versions, cache_ttl)
+            return cls._copy_result(result)
+        return result
+
+    @classmethod
+    def iter_query(cls, query, params=None, chunk_size=None, dictionary=True):
+        """
+        Stream the rows of a SELECT query
+
+        Rows are read through an unbuffered cursor, chunk_size rows per fetch,
+        on a dedicated connection (a replica when one may serve the read), so
+        memory stays flat however large the result is. The connection is held
+        until the generator is exhausted or closed; a generator abandoned
+        halfway closes its connection rather than draining the remaining rows.
+
+        Args:
+            query (str): SQL query
+            params (tuple): Query parameters
+            chunk_size (int): Rows per fetch (defaults to STREAM_CHUNK_SIZE)
+            dictionary (bool): Yield rows as dictionaries
+
+        Yields:
+            dict or tuple: One row at a time
+        """
+        chunk_size = chunk_size or Config.STREAM_CHUNK_SIZE
+        use_replica = cls._reads_use_replica(cls.current_unit())
+        connection = cls.get_read_connection() if use_replica else cls.get_connection()
+        cursor = None
+        exhausted = False
+        try:
+            cursor = connection.cursor(dictionary=dictionary, buffered=False)
+            cursor = QueryProfiler.wrap_cursor(cursor, connection.wait_ms)
+            cursor.execute(query, tuple(params or ()))
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+            exhausted = True
+        except Error as e:
+            print(f"✗ Database error: {e}")
+            raise
+        finally:
+            if exhausted:
+                cursor.close()
+                connection.close()
+            else:
+                # Unread rows are still on the wire; drop the connection
+                connection.invalidate()
+
+    @classmethod
+    def _cache_allowed(cls):
+        """Cached results must not mix with uncommitted writes of the current unit"""
+        if not Config.QUERY_CACHE_ENABLED:
+            return False
+        unit = cls.current_unit()
+        return unit is None or not (unit.explicit or unit.wrote)
+
+    @staticmethod
+    def _copy_result(result):
+        """Copy cached rows so callers can modify them freely"""
+        if isinstance(result, list):
+            return [dict(row) if isinstance(row, dict) else row for row in result]
+        if isinstance(result, dict):
+            copy = dict(result)
+            # Columnar results: tuple rows are immutable, the lists are not
+            for key in ('columns', 'rows'):
+                if isinstance(copy.get(key), list):
+                    copy[key] = list(copy[key])
+            return copy
+        return result
+
+    @classmethod
+    def count_total(cls, count_query, params, include_total='exact', tables=()):
+        """
+        Get the total row count of a filtered list
+
+        - exact: runs the COUNT(*) query; the result is cached per filter
+          values and invalidated by any write to one of the tables
+        - estimated: the optimizer's row estimate for the same query, taken
+          from table and index statistics (EXPLAIN), cached the same way;
+          falls back to the exact count if the EXPLAIN fails
+        - none: no count at all
+
+        Args:
+            count_query (str): SELECT COUNT(*) as total ... query
+            params (tuple): Filter parameters
+            include_total (str): 'exact', 'estimated' or 'none'
+            tables (tuple): Tables the count reads (cache tags)
+
+        Returns:
+            int: Total rows, or None for 'none'
+        """
+        if include_total not in TOTAL_MODES:
+            raise ValueError(f"Unsupported include_total: {include_total}")
+        if include_total == 'none':
+            return None
+        if include_total == 'estimated':
+            try:
+                return cls.estimate_count(count_query, params, tables)
+            except Error as e:
+                print(f"✗ Row estimate failed, counting exactly: {e}")
+
+        result = cls.execute_query(count_query, params, fetch_one=True, prepared=True,
+                                   cache_tags=tables, cache_ttl=Config.TOTAL_CACHE_TTL)
+        return result['total'] if result else 0
+
+    @classmethod
+    def estimate_count(cls, query, params=None, tables=()):
+        """
+        Estimate how many rows a query matches without running it
+
+        Multiplies rows x filtered% of every table in the EXPLAIN plan (the
+        join fan-out the optimizer itself assumes). Accuracy follows InnoDB
+        statistics; run ANALYZE TABLE after bulk changes.
+
+        Args:
+            query (str): SELECT query
+            params (tuple): Query parameters
+            tables (tuple): Tables the query reads (cache tags)
+
+        Returns:
+            int: Estimated row count
+        """
+        plan = cls.execute_query(f"EXPLAIN {query}", params, cache_tags=tables or None,
+                                 cache_ttl=Config.TOTAL_CACHE_TTL, tolerate_warnings=True)
+        estimate = 1.0
+        for step in plan:
+            estimate *= float(step.get('rows') or 0) * float(step.get('filtered') or 100) / 100
+        return int(round(estimate)) if plan else 0
 
     @classmethod
-    def execute_update(cls, query, params=None):
+    def execute_update(cls, query, params=None, tables=None):
         """
         Execute INSERT, UPDATE, or DELETE query
 
+        Invalidates cached reads of the written table.
+
         Args:
             query (str): SQL query
             params (tuple): Query parameters
+            tables (tuple): Tables written (detected from the SQL by default)
 
         Returns:
             int: Last inserted ID or rows affected
         """
         with cls.get_cursor() as cursor:
             cursor.execute(query, params or ())
-            return cursor.lastrowid or cursor.rowcount
+            result = cursor.lastrowid or cursor.rowcount
+        cls._invalidate_after_write(query, tables)
+        return result
 
     @classmethod
-    def execute_many(cls, query, params_list):
+    def execute_many(cls, query, params_list, tables=None):
         """
         Execute query with multiple parameter sets
 
+        Invalidates cached reads of the written table.
+
         Args:
             query (str): SQL query
             params_list (list): List of parameter tuples
+            tables (tuple): Tables written (detected from the SQL by default)
 
         Returns:
             int: Rows affected
         """
         with cls.get_cursor() as cursor:
             cursor.executemany(query, params_list)
-            return cursor.rowcount
+            result = cursor.rowcount
+        cls._invalidate_after_write(query, tables)
+        return result
 
     @classmethod
     def call_procedure(cls, proc_name, params=None):
         """
         Call a stored procedure
 
+        Note: the inventory procedures run their own START TRANSACTION /
+        COMMIT, which implicitly commits any earlier statements of an
+        enclosing unit of work.
+
+        Cached reads of the tables the procedure modifies are invalidated
+        (see PROCEDURE_TABLES). A call that hits a deadlock or lock wait
+        timeout is run again (see run_with_retry).
+
         Args:
             proc_name (str): Procedure name
             params (tuple): Procedure parameters
@@ -148,12 +850,75 @@ class Database:
         Returns:
             list: Results from procedure
         """
-        with cls.get_cursor() as cursor:
-            cursor.callproc(proc_name, params or ())
-            results = []
-            for result in cursor.stored_results():
-                results.extend(result.fetchall())
-            return results
+        unit = cls.current_unit()
+        rollback_only = unit.rollback_only if unit is not None else False
+
+        def call():
+            try:
+                with cls.get_cursor() as cursor:
+                    cursor.callproc(proc_name, params or ())
+                    results = []
+                    for result in cursor.stored_results():
+                        results.extend(result.fetchall())
+                return results
+            except Error as e:
+                # The procedure rolled back only its own transaction (earlier
+                # statements of the unit were committed when it started)
+                if unit is not None and e.errno in RETRYABLE_ERRORS:
+                    unit.rollback_only = rollback_only
+                raise
+
+        results = cls.run_with_retry(call)
+
+        if proc_name in PROCEDURE_TABLES:
+            cls.invalidate_tables(PROCEDURE_TABLES[proc_name])
+        else:
+            cls.get_query_cache().clear()
+        return results
+
+    @classmethod
+    def run_with_retry(cls, func, *args, **kwargs):
+        """
+        Run a transaction, running it again after a deadlock or lock wait timeout
+
+        InnoDB rolls back the whole transaction of a deadlock victim, so func
+        must be a complete transaction of its own: a procedure call, or a
+        block committed by Database.transaction(independent=True). Retries
+        back off exponentially with jitter (DB_RETRY_BACKOFF_MS) up to
+        DB_RETRY_ATTEMPTS attempts in total.
+
+        Args:
+            func (callable): Transaction to run
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+        """
+        attempts = max(Config.DB_RETRY_ATTEMPTS, 1)
+        for attempt in range(1, attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except Error as e:
+                if e.errno not in RETRYABLE_ERRORS:
+                    raise
+                with cls._retry_lock:
+                    cls._retry_stats['exhausted' if attempt == attempts else 'retries'] += 1
+                if attempt == attempts:
+                    raise
+                print(f"↻ Retrying after {RETRYABLE_ERRORS[e.errno]} (attempt {attempt} of {attempts})")
+                time.sleep(Config.DB_RETRY_BACKOFF_MS / 1000 * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+    @classmethod
+    def _invalidate_after_write(cls, query, tables=None):
+        """Invalidate cached reads of the tables a statement wrote"""
+        if not tables:
+            match = WRITE_TABLE_PATTERN.match(query)
+            tables = (match.group(1).lower(),) if match else None
+        if tables:
+            cls.invalidate_tables(tables)
+        else:
+            cls.get_query_cache().clear()
 
     @classmethod
     def test_connection(cls):
@@ -191,6 +956,131 @@ def init_db():
 
 
 # Utility functions for common operations
+def split_page(result, per_page):
+    """
+    Trim the look-ahead row from a page fetched with LIMIT per_page + 1
+
+    Args:
+        result (list or dict): Rows, or a columnar result
+        per_page (int): Page size
+
+    Returns:
+        tuple: (page result, whether more rows follow)
+    """
+    rows = result['rows'] if isinstance(result, dict) else result
+    has_more = len(rows) > per_page
+    if isinstance(result, dict):
+        return {'columns': result['columns'], 'rows': rows[:per_page]}, has_more
+    return rows[:per_page], has_more
+
+
+def clamp_page_size(per_page):
+    """
+    Limit a requested page size to 1..MAX_PAGE_SIZE
+
+    Args:
+        per_page (int): Requested items per page
+
+    Returns:
+        int: Page size the server will return
+    """
+    return max(1, min(per_page, Config.MAX_PAGE_SIZE))
+
+
+def date_range_conditions(column, start_date=None, end_date=None):
+    """
+    Build an index-friendly filter for an inclusive range of calendar dates
+
+    DATE(column) >= %s cannot use an index on column (nor prune partitions);
+    the same days as a half-open timestamp range can:
+    column >= start 00:00:00 AND column < the day after end.
+
+    Args:
+        column (str): Timestamp column, e.g. 't.transaction_date'
+        start_date (str): First day (YYYY-MM-DD), or None
+        end_date (str): Last day (YYYY-MM-DD, inclusive), or None
+
+    Returns:
+        tuple: (conditions list, params list)
+
+    Raises:
+        ValueError: Date not in YYYY-MM-DD format
+    """
+    conditions = []
+    params = []
+    try:
+        if start_date:
+            conditions.append(f"{column} >= %s")
+            params.append(datetime.combine(date.fromisoformat(start_date), datetime.min.time()))
+        if end_date:
+            conditions.append(f"{column} < %s")
+            params.append(datetime.combine(date.fromisoformat(end_date) + timedelta(days=1), datetime.min.time()))
+    except (TypeError, ValueError):
+        raise ValueError("Dates must be in YYYY-MM-DD format")
+    return conditions, params
+
+
+def build_order_by(sort, sort_columns, tiebreaker):
+    """
+    Build an ORDER BY clause from client sort keys through a whitelist
+
+    A column repeated later in the list is ignored (only its first, most
+    significant occurrence affects the order).
+
+    Args:
+        sort (list): (column, 'asc' or 'desc') pairs, most significant first
+        sort_columns (dict): Sortable column name -> SQL expression
+        tiebreaker (str): Unique expression appended so paging is stable
+
+    Returns:
+        str: ORDER BY clause body
+
+    Raises:
+        ValueError: Unknown column or direction, or more than MAX_SORT_COLUMNS columns
+    """
+    clauses = []
+    seen = set()
+    for column, direction in sort:
+        expression = sort_columns.get(column)
+        if expression is None:
+            raise ValueError(f"Cannot sort by: {column}")
+        direction = str(direction).upper()
+        if direction not in ('ASC', 'DESC'):
+            raise ValueError(f"Invalid sort direction: {direction}")
+        if column in seen:
+            continue
+        seen.add(column)
+        clauses.append(f"{expression} {direction}")
+    if len(clauses) > MAX_SORT_COLUMNS:
+        raise ValueError(f"Cannot sort by more than {MAX_SORT_COLUMNS} columns")
+    clauses.append(tiebreaker)
+    return ", ".join(clauses)
+
+
+def offset_pagination(page, per_page, total, include_total, has_more):
+    """
+    Build the pagination block of an offset-paginated list response
+
+    Args:
+        page (int): Page number
+        per_page (int): Items per page
+        total (int): Total rows (None when not computed)
+        include_total (str): How total was computed, see TOTAL_MODES
+        has_more (bool): Whether another page follows
+
+    Returns:
+        dict: Pagination info
+    """
+    return {
+        'page': page,
+        'per_page': per_page,
+        'total': total,
+        'pages': (total + per_page - 1) // per_page if total is not None else None,
+        'total_mode': include_total,
+        'has_more': has_more
+    }
+
+
 def paginate_query(query, page=1, per_page=10):
     """
     Add pagination to SQL query
@@ -0,0 +1,118 @@
+"""
+Group Commit Module
+===================
+Batches concurrent writes into one database transaction (one commit)
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from app.models.database import Database
+
+
+class GroupCommitQueue:
+    """
+    Write queue that commits the items of concurrent callers together
+
+    Callers submit an item and block on the returned future. A single writer
+    thread takes the first waiting item, collects whatever else arrives
+    within window_ms (up to max_batch items), applies the whole group inside
+    one transaction and hands every caller its own result once the commit
+    is done. Writes that arrive while a group is being committed form the
+    next group, so under load the number of commits (and log flushes)
+    grows much slower than the number of writes.
+    """
+
+    def __init__(self, apply_batch, window_ms=5, max_batch=200, name='group-commit'):
+        """
+        Args:
+            apply_batch (callable): Takes the list of items, runs inside the
+                group's transaction and returns one result per item
+            window_ms (float): How long to wait for more items after the first
+            max_batch (int): Most items per transaction
+            name (str): Writer thread name
+        """
+        self.apply_batch = apply_batch
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {'items': 0, 'batches': 0, 'failed_batches': 0, 'largest_batch': 0}
+
+    def submit(self, item):
+        """
+        Queue an item for the next group commit
+
+        Args:
+            item: Value passed to apply_batch
+
+        Returns:
+            Future: Resolves to the item's result after its group commits,
+                or to the exception that rolled the group back
+        """
+        self._ensure_writer()
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def stats(self):
+        """
+        Get queue counters
+
+        Returns:
+            dict: Items, batches, failed batches, largest and average batch size
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['average_batch'] = round(stats['items'] / stats['batches'], 2) if stats['batches'] else 0
+        stats['pending'] = self._queue.qsize()
+        return stats
+
+    def _ensure_writer(self):
+        """Start the writer thread on first use"""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        """Writer loop: collect a group, commit it, repeat"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._commit(batch)
+
+    def _apply(self, items):
+        """Run apply_batch in its own transaction"""
+        with Database.transaction(independent=True):
+            return self.apply_batch(items)
+
+    def _commit(self, batch):
+        """Apply one group in a single transaction and resolve its futures"""
+        items = [item for item, _ in batch]
+        try:
+            results = Database.run_with_retry(self._apply, items)
+        except Exception as e:
+            with self._lock:
+                self._stats['failed_batches'] += 1
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self._stats['items'] += len(batch)
+            self._stats['batches'] += 1
+            self._stats['largest_batch'] = max(self._stats['largest_batch'], len(batch))
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
@@ -4,88 +4,198 @@ Inventory Model
 Handles all inventory-related database operations
 """
 
-from app.models.database import Database
+from app.models.database import (
+    Database, build_order_by, clamp_page_size, offset_pagination, split_page
+)
+from app.models.keyset import KeysetPager
+from app.models.product_cache import ProductLookup
+from app.models.query_registry import QueryRegistry
+from app.models.search import PRODUCT_SEARCH
 from mysql.connector import Error
 
 
 class Inventory:
     """Inventory model for managing stock levels"""
 
+    # Columns written by the streaming export, in output order
+    EXPORT_COLUMNS = [
+        'inventory_id', 'product_id', 'product_name', 'sku',
+        'category_name', 'supplier_name', 'quantity_in_stock', 'reorder_level',
+        'warehouse_location', 'unit_price', 'stock_value', 'last_updated'
+    ]
+
+    # Columns the list can be sorted by (client name -> SQL expression)
+    SORT_COLUMNS = {
+        'inventory_id': 'i.inventory_id',
+        'product_id': 'i.product_id',
+        'product_name': 'p.product_name',
+        'sku': 'p.sku',
+        'category_name': 'c.category_name',
+        'supplier_name': 's.company_name',
+        'quantity_in_stock': 'i.quantity_in_stock',
+        'reorder_level': 'p.reorder_level',
+        'warehouse_location': 'i.warehouse_location',
+        'unit_price': 'p.unit_price',
+        'stock_value': '(i.quantity_in_stock * p.unit_price)',
+        'last_updated': 'i.last_updated'
+    }
+
+    # Keyset pagination order: product name, product_id breaks ties. Inventory
+    # is one-to-one with products, so this is the same order as
+    # (product_name, inventory_id) but is served by idx_product_name alone.
+    KEYSET = KeysetPager(
+        'inventory',
+        [('p.product_name', 'product_name'), ('p.product_id', 'product_id')]
+    )
+
+    @staticmethod
+    def _list_sql(where_clause, order_by, limit_clause=""):
+        """Build the inventory list query shared by pages and exports"""
+        return f"""
+            SELECT
+                i.inventory_id, i.product_id,
+                p.product_name, p.sku,
+                c.category_name, s.company_name as supplier_name,
+                i.quantity_in_stock, p.reorder_level,
+                i.warehouse_location, p.unit_price,
+                (i.quantity_in_stock * p.unit_price) as stock_value,
+                i.last_updated
+            FROM inventory i
+            INNER JOIN products p ON i.product_id = p.product_id
+            INNER JOIN categories c ON p.category_id = c.category_id
+            INNER JOIN suppliers s ON p.supplier_id = s.supplier_id
+            WHERE {where_clause}
+            ORDER BY {order_by}
+            {limit_clause}
+        """
+
     @staticmethod
-    def get_all(page=1, per_page=10, search=None):
-        """Get all inventory with pagination"""
+    def get_all(page=1, per_page=10, search=None, row_format='rows', cursor=None, include_total='exact',
+                sort=None):
+        """
+        Get all inventory with pagination
+
+        Passing a cursor (empty string for the first page) switches from
+        offset to keyset pagination on (product_name, product_id).
+
+        Args:
+            page (int): Page number
+            per_page (int): Items per page
+            search (str): Search term for product name or SKU
+            row_format (str): 'rows' (dict per row) or 'columns' (column list plus row lists)
+            cursor (str): Keyset cursor from the previous page
+            include_total (str): 'exact' (cached COUNT), 'estimated' (optimizer estimate) or 'none'
+            sort (list): (column, 'asc'/'desc') pairs over SORT_COLUMNS (offset mode)
+
+        Returns:
+            dict: Inventory records and pagination info
+        """
         try:
-            where_clause = "1=1"
+            per_page = clamp_page_size(per_page)
+            where_conditions = []
             params = []
 
-            if search:
-                where_clause = "(p.product_name LIKE %s OR p.sku LIKE %s)"
-                params = [f"%{search}%", f"%{search}%"]
+            search_plan = PRODUCT_SEARCH.plan(search)
+            if search_plan:
+                where_conditions.append(search_plan.condition)
+                params.extend(search_plan.params)
+
+            if cursor is not None:
+                return Inventory._get_keyset_page(where_conditions, params, per_page, row_format, cursor)
 
-            # Count total
-            count_query = f"""
+            # Count total (cached, estimated or skipped)
+            count_query = QueryRegistry.compile('inventory.count', where_conditions, lambda where_clause: f"""
                 SELECT COUNT(*) as total
                 FROM inventory i
                 INNER JOIN products p ON i.product_id = p.product_id
                 WHERE {where_clause}
-            """
-            total_result = Database.execute_query(count_query, tuple(params), fetch_one=True)
-            total = total_result['total'] if total_result else 0
+            """)
+            total = Database.count_total(count_query, tuple(params), include_total, ('inventory', 'products'))
 
             # Get paginated data
             offset = (page - 1) * per_page
-            query = f"""
-                SELECT
-                    i.inventory_id, i.product_id,
-                    p.product_name, p.sku,
-                    c.category_name, s.company_name as supplier_name,
-                    i.quantity_in_stock, p.reorder_level,
-                    i.warehouse_location, p.unit_price,
-                    (i.quantity_in_stock * p.unit_price) as stock_value,
-                    i.last_updated
-                FROM inventory i
-                INNER JOIN products p ON i.product_id = p.product_id
-                INNER JOIN categories c ON p.category_id = c.category_id
-                INNER JOIN suppliers s ON p.supplier_id = s.supplier_id
-                WHERE {where_clause}
-                ORDER BY p.product_name
-                LIMIT %s OFFSET %s
-            """
-            params.extend([per_page, offset])
-            inventory = Database.execute_query(query, tuple(params))
+            order_by = build_order_by(sort, Inventory.SORT_COLUMNS, 'i.inventory_id') if sort else "p.product_name"
+            if search_plan and search_plan.rank and not sort:
+                # Most relevant matches first
+                order_by = f"{search_plan.rank} DESC, {order_by}"
+                params.extend(search_plan.rank_params)
+            query = QueryRegistry.compile(
+                f'inventory.page:{order_by}', where_conditions,
+                lambda where_clause: Inventory._list_sql(where_clause, order_by, "LIMIT %s OFFSET %s")
+            )
+            params.extend([per_page + 1, offset])
+            result = Database.execute_query(query, tuple(params), prepared=True, row_format=row_format)
+
+            inventory, has_more = split_page(result, per_page)
 
             return {
                 'success': True,
                 'data': inventory,
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': total,
-                    'pages': (total + per_page - 1) // per_page
-                }
+                'pagination': offset_pagination(page, per_page, total, include_total, has_more)
             }
-        except Error as e:
+        except (Error, ValueError) as e:
             return {'success': False, 'error': str(e)}
 
+    @staticmethod
+    def _get_keyset_page(where_conditions, params, per_page, row_format, cursor):
+        """Fetch one keyset page (one index seek, no COUNT)"""
+        after = Inventory.KEYSET.decode(cursor)
+        if after is not None:
+            where_conditions = where_conditions + [Inventory.KEYSET.seek_condition]
+            params = params + Inventory.KEYSET.seek_params(after)
+
+        query = QueryRegistry.compile(
+            'inventory.keyset', where_conditions,
+            lambda where_clause: Inventory._list_sql(where_clause, Inventory.KEYSET.order_by, "LIMIT %s")
+        )
+        result = Database.execute_query(query, tuple(params + [per_page + 1]), prepared=True, row_format=row_format)
+        inventory, next_cursor = Inventory.KEYSET.page(result, per_page)
+
+        return {
+            'success': True,
+            'data': inventory,
+            'pagination': {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None
+            }
+        }
+
+    @staticmethod
+    def iter_export(search=None):
+        """
+        Stream every inventory record matching the search term
+
+        Args:
+            search (str): Search term for product name or SKU
+
+        Returns:
+            generator: Inventory rows ordered by product name, read in chunks
+        """
+        where_clause = "1=1"
+        params = []
+
+        search_plan = PRODUCT_SEARCH.plan(search)
+        if search_plan:
+            where_clause = search_plan.condition
+            params = search_plan.params
+
+        query = Inventory._list_sql(where_clause, "p.product_name")
+        return Database.iter_query(query, tuple(params))
+
     @staticmethod
     def get_by_product_id(product_id):
-        """Get inventory for a specific product"""
+        """Get inventory for a specific product (served from the product lookup cache)"""
         try:
-            query = """
-                SELECT
-                    i.inventory_id, i.product_id,
-                    p.product_name, p.sku,
-                    i.quantity_in_stock, p.reorder_level,
-                    i.warehouse_location, p.unit_price,
-                    (i.quantity_in_stock * p.unit_price) as stock_value,
-                    i.last_updated
-                FROM inventory i
-                INNER JOIN products p ON i.product_id = p.product_id
-                WHERE i.product_id = %s
-            """
-            inventory = Database.execute_query(query, (product_id,), fetch_one=True)
+            record = ProductLookup.get_by_id(product_id)
 
-            if inventory:
+            if record and record['inventory_id'] is not None:
+                inventory = {field: record[field] for field in (
+                    'inventory_id', 'product_id', 'product_name', 'sku', 'quantity_in_stock',
+                    'reorder_level', 'warehouse_location', 'unit_price'
+                )}
+                inventory['stock_value'] = record['quantity_in_stock'] * record['unit_price']
+                inventory['last_updated'] = record['last_updated']
                 return {'success': True, 'data': inventory}
             else:
                 return {'success': False, 'error': 'Inventory not found'}
@@ -125,6 +235,7 @@ class Inventory:
                 params = (new_quantity, product_id)
 
             rows_affected = Database.execute_update(query, params)
+            ProductLookup.invalidate(product_id)
 
             if rows_affected > 0:
                 return {'success': True, 'message': 'Inventory updated successfully'}
@@ -147,7 +258,7 @@ class Inventory:
                 FROM inventory i
                 INNER JOIN products p ON i.product_id = p.product_id
             """
-            summary = Database.execute_query(query, fetch_one=True)
+            summary = Database.execute_query(query, fetch_one=True, cache_tags=('inventory', 'products'))
             return {'success': True, 'data': summary}
         except Error as e:
             return {'success': False, 'error': str(e)}
@@ -169,7 +280,7 @@ class Inventory:
                 GROUP BY c.category_id, c.category_name
                 ORDER BY total_value DESC
             """
-            categories = Database.execute_query(query)
+            categories = Database.execute_query(query, cache_tags=('categories', 'products', 'inventory'))
             return {'success': True, 'data': categories}
         except Error as e:
             return {'success': False, 'error': str(e)}
@@ -191,7 +302,7 @@ class Inventory:
                 GROUP BY s.supplier_id, s.company_name
                 ORDER BY total_value DESC
             """
-            suppliers = Database.execute_query(query)
+            suppliers = Database.execute_query(query, cache_tags=('suppliers', 'products', 'inventory'))
             return {'success': True, 'data': suppliers}
         except Error as e:
             return {'success': False, 'error': str(e)}
@@ -0,0 +1,148 @@
+"""
+Keyset Pagination Module
+========================
+Cursor-based pagination that seeks past the last row of the previous page
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.models.database import split_page
+
+
+def _json_default(value):
+    """Serialize sort values that JSON does not support natively"""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Unsupported cursor value: {value!r}")
+
+
+class KeysetPager:
+    """
+    Keyset pagination over a fixed sort order
+
+    The sort columns always end with the primary key so the order is total.
+    A page is fetched with ``WHERE <filters> AND <seek condition> ORDER BY
+    <sort> LIMIT per_page + 1``: the seek condition starts right after the
+    previous page's last row, so every page costs one index seek however deep
+    it is, and the extra row tells whether another page exists.
+
+    Cursors are opaque to clients (URL-safe base64 JSON) and carry the list
+    name, so a cursor from one list is rejected by another.
+    """
+
+    def __init__(self, name, sort_columns, descending=False):
+        """
+        Args:
+            name (str): List name stored in the cursor, e.g. 'transactions'
+            sort_columns (list): (SQL expression, result column) pairs, primary key last
+            descending (bool): Sort every column descending
+        """
+        self.name = name
+        self.sort_columns = sort_columns
+        self.descending = descending
+
+    @property
+    def order_by(self):
+        """ORDER BY clause body, e.g. 't.transaction_date DESC, t.transaction_id DESC'"""
+        direction = "DESC" if self.descending else "ASC"
+        return ", ".join(f"{expression} {direction}" for expression, _ in self.sort_columns)
+
+    @property
+    def seek_condition(self):
+        """
+        WHERE fragment selecting the rows after the cursor position
+
+        Expanded as ``a < %s OR (a = %s AND b < %s)`` rather than a row
+        constructor comparison so that MySQL always plans it as an index range.
+        """
+        operator = "<" if self.descending else ">"
+        expressions = [expression for expression, _ in self.sort_columns]
+        branches = []
+        for index, expression in enumerate(expressions):
+            equalities = [f"{previous} = %s" for previous in expressions[:index]]
+            branches.append("(" + " AND ".join(equalities + [f"{expression} {operator} %s"]) + ")")
+        return "(" + " OR ".join(branches) + ")"
+
+    def seek_params(self, values):
+        """
+        Parameters for seek_condition
+
+        Args:
+            values (list): Sort values decoded from the cursor
+
+        Returns:
+            list: Values in placeholder order
+        """
+        params = []
+        for index in range(len(values)):
+            params.extend(values[:index + 1])
+        return params
+
+    def encode(self, values):
+        """
+        Build the cursor that continues after a row
+
+        Args:
+            values (list): Sort values of the last row returned
+
+        Returns:
+            str: Opaque cursor
+        """
+        payload = json.dumps({'list': self.name, 'after': list(values)}, default=_json_default)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode(self, cursor):
+        """
+        Read the sort values from a cursor
+
+        Args:
+            cursor (str): Cursor from a previous page, '' for the first page
+
+        Returns:
+            list: Sort values, or None for the first page
+
+        Raises:
+            ValueError: The cursor is malformed or belongs to another list
+        """
+        if not cursor:
+            return None
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values = payload['after']
+            valid = payload['list'] == self.name and len(values) == len(self.sort_columns)
+        except (ValueError, TypeError, KeyError):
+            valid = False
+        if not valid:
+            raise ValueError("Invalid pagination cursor")
+        return values
+
+    def page(self, result, per_page):
+        """
+        Trim the extra look-ahead row and compute the next cursor
+
+        Args:
+            result (list or dict): per_page + 1 rows, dict rows or columnar
+            per_page (int): Page size
+
+        Returns:
+            tuple: (page result, next cursor or None)
+        """
+        result, has_more = split_page(result, per_page)
+        if not has_more:
+            return result, None
+
+        keys = [column for _, column in self.sort_columns]
+        if isinstance(result, dict):
+            last = result['rows'][-1]
+            values = [last[result['columns'].index(key)] for key in keys]
+        else:
+            values = [result[-1][key] for key in keys]
+        return result, self.encode(values)
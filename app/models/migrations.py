@@ -0,0 +1,209 @@
+"""
+Migration Runner Module
+=======================
+Applies the versioned SQL scripts in database/migrations/ and records them
+"""
+
+import json
+import os
+import re
+import time
+
+from app.models.database import Database
+
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                              'database', 'migrations')
+
+# 004_composite_indexes.sql -> version '004_composite_indexes'
+MIGRATION_FILE = re.compile(r"^(\d{3}_\w+)\.sql$")
+
+# "-- benchmark: SELECT ..." lines name queries timed before and after a migration
+BENCHMARK_LINE = re.compile(r"^--\s*benchmark:\s*(.+)$", re.IGNORECASE)
+
+STATEMENT_END = re.compile(r";\s*$", re.MULTILINE)
+
+# Checked first: CREATE TABLE IF NOT EXISTS on an existing table raises Note
+# 1050, which the connector turns into an error (raise_on_warnings)
+TABLE_EXISTS_SQL = """
+    SELECT COUNT(*) as count FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'schema_migrations'
+"""
+
+CREATE_TABLE_SQL = """
+    CREATE TABLE schema_migrations (
+        version VARCHAR(100) PRIMARY KEY,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        duration_ms INT,
+        timings JSON
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+
+class Migration:
+    """One migration script: its statements and benchmark queries"""
+
+    def __init__(self, version, path):
+        self.version = version
+        self.path = path
+        with open(path, encoding='utf-8') as script:
+            text = script.read()
+
+        self.benchmarks = []
+        lines = []
+        for line in text.splitlines():
+            stripped = line.strip()
+            match = BENCHMARK_LINE.match(stripped)
+            if match:
+                self.benchmarks.append(match.group(1).rstrip(';'))
+            elif not stripped.startswith('--'):
+                lines.append(line)
+
+        # USE lines are skipped: the runner works on the configured database
+        self.statements = [
+            statement.strip() for statement in STATEMENT_END.split("\n".join(lines))
+            if statement.strip() and not statement.strip().upper().startswith('USE ')
+        ]
+
+
+class MigrationRunner:
+    """
+    Applies pending migrations in version order
+
+    Each applied migration is recorded in schema_migrations with its run
+    time and, for every "-- benchmark:" query in the script, the query's
+    best time over a few runs before and after the migration. Scripts are
+    plain statements ending with ';' (no DELIMITER blocks); DDL commits
+    implicitly, so a failing migration stops the run and is not recorded.
+    """
+
+    def __init__(self, directory=MIGRATIONS_DIR, benchmark_runs=3):
+        """
+        Args:
+            directory (str): Folder of NNN_name.sql scripts
+            benchmark_runs (int): Runs per benchmark query (the best is kept)
+        """
+        self.directory = directory
+        self.benchmark_runs = benchmark_runs
+
+    def available(self):
+        """
+        List the migration scripts
+
+        Returns:
+            list: Migration instances, in version order
+        """
+        migrations = []
+        for name in sorted(os.listdir(self.directory)):
+            match = MIGRATION_FILE.match(name)
+            if match:
+                migrations.append(Migration(match.group(1), os.path.join(self.directory, name)))
+        return migrations
+
+    def applied(self):
+        """
+        Get the recorded migrations
+
+        Returns:
+            dict: version -> record (applied_at, duration_ms, timings)
+        """
+        if not Database.execute_query(TABLE_EXISTS_SQL, fetch_one=True)['count']:
+            Database.execute_update(CREATE_TABLE_SQL, tables=('schema_migrations',))
+        rows = Database.execute_query(
+            "SELECT version, applied_at, duration_ms, timings FROM schema_migrations ORDER BY version"
+        )
+        for row in rows:
+            row['timings'] = json.loads(row['timings']) if row['timings'] else None
+        return {row['version']: row for row in rows}
+
+    def status(self):
+        """
+        List every migration with its state
+
+        Returns:
+            list: (version, applied record or None) pairs
+        """
+        applied = self.applied()
+        return [(migration.version, applied.get(migration.version)) for migration in self.available()]
+
+    def pending(self):
+        """
+        Get the migrations not applied yet
+
+        Returns:
+            list: Migration instances, in version order
+        """
+        applied = self.applied()
+        return [migration for migration in self.available() if migration.version not in applied]
+
+    def apply(self, progress=None):
+        """
+        Apply every pending migration
+
+        Args:
+            progress (callable): Called with (migration, record) after each one
+
+        Returns:
+            list: Records of the applied migrations
+        """
+        records = []
+        for migration in self.pending():
+            before = self._time_benchmarks(migration)
+            start = time.perf_counter()
+            for statement in migration.statements:
+                Database.execute_update(statement)
+            duration_ms = round((time.perf_counter() - start) * 1000)
+            after = self._time_benchmarks(migration)
+
+            timings = [
+                {'query': query, 'before_ms': before[query], 'after_ms': after[query]}
+                for query in migration.benchmarks
+            ]
+            self._record(migration.version, duration_ms, timings)
+            record = {'version': migration.version, 'duration_ms': duration_ms, 'timings': timings}
+            records.append(record)
+            if progress:
+                progress(migration, record)
+        return records
+
+    def baseline(self, version):
+        """
+        Record migrations up to version as applied without running them
+
+        For databases created from schema.sql before schema_migrations
+        existed, or upgraded by hand.
+
+        Args:
+            version (str): Last migration already in the database ('003' or '003_partition_transactions')
+
+        Returns:
+            list: Versions recorded
+        """
+        recorded = []
+        for migration in self.pending():
+            if migration.version[:3] > version[:3]:
+                break
+            self._record(migration.version, None, None)
+            recorded.append(migration.version)
+        return recorded
+
+    def _time_benchmarks(self, migration):
+        """Best time in ms of each benchmark query (on the primary)"""
+        timings = {}
+        for query in migration.benchmarks:
+            best = None
+            for _ in range(self.benchmark_runs):
+                with Database.transaction():
+                    start = time.perf_counter()
+                    Database.execute_query(query)
+                    elapsed = (time.perf_counter() - start) * 1000
+                best = elapsed if best is None else min(best, elapsed)
+            timings[query] = round(best, 3)
+        return timings
+
+    @staticmethod
+    def _record(version, duration_ms, timings):
+        Database.execute_update(
+            "INSERT INTO schema_migrations (version, duration_ms, timings) VALUES (%s, %s, %s)",
+            (version, duration_ms, json.dumps(timings) if timings is not None else None)
+        )
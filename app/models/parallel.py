@@ -0,0 +1,99 @@
+"""
+Parallel Query Module
+=====================
+Runs independent model calls concurrently on pooled connections
+"""
+
+import contextvars
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import Config
+from app.models.database import Database
+
+
+class ParallelQuery:
+    """
+    Batch of independent model calls executed together
+
+    Each call runs on its own worker thread and checks out its own pooled
+    connection, so the batch takes roughly as long as its slowest call
+    instead of the sum of all of them. The caller's context variables
+    (SQL profile, read-your-writes state) travel with every call.
+
+    With ``snapshot=True`` the calls instead run one after another inside a
+    single consistent-snapshot read transaction: MySQL cannot share a
+    snapshot between connections, so consistency is traded for parallelism.
+
+    Example::
+
+        results = (ParallelQuery()
+                   .add('summary', Inventory.get_stock_summary)
+                   .add('recent', Transaction.get_recent_transactions, 5)
+                   .run())
+    """
+
+    _executor = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self._calls = OrderedDict()
+
+    @classmethod
+    def get_executor(cls):
+        """
+        Get or create the executor shared by all parallel batches
+
+        Returns:
+            ThreadPoolExecutor: Shared executor
+        """
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=Config.PARALLEL_QUERY_WORKERS,
+                        thread_name_prefix='parallel-query'
+                    )
+        return cls._executor
+
+    def add(self, name, func, *args, **kwargs):
+        """
+        Add a call to the batch
+
+        Args:
+            name (str): Key of the call's result
+            func (callable): Model method (or any data-access callable)
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            ParallelQuery: self, for chaining
+        """
+        self._calls[name] = (func, args, kwargs)
+        return self
+
+    def run(self, snapshot=False):
+        """
+        Execute every call and collect the results
+
+        Args:
+            snapshot (bool): Run sequentially in one consistent-snapshot transaction
+
+        Returns:
+            dict: Result of each call keyed by name, in the order added
+        """
+        if snapshot:
+            with Database.snapshot():
+                return {name: func(*args, **kwargs) for name, (func, args, kwargs) in self._calls.items()}
+
+        if len(self._calls) < 2 or Config.PARALLEL_QUERY_WORKERS < 2:
+            return {name: func(*args, **kwargs) for name, (func, args, kwargs) in self._calls.items()}
+
+        executor = self.get_executor()
+        futures = OrderedDict()
+        for name, (func, args, kwargs) in self._calls.items():
+            # Worker threads have no unit of work, so each call uses its own connection
+            context = contextvars.copy_context()
+            futures[name] = executor.submit(context.run, func, *args, **kwargs)
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,382 @@
+"""
+Transaction Partitioning Module
+===============================
+Monthly partitions of the transactions table and archival of old months
+"""
+
+import gzip
+import heapq
+import json
+import os
+import re
+import threading
+from datetime import date, datetime
+
+from app.config import Config
+from app.models.database import Database
+
+
+# Monthly partitions are named pYYYYMM; pmax catches everything later
+PARTITION_NAME = re.compile(r"^p(\d{4})(\d{2})$")
+
+# Columns written to (and read back from) archive files
+ARCHIVE_COLUMNS = (
+    'transaction_id', 'product_id', 'transaction_type', 'quantity',
+    'transaction_date', 'reference_number', 'remarks', 'created_by'
+)
+
+# Per-month summary of the archive files (row count, first and last day, products)
+MANIFEST_FILE = 'manifest.json'
+
+
+def add_months(month, count):
+    """
+    First day of the month count months after month
+
+    Args:
+        month (date): Any day of the starting month
+        count (int): Months to add (may be negative)
+
+    Returns:
+        date: First day of the resulting month
+    """
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    """Partition name of a month, e.g. p202401"""
+    return f"p{month.year:04d}{month.month:02d}"
+
+
+class TransactionPartitions:
+    """
+    Monthly RANGE partitions of the transactions table
+
+    Partition pYYYYMM holds the rows dated before the first day of the next
+    month (the oldest partition therefore also holds anything older), so a
+    query with a transaction_date range only reads the months it covers.
+    maintain() splits new months off pmax ahead of time; archive() copies
+    months older than TRANSACTION_HOT_MONTHS to gzip NDJSON files in
+    TRANSACTION_ARCHIVE_DIR and drops their partitions.
+    """
+
+    @staticmethod
+    def list():
+        """
+        List the partitions of the transactions table
+
+        Returns:
+            list: Partitions (name, month as 'YYYY-MM' or None, estimated rows),
+                empty when the table is not partitioned
+        """
+        rows = Database.execute_query("""
+            SELECT PARTITION_NAME as partition_name, TABLE_ROWS as table_rows
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'transactions'
+                AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+        """)
+        partitions = []
+        for row in rows:
+            match = PARTITION_NAME.match(row['partition_name'])
+            partitions.append({
+                'partition': row['partition_name'],
+                'month': f"{match.group(1)}-{match.group(2)}" if match else None,
+                'rows': row['table_rows']
+            })
+        return partitions
+
+    @staticmethod
+    def maintain(months_ahead=None):
+        """
+        Create monthly partitions up to months_ahead months from now
+
+        The first run on a table fresh from migration 003 splits pmax into
+        one partition per month from the oldest transaction onwards, which
+        rebuilds the table once; later runs only split off empty future months.
+
+        Args:
+            months_ahead (int): Future months to create (TRANSACTION_PARTITION_MONTHS_AHEAD)
+
+        Returns:
+            list: Names of the partitions created
+        """
+        if months_ahead is None:
+            months_ahead = Config.TRANSACTION_PARTITION_MONTHS_AHEAD
+        partitions = TransactionPartitions.list()
+        if not any(partition['partition'] == 'pmax' for partition in partitions):
+            raise RuntimeError("transactions is not partitioned; apply database/migrations/003_partition_transactions.sql")
+
+        months = [partition['month'] for partition in partitions if partition['month']]
+        if months:
+            first = add_months(date.fromisoformat(f"{max(months)}-01"), 1)
+        else:
+            oldest = Database.execute_query(
+                "SELECT MIN(transaction_date) as oldest FROM transactions", fetch_one=True
+            )['oldest']
+            first = add_months(oldest or date.today(), 0)
+        last = add_months(date.today(), months_ahead)
+
+        new_months = []
+        month = first
+        while month <= last:
+            new_months.append(month)
+            month = add_months(month, 1)
+        if not new_months:
+            return []
+
+        definitions = [
+            f"PARTITION {partition_name(month)} VALUES LESS THAN "
+            f"(UNIX_TIMESTAMP('{add_months(month, 1).isoformat()} 00:00:00'))"
+            for month in new_months
+        ]
+        definitions.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+        Database.execute_update(
+            f"ALTER TABLE transactions REORGANIZE PARTITION pmax INTO ({', '.join(definitions)})",
+            tables=('transactions',)
+        )
+        return [partition_name(month) for month in new_months]
+
+    @staticmethod
+    def archive(hot_months=None, dry_run=False):
+        """
+        Move months older than hot_months to compressed files
+
+        Each closed month is streamed to transactions-YYYY-MM.ndjson.gz (via a
+        temporary file), its row count is checked against the partition and
+        only then is the partition dropped. Rows are always dated when they
+        are recorded, so closed months no longer change.
+
+        Args:
+            hot_months (int): Months kept in the table, the current one
+                included (TRANSACTION_HOT_MONTHS)
+            dry_run (bool): Only report the partitions that would be archived
+
+        Returns:
+            list: One entry per archived partition (partition, month, rows, file, bytes)
+        """
+        if hot_months is None:
+            hot_months = Config.TRANSACTION_HOT_MONTHS
+        cutoff = add_months(date.today(), 1 - hot_months).strftime('%Y-%m')
+        cold = [partition for partition in TransactionPartitions.list()
+                if partition['month'] and partition['month'] < cutoff]
+        if dry_run:
+            return cold
+
+        os.makedirs(Config.TRANSACTION_ARCHIVE_DIR, exist_ok=True)
+        archived = []
+        for partition in cold:
+            path = TransactionArchive.path(partition['month'])
+            summary = TransactionPartitions._export(partition['partition'], path + '.tmp')
+            written = summary['rows']
+
+            with Database.transaction():
+                count = Database.execute_query(
+                    f"SELECT COUNT(*) as count FROM transactions PARTITION ({partition['partition']})",
+                    fetch_one=True
+                )['count']
+            if count != written:
+                os.remove(path + '.tmp')
+                raise RuntimeError(f"{partition['partition']}: exported {written} rows but the partition "
+                                   f"holds {count}; partition kept")
+
+            os.replace(path + '.tmp', path)
+            TransactionArchive.record(partition['month'], summary)
+            Database.execute_update(
+                f"ALTER TABLE transactions DROP PARTITION {partition['partition']}",
+                tables=('transactions',)
+            )
+            archived.append({**partition, 'rows': written, 'file': path, 'bytes': os.path.getsize(path)})
+        return archived
+
+    @staticmethod
+    def _export(name, path):
+        """Write one partition as gzip NDJSON, returning its manifest summary"""
+        rows = Database.iter_query(
+            f"SELECT {', '.join(ARCHIVE_COLUMNS)} FROM transactions PARTITION ({name}) ORDER BY transaction_id"
+        )
+        summary = ArchiveSummary()
+        with gzip.open(path, 'wt', encoding='utf-8') as archive:
+            for row in rows:
+                row['transaction_date'] = row['transaction_date'].isoformat()
+                archive.write(json.dumps(row, separators=(',', ':')) + '\n')
+                summary.add(row)
+        with open(path, 'rb') as archive:
+            os.fsync(archive.fileno())
+        return summary.as_dict()
+
+
+class ArchiveSummary:
+    """Accumulates the manifest entry of one archive file"""
+
+    def __init__(self):
+        self.rows = 0
+        self.first_date = None
+        self.last_date = None
+        self.product_ids = set()
+
+    def add(self, row):
+        day = row['transaction_date'][:10]
+        self.rows += 1
+        self.first_date = day if self.first_date is None else min(self.first_date, day)
+        self.last_date = day if self.last_date is None else max(self.last_date, day)
+        self.product_ids.add(row['product_id'])
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'first_date': self.first_date,
+            'last_date': self.last_date,
+            'product_ids': sorted(self.product_ids)
+        }
+
+
+class TransactionArchive:
+    """
+    Read access to archived months (never used unless asked for)
+
+    A month's file also holds anything older than the month when it came
+    from the oldest partition, so files are selected by the first and last
+    day recorded in the manifest, not by their month.
+    """
+
+    FILE_PATTERN = re.compile(r"^transactions-(\d{4}-\d{2})\.ndjson\.gz$")
+    _manifest_lock = threading.Lock()
+
+    @staticmethod
+    def path(month):
+        """Archive file of a month ('YYYY-MM')"""
+        return os.path.join(Config.TRANSACTION_ARCHIVE_DIR, f"transactions-{month}.ndjson.gz")
+
+    @staticmethod
+    def months():
+        """
+        List archived months
+
+        Returns:
+            list: Archived months ('YYYY-MM'), oldest first
+        """
+        if not os.path.isdir(Config.TRANSACTION_ARCHIVE_DIR):
+            return []
+        matches = (TransactionArchive.FILE_PATTERN.match(name) for name in os.listdir(Config.TRANSACTION_ARCHIVE_DIR))
+        return sorted(match.group(1) for match in matches if match)
+
+    @staticmethod
+    def manifest():
+        """
+        Get the summary of every archived month
+
+        Read from manifest.json in TRANSACTION_ARCHIVE_DIR; files missing from
+        it (archived before the manifest existed) are scanned once and added.
+
+        Returns:
+            dict: month -> rows, first_date, last_date ('YYYY-MM-DD' or None), product_ids
+        """
+        with TransactionArchive._manifest_lock:
+            manifest = TransactionArchive._read_manifest()
+            months = TransactionArchive.months()
+            missing = [month for month in months if month not in manifest]
+            for month in missing:
+                summary = ArchiveSummary()
+                with gzip.open(TransactionArchive.path(month), 'rt', encoding='utf-8') as archive:
+                    for line in archive:
+                        summary.add(json.loads(line))
+                manifest[month] = summary.as_dict()
+            if missing:
+                TransactionArchive._write_manifest(manifest)
+            return {month: manifest[month] for month in months}
+
+    @staticmethod
+    def has_product(product_id):
+        """
+        Whether any archived month holds transactions of a product
+
+        Returns:
+            bool: True when the product has archived history
+        """
+        return any(int(product_id) in entry['product_ids'] for entry in TransactionArchive.manifest().values())
+
+    @staticmethod
+    def record(month, summary):
+        """Add (or replace) the manifest entry of an archived month"""
+        with TransactionArchive._manifest_lock:
+            manifest = TransactionArchive._read_manifest()
+            manifest[month] = summary
+            TransactionArchive._write_manifest(manifest)
+
+    @staticmethod
+    def _read_manifest():
+        path = os.path.join(Config.TRANSACTION_ARCHIVE_DIR, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding='utf-8') as stream:
+            return json.load(stream)
+
+    @staticmethod
+    def _write_manifest(manifest):
+        path = os.path.join(Config.TRANSACTION_ARCHIVE_DIR, MANIFEST_FILE)
+        with open(path + '.tmp', 'w', encoding='utf-8') as stream:
+            json.dump(manifest, stream, sort_keys=True)
+        os.replace(path + '.tmp', path)
+
+    @staticmethod
+    def iter_rows(start_date=None, end_date=None, product_id=None, transaction_type=None):
+        """
+        Stream archived transactions matching the list filters
+
+        Only the files whose recorded days overlap the date range are opened.
+
+        Args:
+            start_date (str): Start date filter (YYYY-MM-DD, inclusive)
+            end_date (str): End date filter (YYYY-MM-DD, inclusive)
+            product_id (int): Filter by product
+            transaction_type (str): Filter by type
+
+        Yields:
+            dict: Archived transaction rows, oldest month first
+        """
+        for month, entry in TransactionArchive.manifest().items():
+            if not entry['rows']:
+                continue
+            if (start_date and entry['last_date'] < start_date) or (end_date and entry['first_date'] > end_date):
+                continue
+            if product_id and int(product_id) not in entry['product_ids']:
+                continue
+            with gzip.open(TransactionArchive.path(month), 'rt', encoding='utf-8') as archive:
+                for line in archive:
+                    row = json.loads(line)
+                    day = row['transaction_date'][:10]
+                    if (start_date and day < start_date) or (end_date and day > end_date):
+                        continue
+                    if product_id and row['product_id'] != int(product_id):
+                        continue
+                    if transaction_type and row['transaction_type'] != transaction_type:
+                        continue
+                    row['transaction_date'] = datetime.fromisoformat(row['transaction_date'])
+                    yield row
+
+    @staticmethod
+    def query(start_date=None, end_date=None, product_id=None, transaction_type=None, limit=1000):
+        """
+        Get archived transactions, newest first
+
+        Args:
+            start_date (str): Start date filter
+            end_date (str): End date filter
+            product_id (int): Filter by product
+            transaction_type (str): Filter by type
+            limit (int): Most rows returned
+
+        Returns:
+            dict: Matching rows and whether more matched than the limit
+        """
+        try:
+            rows = heapq.nlargest(
+                limit + 1,
+                TransactionArchive.iter_rows(start_date, end_date, product_id, transaction_type),
+                key=lambda row: (row['transaction_date'], row['transaction_id'])
+            )
+        except (OSError, ValueError) as e:
+            return {'success': False, 'error': f"Cannot read transaction archive: {e}"}
+        return {'success': True, 'data': rows[:limit], 'truncated': len(rows) > limit}
@@ -0,0 +1,287 @@
+"""
+Connection Pool Module
+======================
+Thread-safe MySQL connection pool with bounded wait, overflow and health checks
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import mysql.connector
+from mysql.connector import Error
+
+from app.models.query_registry import StatementCache
+
+
+# Upper bounds (milliseconds) of the checkout wait-time histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class PoolTimeoutError(Error):
+    """Raised when no connection becomes available within the pool timeout"""
+
+
+class PooledConnection:
+    """
+    Proxy around a raw MySQL connection checked out from a ConnectionPool
+
+    Behaves like the underlying connection, except that close() hands the
+    connection back to the pool instead of closing the socket.
+    """
+
+    def __init__(self, pool, connection, wait_ms):
+        self._pool = pool
+        self._connection = connection
+        self.wait_ms = wait_ms
+
+    def __getattr__(self, name):
+        if self._connection is None:
+            raise Error(msg="Connection has already been returned to the pool")
+        return getattr(self._connection, name)
+
+    def statement_cache(self):
+        """
+        Get the prepared-statement cache of the underlying connection
+
+        Returns:
+            StatementCache: Cache that outlives this checkout
+        """
+        return self._pool._statement_cache(self._connection)
+
+    @contextmanager
+    def warnings_tolerated(self):
+        """
+        Let statements produce warnings without raising them
+
+        For statements whose notes are expected, such as the Note 1003
+        MySQL 8 attaches to every EXPLAIN. raise_on_warnings is restored
+        when the block exits.
+        """
+        connection = self._connection
+        previous = connection.raise_on_warnings
+        connection.raise_on_warnings = False
+        try:
+            yield self
+        finally:
+            connection.raise_on_warnings = previous
+
+    def close(self):
+        """Return the connection to the pool"""
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            self._pool._release(connection)
+
+    def invalidate(self):
+        """Close the underlying socket instead of returning it to the pool"""
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            self._pool._release(connection, discard=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Connection pool with a fixed core size plus temporary overflow
+
+    - Up to ``pool_size`` idle connections are kept open between requests.
+    - Up to ``max_overflow`` extra connections are opened during bursts and
+      closed again when they are returned.
+    - Callers that find the pool exhausted wait up to ``timeout`` seconds
+      before PoolTimeoutError is raised.
+    - Idle connections unused for ``ping_interval`` seconds are pinged before
+      being handed out and transparently replaced if the ping fails.
+    - Each connection keeps up to ``statement_cache_size`` server-side
+      prepared statements across checkouts.
+    """
+
+    def __init__(self, db_config, pool_name='inventory_pool', pool_size=5,
+                 max_overflow=10, timeout=30.0, ping_interval=60, reset_session=False,
+                 statement_cache_size=64):
+        self.pool_name = pool_name
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self.reset_session = reset_session
+        self.statement_cache_size = statement_cache_size
+        self._db_config = dict(db_config)
+        self._statements = {}
+
+        self._idle = deque()
+        self._available = threading.Condition(threading.Lock())
+        self._open = 0
+        self._checked_out = 0
+        self._waiting = 0
+
+        # Counters reported by stats()
+        self._created = 0
+        self._recycled = 0
+        self._closed = 0
+        self._timeouts = 0
+        self._max_wait_ms = 0.0
+        self._wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def get_connection(self):
+        """
+        Check out a connection, waiting up to the pool timeout if necessary
+
+        Returns:
+            PooledConnection: Connection proxy that returns itself on close()
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        connection = None
+        last_used = None
+
+        with self._available:
+            while True:
+                if self._idle:
+                    connection, last_used = self._idle.pop()
+                    break
+                if self._open < self.pool_size + self.max_overflow:
+                    self._open += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        msg=f"Timed out after {self.timeout}s waiting for a connection "
+                            f"from pool '{self.pool_name}'"
+                    )
+                self._waiting += 1
+                try:
+                    self._available.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._checked_out += 1
+
+        # Network I/O happens outside the lock
+        try:
+            if connection is None:
+                connection = self._create_connection()
+            elif time.monotonic() - last_used >= self.ping_interval:
+                connection = self._check_health(connection)
+        except Error:
+            with self._available:
+                self._checked_out -= 1
+                self._open -= 1
+                self._available.notify()
+            raise
+
+        wait_ms = (time.monotonic() - start) * 1000
+        self._record_wait(wait_ms)
+        return PooledConnection(self, connection, wait_ms)
+
+    def stats(self):
+        """
+        Get live pool statistics
+
+        Returns:
+            dict: Pool sizing, usage counters and checkout wait-time histogram
+        """
+        with self._available:
+            histogram = {}
+            for bound, count in zip(WAIT_BUCKETS_MS, self._wait_histogram):
+                histogram[f'<={bound}ms'] = count
+            histogram[f'>{WAIT_BUCKETS_MS[-1]}ms'] = self._wait_histogram[-1]
+
+            return {
+                'pool_name': self.pool_name,
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'timeout': self.timeout,
+                'open': self._open,
+                'idle': len(self._idle),
+                'checked_out': self._checked_out,
+                'waiting': self._waiting,
+                'created': self._created,
+                'recycled': self._recycled,
+                'closed': self._closed,
+                'timeouts': self._timeouts,
+                'max_wait_ms': round(self._max_wait_ms, 3),
+                'wait_histogram': histogram
+            }
+
+    def _create_connection(self):
+        """Open a new raw connection to the database"""
+        connection = mysql.connector.connect(**self._db_config)
+        with self._available:
+            self._created += 1
+        return connection
+
+    def _statement_cache(self, connection):
+        """Get (or create) the statement cache of a raw connection"""
+        cache = self._statements.get(id(connection))
+        if cache is None:
+            cache = StatementCache(connection, self.statement_cache_size)
+            self._statements[id(connection)] = cache
+        return cache
+
+    def _check_health(self, connection):
+        """Ping an idle connection and replace it if the server went away"""
+        try:
+            connection.ping(reconnect=False)
+            return connection
+        except Error:
+            self._close_quietly(connection)
+            replacement = self._create_connection()
+            with self._available:
+                self._recycled += 1
+            return replacement
+
+    def _release(self, connection, discard=False):
+        """Return a connection to the idle set, or close it if not needed"""
+        if not discard:
+            try:
+                if connection.in_transaction:
+                    connection.rollback()
+                if self.reset_session:
+                    # Resetting the session deallocates prepared statements
+                    cache = self._statements.get(id(connection))
+                    if cache is not None:
+                        cache.clear()
+                    connection.reset_session()
+            except Error:
+                discard = True
+
+        with self._available:
+            self._checked_out -= 1
+            if not discard and len(self._idle) < self.pool_size:
+                self._idle.append((connection, time.monotonic()))
+                connection = None
+            else:
+                self._open -= 1
+                self._closed += 1
+            self._available.notify()
+
+        if connection is not None:
+            self._close_quietly(connection)
+
+    def _record_wait(self, wait_ms):
+        """Add a checkout wait time to the histogram"""
+        bucket = len(WAIT_BUCKETS_MS)
+        for index, bound in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                bucket = index
+                break
+        with self._available:
+            self._wait_histogram[bucket] += 1
+            self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+
+    def _close_quietly(self, connection):
+        """Close a raw connection, ignoring errors from a dead socket"""
+        cache = self._statements.pop(id(connection), None)
+        if cache is not None:
+            cache.discard()
+        try:
+            connection.close()
+        except Error:
+            pass
@@ -4,36 +4,111 @@ Product Model
 Handles all product-related database operations
 """
 
-from app.models.database import Database
+from app.config import Config
+from app.models.database import (
+    Database, build_order_by, clamp_page_size, offset_pagination, split_page
+)
+from app.models.keyset import KeysetPager
+from app.models.partitioning import TransactionArchive
+from app.models.product_cache import ProductLookup
+from app.models.query_registry import QueryRegistry
+from app.models.search import PRODUCT_SEARCH
+from app.models.suggest import ProductSuggest
 from mysql.connector import Error
 
 
 class Product:
     """Product model for managing product data"""
 
+    # Columns the list can be sorted by (client name -> SQL expression)
+    SORT_COLUMNS = {
+        'product_id': 'p.product_id',
+        'product_name': 'p.product_name',
+        'sku': 'p.sku',
+        'category_name': 'c.category_name',
+        'supplier_name': 's.company_name',
+        'unit_price': 'p.unit_price',
+        'reorder_level': 'p.reorder_level',
+        'quantity_in_stock': 'COALESCE(i.quantity_in_stock, 0)',
+        'created_at': 'p.created_at',
+        'updated_at': 'p.updated_at'
+    }
+
+    # Keyset pagination order: newest first, product_id breaks ties
+    KEYSET = KeysetPager(
+        'products',
+        [('p.created_at', 'created_at'), ('p.product_id', 'product_id')],
+        descending=True
+    )
+
+    # Fields of the product detail response
+    DETAIL_FIELDS = (
+        'product_id', 'product_name', 'sku', 'description',
+        'category_id', 'category_name', 'supplier_id', 'supplier_name',
+        'unit_price', 'reorder_level', 'quantity_in_stock', 'warehouse_location',
+        'created_at', 'updated_at'
+    )
+
+    # Stock status buckets of the stock_status facet, in display order
+    STOCK_STATUSES = ('in_stock', 'low_stock', 'out_of_stock')
+
     @staticmethod
-    def get_all(page=1, per_page=10, search=None, category_id=None, supplier_id=None):
+    def _list_sql(where_clause, order_by, limit_clause):
+        """Build the product list query"""
+        return f"""
+            SELECT
+                p.product_id, p.product_name, p.sku, p.description,
+                p.category_id, c.category_name,
+                p.supplier_id, s.company_name as supplier_name,
+                p.unit_price, p.reorder_level,
+                COALESCE(i.quantity_in_stock, 0) as quantity_in_stock,
+                p.created_at, p.updated_at
+            FROM products p
+            LEFT JOIN categories c ON p.category_id = c.category_id
+            LEFT JOIN suppliers s ON p.supplier_id = s.supplier_id
+            LEFT JOIN inventory i ON p.product_id = i.product_id
+            WHERE {where_clause}
+            ORDER BY {order_by}
+            {limit_clause}
+        """
+
+    @staticmethod
+    def get_all(page=1, per_page=10, search=None, category_id=None, supplier_id=None, row_format='rows',
+                cursor=None, include_total='exact', sort=None, facets=False):
         """
         Get all products with pagination and filters
 
+        Passing a cursor (empty string for the first page) switches from
+        offset to keyset pagination on (created_at, product_id). Searches are
+        planned by PRODUCT_SEARCH; full-text matches are ranked by relevance
+        unless an explicit sort is given.
+
         Args:
             page (int): Page number
             per_page (int): Items per page
             search (str): Search term for product name or SKU
             category_id (int): Filter by category
             supplier_id (int): Filter by supplier
+            row_format (str): 'rows' (dict per row) or 'columns' (column list plus row lists)
+            cursor (str): Keyset cursor from the previous page
+            include_total (str): 'exact' (cached COUNT), 'estimated' (optimizer estimate) or 'none'
+            sort (list): (column, 'asc'/'desc') pairs over SORT_COLUMNS (offset mode)
+            facets (bool): Also return category, supplier and stock status counts of all matches
 
         Returns:
-            dict: Products and pagination info
+            dict: Products and pagination info (and facets)
         """
         try:
+            per_page = clamp_page_size(per_page)
+
             # Build WHERE clause
             where_conditions = []
             params = []
 
-            if search:
-                where_conditions.append("(p.product_name LIKE %s OR p.sku LIKE %s)")
-                params.extend([f"%{search}%", f"%{search}%"])
+            search_plan = PRODUCT_SEARCH.plan(search)
+            if search_plan:
+                where_conditions.append(search_plan.condition)
+                params.extend(search_plan.params)
 
             if category_id:
                 where_conditions.append("p.category_id = %s")
@@ -43,52 +118,136 @@ class Product:
                 where_conditions.append("p.supplier_id = %s")
                 params.append(supplier_id)
 
-            where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+            facet_counts = Product._get_facets(where_conditions, params) if facets else None
+
+            if cursor is not None:
+                result = Product._get_keyset_page(where_conditions, params, per_page, row_format, cursor)
+                if facets:
+                    result['facets'] = facet_counts
+                return result
 
-            # Count total records
-            count_query = f"SELECT COUNT(*) as total FROM products p WHERE {where_clause}"
-            total_result = Database.execute_query(count_query, tuple(params), fetch_one=True)
-            total = total_result['total'] if total_result else 0
+            # Count total records (cached, estimated or skipped)
+            count_query = QueryRegistry.compile(
+                'products.count', where_conditions,
+                lambda where_clause: f"SELECT COUNT(*) as total FROM products p WHERE {where_clause}"
+            )
+            total = Database.count_total(count_query, tuple(params), include_total, ('products',))
 
             # Get paginated data
             offset = (page - 1) * per_page
-            query = f"""
+            order_by = build_order_by(sort, Product.SORT_COLUMNS, 'p.product_id') if sort else "p.created_at DESC"
+            if search_plan and search_plan.rank and not sort:
+                # Most relevant matches first
+                order_by = f"{search_plan.rank} DESC, {order_by}"
+                params.extend(search_plan.rank_params)
+            query = QueryRegistry.compile(
+                f'products.page:{order_by}', where_conditions,
+                lambda where_clause: Product._list_sql(where_clause, order_by, "LIMIT %s OFFSET %s")
+            )
+            params.extend([per_page + 1, offset])
+            result = Database.execute_query(query, tuple(params), prepared=True, row_format=row_format)
+
+            products, has_more = split_page(result, per_page)
+
+            response = {
+                'success': True,
+                'data': products,
+                'pagination': offset_pagination(page, per_page, total, include_total, has_more)
+            }
+            if facets:
+                response['facets'] = facet_counts
+            return response
+        except (Error, ValueError) as e:
+            return {'success': False, 'error': str(e)}
+
+    @staticmethod
+    def _get_facets(where_conditions, params):
+        """
+        Count the matching products per category, supplier and stock status
+
+        One GROUP BY over the list's WHERE clause returns every (category,
+        supplier, stock status) combination present; the three facets are
+        summed from those groups, so facets cost a single extra query
+        however many categories and suppliers there are.
+        """
+        query = QueryRegistry.compile(
+            'products.facets', where_conditions,
+            lambda where_clause: f"""
                 SELECT
-                    p.product_id, p.product_name, p.sku, p.description,
                     p.category_id, c.category_name,
                     p.supplier_id, s.company_name as supplier_name,
-                    p.unit_price, p.reorder_level,
-                    COALESCE(i.quantity_in_stock, 0) as quantity_in_stock,
-                    p.created_at, p.updated_at
+                    CASE
+                        WHEN COALESCE(i.quantity_in_stock, 0) = 0 THEN 'out_of_stock'
+                        WHEN i.quantity_in_stock <= p.reorder_level THEN 'low_stock'
+                        ELSE 'in_stock'
+                    END as stock_status,
+                    COUNT(*) as total
                 FROM products p
                 LEFT JOIN categories c ON p.category_id = c.category_id
                 LEFT JOIN suppliers s ON p.supplier_id = s.supplier_id
                 LEFT JOIN inventory i ON p.product_id = i.product_id
                 WHERE {where_clause}
-                ORDER BY p.created_at DESC
-                LIMIT %s OFFSET %s
+                GROUP BY p.category_id, c.category_name, p.supplier_id, s.company_name, stock_status
             """
-            params.extend([per_page, offset])
-            products = Database.execute_query(query, tuple(params))
+        )
+        groups = Database.execute_query(
+            query, tuple(params), prepared=True,
+            cache_tags=('products', 'categories', 'suppliers', 'inventory'), cache_ttl=Config.TOTAL_CACHE_TTL
+        )
+
+        categories = {}
+        suppliers = {}
+        statuses = dict.fromkeys(Product.STOCK_STATUSES, 0)
+        for group in groups:
+            category = categories.setdefault(group['category_id'], {
+                'category_id': group['category_id'], 'category_name': group['category_name'], 'count': 0
+            })
+            category['count'] += group['total']
+            supplier = suppliers.setdefault(group['supplier_id'], {
+                'supplier_id': group['supplier_id'], 'supplier_name': group['supplier_name'], 'count': 0
+            })
+            supplier['count'] += group['total']
+            statuses[group['stock_status']] += group['total']
+
+        # Largest facet values first
+        return {
+            'category': sorted(categories.values(), key=lambda value: (-value['count'], value['category_name'] or '')),
+            'supplier': sorted(suppliers.values(), key=lambda value: (-value['count'], value['supplier_name'] or '')),
+            'stock_status': [{'status': status, 'count': count} for status, count in statuses.items()]
+        }
 
-            return {
-                'success': True,
-                'data': products,
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': total,
-                    'pages': (total + per_page - 1) // per_page
-                }
+    @staticmethod
+    def _get_keyset_page(where_conditions, params, per_page, row_format, cursor):
+        """Fetch one keyset page (one index seek, no COUNT)"""
+        after = Product.KEYSET.decode(cursor)
+        if after is not None:
+            where_conditions = where_conditions + [Product.KEYSET.seek_condition]
+            params = params + Product.KEYSET.seek_params(after)
+
+        query = QueryRegistry.compile(
+            'products.keyset', where_conditions,
+            lambda where_clause: Product._list_sql(where_clause, Product.KEYSET.order_by, "LIMIT %s")
+        )
+        result = Database.execute_query(query, tuple(params + [per_page + 1]), prepared=True, row_format=row_format)
+        products, next_cursor = Product.KEYSET.page(result, per_page)
+
+        return {
+            'success': True,
+            'data': products,
+            'pagination': {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None
             }
-        except Error as e:
-            return {'success': False, 'error': str(e)}
+        }
 
     @staticmethod
     def get_by_id(product_id):
         """
         Get product by ID
 
+        Served from the product lookup cache (see ProductLookup).
+
         Args:
             product_id (int): Product ID
 
@@ -96,30 +255,43 @@ class Product:
             dict: Product data
         """
         try:
-            query = """
-                SELECT
-                    p.product_id, p.product_name, p.sku, p.description,
-                    p.category_id, c.category_name,
-                    p.supplier_id, s.company_name as supplier_name,
-                    p.unit_price, p.reorder_level,
-                    COALESCE(i.quantity_in_stock, 0) as quantity_in_stock,
-                    i.warehouse_location,
-                    p.created_at, p.updated_at
-                FROM products p
-                LEFT JOIN categories c ON p.category_id = c.category_id
-                LEFT JOIN suppliers s ON p.supplier_id = s.supplier_id
-                LEFT JOIN inventory i ON p.product_id = i.product_id
-                WHERE p.product_id = %s
-            """
-            product = Database.execute_query(query, (product_id,), fetch_one=True)
+            record = ProductLookup.get_by_id(product_id)
+
+            if record:
+                return {'success': True, 'data': Product._product_fields(record)}
+            else:
+                return {'success': False, 'error': 'Product not found'}
+        except Error as e:
+            return {'success': False, 'error': str(e)}
+
+    @staticmethod
+    def get_by_sku(sku):
+        """
+        Get product by SKU
+
+        Served from the product lookup cache (see ProductLookup).
+
+        Args:
+            sku (str): Product SKU
+
+        Returns:
+            dict: Product data
+        """
+        try:
+            record = ProductLookup.get_by_sku(sku)
 
-            if product:
-                return {'success': True, 'data': product}
+            if record:
+                return {'success': True, 'data': Product._product_fields(record)}
             else:
                 return {'success': False, 'error': 'Product not found'}
         except Error as e:
             return {'success': False, 'error': str(e)}
 
+    @staticmethod
+    def _product_fields(record):
+        """Project a lookup record onto the product detail fields"""
+        return {field: record[field] for field in Product.DETAIL_FIELDS}
+
     @staticmethod
     def create(data):
         """
@@ -146,14 +318,19 @@ class Product:
                 data['unit_price'],
                 data.get('reorder_level', 10)
             )
-            product_id = Database.execute_update(query, params)
-
-            # Create initial inventory record with 0 stock
             inventory_query = """
                 INSERT INTO inventory (product_id, quantity_in_stock, warehouse_location)
                 VALUES (%s, 0, %s)
             """
-            Database.execute_update(inventory_query, (product_id, data.get('warehouse_location', 'N/A')))
+
+            # Product and its inventory record are created atomically
+            with Database.transaction():
+                product_id = Database.execute_update(query, params)
+
+                # Create initial inventory record with 0 stock
+                Database.execute_update(inventory_query, (product_id, data.get('warehouse_location', 'N/A')))
+
+                Database.after_commit(lambda: ProductSuggest.add(product_id, data['product_name'], data['sku']))
 
             return {
                 'success': True,
@@ -195,7 +372,10 @@ class Product:
             )
             rows_affected = Database.execute_update(query, params)
 
+            ProductLookup.invalidate(product_id)
+
             if rows_affected > 0:
+                Database.after_commit(lambda: ProductSuggest.add(product_id, data['product_name'], data['sku']))
                 return {'success': True, 'message': 'Product updated successfully'}
             else:
                 return {'success': False, 'error': 'Product not found'}
@@ -214,25 +394,38 @@ class Product:
             dict: Success status
         """
         try:
-            # Check if product has transactions
-            check_query = "SELECT COUNT(*) as count FROM transactions WHERE product_id = %s"
-            result = Database.execute_query(check_query, (product_id,), fetch_one=True)
-
-            if result['count'] > 0:
-                return {
-                    'success': False,
-                    'error': 'Cannot delete product with existing transactions'
-                }
-
-            query = "DELETE FROM products WHERE product_id = %s"
-            rows_affected = Database.execute_update(query, (product_id,))
-
-            if rows_affected > 0:
-                return {'success': True, 'message': 'Product deleted successfully'}
-            else:
-                return {'success': False, 'error': 'Product not found'}
+            with Database.transaction():
+                # Check if product has transactions
+                check_query = "SELECT COUNT(*) as count FROM transactions WHERE product_id = %s"
+                result = Database.execute_query(check_query, (product_id,), fetch_one=True)
+
+                if result['count'] > 0:
+                    return {
+                        'success': False,
+                        'error': 'Cannot delete product with existing transactions'
+                    }
+
+                # transactions has no foreign key (it is partitioned), so archived
+                # months would keep pointing at the deleted product
+                if TransactionArchive.has_product(product_id):
+                    return {
+                        'success': False,
+                        'error': 'Cannot delete product with archived transactions'
+                    }
+
+                query = "DELETE FROM products WHERE product_id = %s"
+                rows_affected = Database.execute_update(query, (product_id,))
+                ProductLookup.invalidate(product_id)
+
+                if rows_affected > 0:
+                    Database.after_commit(lambda: ProductSuggest.remove(product_id))
+                    return {'success': True, 'message': 'Product deleted successfully'}
+                else:
+                    return {'success': False, 'error': 'Product not found'}
         except Error as e:
             return {'success': False, 'error': str(e)}
+        except (OSError, ValueError) as e:
+            return {'success': False, 'error': f"Cannot read transaction archive: {e}"}
 
     @staticmethod
     def get_low_stock(threshold=None):
@@ -0,0 +1,307 @@
+"""
+Product Lookup Cache Module
+===========================
+In-process LRU of product + stock records for id and SKU lookups
+"""
+
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from app.config import Config
+from app.models.database import Database
+
+
+# Inventory columns of a lookup record (re-read on every hit when stock is verified)
+STOCK_FIELDS = ('inventory_id', 'quantity_in_stock', 'warehouse_location', 'last_updated')
+
+
+class ProductLookupCache:
+    """
+    Thread-safe LRU of lookup records keyed by product id, with a SKU index
+
+    Like QueryCache, every product id has a version that invalidation bumps,
+    so a lookup that read the database before a write cannot store its
+    (now stale) record afterwards.
+    """
+
+    def __init__(self, max_entries=10000, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._sku_ids = {}
+        self._versions = defaultdict(int)
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'invalidations': 0
+        }
+
+    def get(self, product_id):
+        """
+        Look up a cached record
+
+        Args:
+            product_id (int): Product ID
+
+        Returns:
+            dict: Cached record (shared, do not modify) or None
+        """
+        with self._lock:
+            entry = self._entries.get(product_id)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._remove(product_id)
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(product_id)
+            self._stats['hits'] += 1
+            return entry[1]
+
+    def id_for_sku(self, sku):
+        """
+        Product ID cached for a SKU
+
+        Args:
+            sku (str): Product SKU
+
+        Returns:
+            int: Product ID or None
+        """
+        with self._lock:
+            return self._sku_ids.get(sku.lower())
+
+    def version(self, product_id):
+        """
+        Snapshot a product's version before reading it from the database
+
+        Returns:
+            tuple: Token to pass to set()
+        """
+        with self._lock:
+            return (self._generation, self._versions[product_id])
+
+    def set(self, record, version):
+        """
+        Store a record unless the product was invalidated since version()
+
+        Args:
+            record (dict): Lookup record
+            version (tuple): Token returned by version() before the read
+        """
+        product_id = record['product_id']
+        with self._lock:
+            if version != (self._generation, self._versions[product_id]):
+                return
+            if product_id in self._entries:
+                self._remove(product_id)
+
+            self._entries[product_id] = (time.monotonic() + self.ttl, record)
+            self._sku_ids[record['sku'].lower()] = product_id
+            self._stats['stores'] += 1
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+
+    def invalidate(self, product_id):
+        """
+        Drop a product's record
+
+        Args:
+            product_id (int): Product ID
+        """
+        with self._lock:
+            self._versions[product_id] += 1
+            if product_id in self._entries:
+                self._remove(product_id)
+                self._stats['invalidations'] += 1
+            # Versions only need to outlive reads in flight; reset them now and then
+            if len(self._versions) > self.max_entries * 4:
+                self._versions.clear()
+                self._generation += 1
+
+    def clear(self):
+        """Drop every record"""
+        with self._lock:
+            self._stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+            self._sku_ids.clear()
+            self._versions.clear()
+            self._generation += 1
+
+    def stats(self):
+        """
+        Get cache statistics
+
+        Returns:
+            dict: Size, limits and hit/miss/eviction counters
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                **self._stats
+            }
+
+    def _remove(self, product_id):
+        """Remove a record and its SKU reference (lock must be held)"""
+        _, record = self._entries.pop(product_id)
+        sku = record['sku'].lower()
+        if self._sku_ids.get(sku) == product_id:
+            del self._sku_ids[sku]
+
+
+class ProductLookup:
+    """
+    Product + stock lookups by id or SKU for scanners and pickers
+
+    Records hold the product, its category and supplier names and its
+    inventory row. Product, category, supplier and stock writes made through
+    the models invalidate the affected records (immediately and again when
+    their transaction ends). Because each process has its own cache, a hit
+    re-reads the inventory row by primary key (PRODUCT_CACHE_VERIFY_STOCK),
+    so quantities are as fresh as an uncached read while the joins are
+    skipped; single-process deployments can turn that off.
+    """
+
+    _cache = None
+    _cache_lock = threading.Lock()
+
+    LOOKUP_SQL = """
+        SELECT
+            p.product_id, p.product_name, p.sku, p.description,
+            p.category_id, c.category_name,
+            p.supplier_id, s.company_name as supplier_name,
+            p.unit_price, p.reorder_level,
+            i.inventory_id,
+            COALESCE(i.quantity_in_stock, 0) as quantity_in_stock,
+            i.warehouse_location, i.last_updated,
+            p.created_at, p.updated_at
+        FROM products p
+        LEFT JOIN categories c ON p.category_id = c.category_id
+        LEFT JOIN suppliers s ON p.supplier_id = s.supplier_id
+        LEFT JOIN inventory i ON p.product_id = i.product_id
+        WHERE {column} = %s
+    """
+
+    SKU_SQL = "SELECT product_id FROM products WHERE sku = %s"
+
+    STOCK_SQL = """
+        SELECT inventory_id, quantity_in_stock, warehouse_location, last_updated
+        FROM inventory
+        WHERE product_id = %s
+    """
+
+    @classmethod
+    def get_cache(cls):
+        """
+        Get or create the lookup cache
+
+        Returns:
+            ProductLookupCache: Process-wide cache
+        """
+        if cls._cache is None:
+            with cls._cache_lock:
+                if cls._cache is None:
+                    cls._cache = ProductLookupCache(
+                        max_entries=Config.PRODUCT_CACHE_MAX_ENTRIES,
+                        ttl=Config.PRODUCT_CACHE_TTL
+                    )
+        return cls._cache
+
+    @classmethod
+    def get_by_id(cls, product_id):
+        """
+        Get a product's lookup record
+
+        Args:
+            product_id (int): Product ID
+
+        Returns:
+            dict: Lookup record (a copy) or None
+        """
+        if not Config.PRODUCT_CACHE_ENABLED:
+            return cls._load('p.product_id', product_id)
+
+        cache = cls.get_cache()
+        record = cache.get(product_id)
+        if record is not None:
+            return cls._with_current_stock(record)
+
+        version = cache.version(product_id)
+        record = cls._load('p.product_id', product_id)
+        if record is not None:
+            cache.set(record, version)
+            record = dict(record)
+        return record
+
+    @classmethod
+    def get_by_sku(cls, sku):
+        """
+        Get a product's lookup record by SKU
+
+        Args:
+            sku (str): Product SKU
+
+        Returns:
+            dict: Lookup record (a copy) or None
+        """
+        if not Config.PRODUCT_CACHE_ENABLED:
+            return cls._load('p.sku', sku)
+
+        product_id = cls.get_cache().id_for_sku(sku)
+        if product_id is None:
+            # Resolve the SKU on its unique index, then load (and cache) by id
+            row = Database.execute_query(cls.SKU_SQL, (sku,), fetch_one=True, prepared=True)
+            if row is None:
+                return None
+            product_id = row['product_id']
+        return cls.get_by_id(product_id)
+
+    @classmethod
+    def invalidate(cls, product_id):
+        """
+        Drop a product's cached record after a write
+
+        Inside a unit of work the record is dropped again when it ends, so a
+        lookup racing the uncommitted write cannot leave a stale record.
+
+        Args:
+            product_id (int): Product ID
+        """
+        cache = cls.get_cache()
+        cache.invalidate(product_id)
+        if Database.current_unit() is not None:
+            Database.after_transaction(lambda: cache.invalidate(product_id))
+
+    @classmethod
+    def clear(cls):
+        """Drop every cached record (e.g. after a category or supplier rename)"""
+        cache = cls.get_cache()
+        cache.clear()
+        if Database.current_unit() is not None:
+            Database.after_transaction(cache.clear)
+
+    @classmethod
+    def _load(cls, column, value):
+        """Read a lookup record from the database"""
+        query = cls.LOOKUP_SQL.format(column=column)
+        return Database.execute_query(query, (value,), fetch_one=True, prepared=True)
+
+    @classmethod
+    def _with_current_stock(cls, record):
+        """Copy a cached record, re-reading its inventory row when configured"""
+        record = dict(record)
+        if Config.PRODUCT_CACHE_VERIFY_STOCK:
+            stock = Database.execute_query(cls.STOCK_SQL, (record['product_id'],), fetch_one=True, prepared=True)
+            for field in STOCK_FIELDS:
+                record[field] = stock[field] if stock else None
+            if stock is None:
+                record['quantity_in_stock'] = 0
+        return record
@@ -0,0 +1,295 @@
+"""
+Query Profiler Module
+=====================
+Opt-in, sampled per-request recording of every SQL statement
+"""
+
+import contextvars
+import random
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from app.config import Config
+
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+IN_LIST_PATTERN = re.compile(r"IN\s*\((?:\s*%s\s*,)+\s*%s\s*\)", re.IGNORECASE)
+VALUES_LIST_PATTERN = re.compile(r"(\([^()]*\))(?:\s*,\s*\1)+")
+
+
+def normalize_sql(sql):
+    """
+    Normalize SQL text so that statements of the same shape group together
+
+    Collapses whitespace, placeholder IN lists and repeated VALUES tuples.
+
+    Args:
+        sql (str): SQL text
+
+    Returns:
+        str: Normalized SQL
+    """
+    sql = WHITESPACE_PATTERN.sub(" ", sql).strip()
+    sql = IN_LIST_PATTERN.sub("IN (...)", sql)
+    return VALUES_LIST_PATTERN.sub(r"\1, ...", sql)
+
+
+class QueryProfile:
+    """Statements executed while handling one request"""
+
+    # Whether record() also receives each statement's parameters
+    keeps_params = False
+
+    def __init__(self, method, path):
+        self.profile_id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self.status_code = None
+        self.statements = []
+
+    def record(self, sql, duration_ms, rows, pool_wait_ms):
+        """
+        Add an executed statement
+
+        Args:
+            sql (str): Statement text
+            duration_ms (float): Execution time
+            rows (int): Rows affected or fetched so far
+            pool_wait_ms (float): Time spent waiting for the connection
+
+        Returns:
+            dict: The recorded entry (row count may be updated while fetching)
+        """
+        entry = {
+            'sql': normalize_sql(sql),
+            'duration_ms': round(duration_ms, 3),
+            'rows': rows,
+            'pool_wait_ms': round(pool_wait_ms, 3)
+        }
+        self.statements.append(entry)
+        return entry
+
+    @property
+    def query_count(self):
+        return len(self.statements)
+
+    @property
+    def total_ms(self):
+        return round(sum(entry['duration_ms'] for entry in self.statements), 3)
+
+    @property
+    def pool_wait_ms(self):
+        return round(sum(entry['pool_wait_ms'] for entry in self.statements), 3)
+
+    def to_dict(self, detail=False):
+        """
+        Serialize the profile
+
+        Args:
+            detail (bool): Include every statement
+
+        Returns:
+            dict: Profile summary (and statements)
+        """
+        data = {
+            'profile_id': self.profile_id,
+            'method': self.method,
+            'path': self.path,
+            'status_code': self.status_code,
+            'started_at': self.started_at,
+            'query_count': self.query_count,
+            'db_time_ms': self.total_ms,
+            'pool_wait_ms': self.pool_wait_ms
+        }
+        if detail:
+            data['statements'] = self.statements
+        return data
+
+
+class ProfiledCursor:
+    """Cursor proxy that records each statement into a QueryProfile"""
+
+    def __init__(self, cursor, profile, pool_wait_ms=0.0):
+        self._cursor = cursor
+        self._profile = profile
+        self._pool_wait_ms = pool_wait_ms
+        self._entry = None
+        self._count_fetches = False
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        finally:
+            self._record(operation, start, params)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            self._record(operation, start)
+
+    def callproc(self, procname, args=()):
+        start = time.perf_counter()
+        try:
+            return self._cursor.callproc(procname, args)
+        finally:
+            self._record(f"CALL {procname}", start)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._add_rows(1)
+        return row
+
+    def fetchmany(self, size=1):
+        rows = self._cursor.fetchmany(size)
+        self._add_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._add_rows(len(rows))
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _record(self, sql, start, params=None):
+        duration_ms = (time.perf_counter() - start) * 1000
+        rowcount = getattr(self._cursor, 'rowcount', -1)
+        # Unbuffered and prepared cursors only know their row count once fetched
+        self._count_fetches = rowcount is None or rowcount < 0
+        extra = (params,) if self._profile.keeps_params else ()
+        self._entry = self._profile.record(
+            sql, duration_ms, 0 if self._count_fetches else rowcount, self._pool_wait_ms, *extra
+        )
+        # Pool wait is attributed to the first statement on the checkout
+        self._pool_wait_ms = 0.0
+
+    def _add_rows(self, count):
+        if self._entry is not None and self._count_fetches:
+            self._entry['rows'] += count
+
+
+class QueryProfiler:
+    """
+    Per-request SQL profiler
+
+    When SQL_PROFILER_ENABLED is set, a SQL_PROFILER_SAMPLE_RATE fraction of
+    requests record every statement, plus any request sending
+    ``X-DB-Profile: 1`` when SQL_PROFILER_ALLOW_HEADER is also set. Totals are returned in X-DB-* response headers and the last
+    SQL_PROFILER_HISTORY profiles are kept for the debug endpoints.
+    """
+
+    _profile = contextvars.ContextVar('query_profile', default=None)
+    _history = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def current(cls):
+        """
+        Get the profile of the request being handled
+
+        The profile lives in a context variable, so statements run from
+        executor threads on behalf of the request are recorded too.
+
+        Returns:
+            QueryProfile: Active profile, or None when not sampled
+        """
+        return cls._profile.get()
+
+    @classmethod
+    def activate(cls, profile):
+        """Bind a profile (or None) to the current context"""
+        cls._profile.set(profile)
+
+    @classmethod
+    def wrap_cursor(cls, cursor, pool_wait_ms=0.0):
+        """
+        Wrap a cursor when the current request is being profiled
+
+        Returns:
+            cursor: ProfiledCursor, or the cursor unchanged
+        """
+        profile = cls.current()
+        if profile is None:
+            return cursor
+        return ProfiledCursor(cursor, profile, pool_wait_ms)
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Register the request hooks that start, report and store profiles
+
+        Args:
+            app (Flask): Application instance
+        """
+        if not app.config.get('SQL_PROFILER_ENABLED'):
+            return
+
+        from flask import request
+
+        sample_rate = app.config.get('SQL_PROFILER_SAMPLE_RATE', 1.0)
+        allow_header = app.config.get('SQL_PROFILER_ALLOW_HEADER', False)
+
+        @app.before_request
+        def start_query_profile():
+            forced = allow_header and request.headers.get('X-DB-Profile') == '1'
+            if forced or random.random() < sample_rate:
+                cls.activate(QueryProfile(request.method, request.path))
+            else:
+                cls.activate(None)
+
+        @app.after_request
+        def report_query_profile(response):
+            profile = cls.current()
+            if profile is None:
+                return response
+            profile.status_code = response.status_code
+            response.headers['X-DB-Query-Count'] = str(profile.query_count)
+            response.headers['X-DB-Time-Ms'] = f"{profile.total_ms:.3f}"
+            response.headers['X-DB-Pool-Wait-Ms'] = f"{profile.pool_wait_ms:.3f}"
+            response.headers['X-DB-Profile-Id'] = profile.profile_id
+            cls._store(profile)
+            return response
+
+        @app.teardown_request
+        def clear_query_profile(exc):
+            cls.activate(None)
+
+    @classmethod
+    def recent(cls, limit=50):
+        """
+        Get summaries of the most recent profiles, newest first
+
+        Returns:
+            list: Profile summaries
+        """
+        with cls._lock:
+            profiles = list(cls._history.values())[-limit:]
+        return [profile.to_dict() for profile in reversed(profiles)]
+
+    @classmethod
+    def get(cls, profile_id):
+        """
+        Get one stored profile with every statement
+
+        Returns:
+            dict: Profile detail, or None
+        """
+        with cls._lock:
+            profile = cls._history.get(profile_id)
+        return profile.to_dict(detail=True) if profile else None
+
+    @classmethod
+    def _store(cls, profile):
+        with cls._lock:
+            cls._history[profile.profile_id] = profile
+            while len(cls._history) > Config.SQL_PROFILER_HISTORY:
+                cls._history.popitem(last=False)
@@ -0,0 +1,156 @@
+"""
+Query Cache Module
+==================
+In-process cache of query results with TTL, LRU eviction and table-tag
+invalidation
+"""
+
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+
+class QueryCache:
+    """
+    Thread-safe result cache keyed by SQL text and parameters
+
+    Every entry is tagged with the tables its query reads. Writing to a table
+    invalidates all entries carrying that tag. Each tag also has a version
+    number that is bumped on invalidation, so a read that started before a
+    write cannot store its (now stale) result afterwards; clear() bumps a
+    cache-wide epoch that plays the same role for every tag.
+    """
+
+    def __init__(self, max_entries=1024, default_ttl=60):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._tag_keys = defaultdict(set)
+        self._tag_versions = defaultdict(int)
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    def get(self, key):
+        """
+        Look up a cached result
+
+        Args:
+            key (tuple): Cache key
+
+        Returns:
+            tuple: (found, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return False, None
+
+            expires_at, value, tags = entry
+            if expires_at <= time.monotonic():
+                self._remove(key, tags)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return True, value
+
+    def versions(self, tags):
+        """
+        Snapshot the versions of a set of tags before running a query
+
+        Args:
+            tags (tuple): Table names
+
+        Returns:
+            tuple: Version token to pass to set()
+        """
+        with self._lock:
+            return (self._epoch, *(self._tag_versions[tag] for tag in tags))
+
+    def set(self, key, value, tags, versions, ttl=None):
+        """
+        Store a result unless one of its tables was written meanwhile
+
+        Args:
+            key (tuple): Cache key
+            value: Query result
+            tags (tuple): Table names the query reads
+            versions (tuple): Token returned by versions() before the query ran
+            ttl (float): Seconds to keep the entry (defaults to default_ttl)
+        """
+        with self._lock:
+            if versions != (self._epoch, *(self._tag_versions[tag] for tag in tags)):
+                return
+
+            if key in self._entries:
+                self._remove(key, self._entries[key][2])
+
+            expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+            self._entries[key] = (expires_at, value, tags)
+            for tag in tags:
+                self._tag_keys[tag].add(key)
+            self._stats['stores'] += 1
+
+            while len(self._entries) > self.max_entries:
+                oldest_key, (_, _, oldest_tags) = next(iter(self._entries.items()))
+                self._remove(oldest_key, oldest_tags)
+                self._stats['evictions'] += 1
+
+    def invalidate_tables(self, tables):
+        """
+        Drop every entry that reads any of the given tables
+
+        Args:
+            tables (iterable): Table names
+        """
+        with self._lock:
+            for table in tables:
+                self._tag_versions[table] += 1
+                for key in list(self._tag_keys.get(table, ())):
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        self._remove(key, entry[2])
+                        self._stats['invalidations'] += 1
+
+    def clear(self):
+        """Drop every entry, including results of reads still running"""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._tag_keys.clear()
+
+    def stats(self):
+        """
+        Get cache statistics
+
+        Returns:
+            dict: Size, limits and hit/miss/eviction counters
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'default_ttl': self.default_ttl,
+                **self._stats
+            }
+
+    def _remove(self, key, tags):
+        """Remove an entry and its tag references (lock must be held)"""
+        self._entries.pop(key, None)
+        for tag in tags:
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
@@ -0,0 +1,424 @@
+"""
+Query Plan Check Module
+=======================
+EXPLAIN-based checks that the model queries keep using their indexes
+"""
+
+import itertools
+import json
+from datetime import date, timedelta
+
+from app.config import Config
+from app.models.database import Database
+from app.models.profiler import QueryProfile, QueryProfiler, normalize_sql
+
+
+# Defaults of the plan budget (overridable from the CLI)
+DEFAULT_MAX_EXAMINED_ROWS = 10000
+DEFAULT_SCAN_MIN_ROWS = 1000
+
+# Access types that read a whole table or a whole index
+FULL_SCAN_ACCESS = ('ALL', 'index')
+
+# Client sort columns each list reads in index order when ascending (the
+# ascending primary-key tiebreaker follows them in the index); the
+# tiebreaker itself is ordered in both directions
+INDEXED_SORTS = {
+    'Product': ('product_id', 'product_name', 'sku', 'created_at'),
+    'Inventory': ('inventory_id', 'product_id'),
+    'Transaction': ('transaction_id', 'transaction_date')
+}
+SORT_TIEBREAKERS = {'Product': 'product_id', 'Inventory': 'inventory_id', 'Transaction': 'transaction_id'}
+
+
+class PlanCapture(QueryProfile):
+    """Profile that keeps the text and parameters of every statement run"""
+
+    keeps_params = True
+
+    def __init__(self):
+        super().__init__('CHECK', 'query-plans')
+        self.executed = []
+
+    def record(self, sql, duration_ms, rows, pool_wait_ms, params=None):
+        """Keep the statement as executed, then record it as usual"""
+        self.executed.append((sql, tuple(params or ())))
+        return super().record(sql, duration_ms, rows, pool_wait_ms)
+
+
+class CaptureError(RuntimeError):
+    """A shape's model call failed or ran no SELECT, so it has no plan to check"""
+
+
+class QueryShape:
+    """
+    One way of calling a model method, with the plan allowances it needs
+
+    Allowances are explicit: 'full_scan' and 'filesort' exempt the shape's
+    statements from those checks, and max_rows=None lifts the examined-row
+    budget. Each allowance should come with the reason it is acceptable.
+    """
+
+    def __init__(self, name, call, allow=(), max_rows=DEFAULT_MAX_EXAMINED_ROWS, reason=None):
+        """
+        Args:
+            name (str): Shape name shown in the report
+            call (callable): Runs the model method (no arguments)
+            allow (tuple): 'full_scan' and/or 'filesort'
+            max_rows (int): Examined-row budget per statement (None for no budget)
+            reason (str): Why the allowances are acceptable
+        """
+        self.name = name
+        self.call = call
+        self.allow = frozenset(allow)
+        self.max_rows = max_rows
+        self.reason = reason
+
+
+def capture(call):
+    """
+    Run a model call and collect the SELECT statements it executed
+
+    Result caches are bypassed so every statement reaches MySQL.
+
+    Args:
+        call (callable): Model call
+
+    Returns:
+        list: Distinct (sql, params) pairs, in execution order
+
+    Raises:
+        CaptureError: The call returned success False or ran no SELECT
+            (models catch database errors, e.g. a missing FULLTEXT index)
+    """
+    profile = PlanCapture()
+    caches = (Config.QUERY_CACHE_ENABLED, Config.PRODUCT_CACHE_ENABLED)
+    Config.QUERY_CACHE_ENABLED = Config.PRODUCT_CACHE_ENABLED = False
+    QueryProfiler.activate(profile)
+    try:
+        result = call()
+    finally:
+        QueryProfiler.activate(None)
+        Config.QUERY_CACHE_ENABLED, Config.PRODUCT_CACHE_ENABLED = caches
+
+    if isinstance(result, dict) and result.get('success') is False:
+        raise CaptureError(f"model call failed: {result.get('error')}")
+
+    statements = {}
+    for sql, params in profile.executed:
+        if sql.lstrip().upper().startswith('SELECT'):
+            statements.setdefault(normalize_sql(sql), (sql, params))
+    if not statements:
+        raise CaptureError("model call ran no SELECT")
+    return list(statements.values())
+
+
+def explain(sql, params=()):
+    """
+    Get the optimizer plan of a statement
+
+    MySQL attaches Note 1003 to every EXPLAIN, so warnings are tolerated.
+
+    Returns:
+        dict: Parsed EXPLAIN FORMAT=JSON output
+    """
+    row = Database.execute_query(f"EXPLAIN FORMAT=JSON {sql}", params, fetch_one=True, tolerate_warnings=True)
+    return json.loads(row['EXPLAIN'])
+
+
+def join_sequences(node):
+    """
+    Yield every join sequence of an EXPLAIN JSON tree
+
+    A sequence is the list of table entries of one nested loop (or a single
+    table), in join order; subqueries and derived tables yield their own.
+    """
+    if isinstance(node, list):
+        for item in node:
+            yield from join_sequences(item)
+        return
+    if not isinstance(node, dict):
+        return
+
+    if 'nested_loop' in node:
+        tables = [entry['table'] for entry in node['nested_loop'] if 'table' in entry]
+    elif 'table' in node:
+        tables = [node['table']]
+    else:
+        tables = []
+    if tables:
+        yield tables
+    for table in tables:
+        yield from join_sequences(list(table.values()))
+    for key, value in node.items():
+        if key not in ('nested_loop', 'table'):
+            yield from join_sequences(value)
+
+
+def uses_filesort(node):
+    """Whether any operation of an EXPLAIN JSON tree sorts with a filesort"""
+    if isinstance(node, list):
+        return any(uses_filesort(item) for item in node)
+    if isinstance(node, dict):
+        return node.get('using_filesort') is True or any(uses_filesort(value) for value in node.values())
+    return False
+
+
+def examined_rows(plan):
+    """
+    Estimate the rows a plan examines
+
+    Each table is scanned once per row produced by the tables joined before
+    it, so a nested loop examines sum(rows_examined_per_scan * prefix rows).
+    """
+    total = 0
+    for tables in join_sequences(plan):
+        loops = 1
+        for table in tables:
+            total += loops * table.get('rows_examined_per_scan', 0)
+            loops = max(table.get('rows_produced_per_join', 0), 1)
+    return total
+
+
+def check_plan(plan, shape, scan_min_rows=DEFAULT_SCAN_MIN_ROWS):
+    """
+    Check one statement's plan against a shape's allowances
+
+    Args:
+        plan (dict): EXPLAIN FORMAT=JSON output
+        shape (QueryShape): Shape the statement belongs to
+        scan_min_rows (int): Tables estimated smaller than this may be scanned and sorted
+
+    Returns:
+        tuple: (violations list, estimated examined rows)
+    """
+    violations = []
+    rows = examined_rows(plan)
+
+    if 'full_scan' not in shape.allow:
+        for tables in join_sequences(plan):
+            for table in tables:
+                scanned = table.get('rows_examined_per_scan', 0)
+                if table.get('access_type') in FULL_SCAN_ACCESS and scanned >= scan_min_rows:
+                    kind = 'full table scan' if table['access_type'] == 'ALL' else 'full index scan'
+                    violations.append(f"{kind} of {table.get('table_name')} (~{scanned} rows)")
+
+    if 'filesort' not in shape.allow and rows >= scan_min_rows and uses_filesort(plan):
+        violations.append(f"filesort over ~{rows} examined rows")
+
+    if shape.max_rows is not None and rows > shape.max_rows:
+        violations.append(f"~{rows} rows examined, budget {shape.max_rows}")
+    return violations, rows
+
+
+def check_shapes(shapes, scan_min_rows=DEFAULT_SCAN_MIN_ROWS):
+    """
+    Capture and check every statement of every shape
+
+    Args:
+        shapes (list): QueryShape instances
+        scan_min_rows (int): See check_plan()
+
+    Returns:
+        list: One result per statement (shape, sql, examined rows, violations);
+            a shape whose call fails gives one result with an empty sql
+    """
+    results = []
+    for shape in shapes:
+        try:
+            statements = capture(shape.call)
+        except CaptureError as e:
+            results.append({'shape': shape.name, 'sql': '', 'rows': 0, 'violations': [str(e)]})
+            continue
+        for sql, params in statements:
+            violations, rows = check_plan(explain(sql, params), shape, scan_min_rows)
+            results.append({
+                'shape': shape.name,
+                'sql': normalize_sql(sql),
+                'rows': rows,
+                'violations': violations
+            })
+    return results
+
+
+def filter_combinations(options):
+    """
+    Every combination of optional filters
+
+    Args:
+        options (dict): Filter name -> sample value
+
+    Yields:
+        dict: The filters set in one combination (the empty one first)
+    """
+    names = list(options)
+    for enabled in itertools.product((False, True), repeat=len(names)):
+        yield {name: options[name] for name, on in zip(names, enabled) if on}
+
+
+def describe(filters):
+    """Short label of a filter combination"""
+    return ', '.join(f"{name}={value!r}" for name, value in filters.items()) or 'no filters'
+
+
+def sample_values():
+    """
+    Pick real filter values from the database being checked
+
+    Returns:
+        dict: Busiest product (id, sku, category, supplier, a name word),
+            a supplier city and a 30-day date range
+    """
+    busiest = Database.execute_query("""
+        SELECT product_id FROM transactions
+        GROUP BY product_id ORDER BY COUNT(*) DESC LIMIT 1
+    """, fetch_one=True)
+    product = Database.execute_query(
+        "SELECT product_id, product_name, sku, category_id, supplier_id FROM products "
+        + ("WHERE product_id = %s" if busiest else "ORDER BY product_id LIMIT 1"),
+        (busiest['product_id'],) if busiest else (),
+        fetch_one=True
+    )
+    if product is None:
+        raise RuntimeError("No products to check against; load sample_data.sql or run benchmarks.seed_data first")
+
+    words = [word for word in product['product_name'].split() if len(word) >= Config.SEARCH_NGRAM_SIZE]
+    supplier = Database.execute_query("SELECT company_name FROM suppliers ORDER BY supplier_id LIMIT 1",
+                                      fetch_one=True)
+    today = date.today()
+    return {
+        **product,
+        'name_word': words[0] if words else product['product_name'][:Config.SEARCH_NGRAM_SIZE],
+        'supplier_word': (supplier['company_name'].split() or ['a'])[0] if supplier else 'a',
+        'start_date': (today - timedelta(days=30)).isoformat(),
+        'end_date': today.isoformat()
+    }
+
+
+def model_shapes(sample):
+    """
+    Enumerate the query shapes of the model classes
+
+    Every filter combination of the list methods is checked in offset and
+    keyset mode; search terms cover each SearchPlanner strategy (SKU prefix,
+    full-text, short prefix). Every whitelisted client sort column is
+    checked in both directions.
+
+    Args:
+        sample (dict): Values from sample_values()
+
+    Returns:
+        list: QueryShape instances
+    """
+    from app.models.category import Category
+    from app.models.inventory import Inventory
+    from app.models.product import Product
+    from app.models.supplier import Supplier
+    from app.models.transaction import Transaction
+
+    shapes = []
+    full_aggregate = dict(allow=('full_scan', 'filesort'), max_rows=None)
+    searches = {'sku': sample['sku'], 'fulltext': sample['name_word'], 'prefix': sample['name_word'][0]}
+
+    # Products: every search strategy x category x supplier
+    for term in [None, *searches.values()]:
+        options = {'category_id': sample['category_id'], 'supplier_id': sample['supplier_id']}
+        for filters in filter_combinations(options):
+            if term is not None:
+                filters = {'search': term, **filters}
+            label = describe(filters)
+            shapes.append(QueryShape(f"Product.get_all page ({label})",
+                                     lambda f=filters: Product.get_all(include_total='none', **f)))
+            shapes.append(QueryShape(f"Product.get_all keyset ({label})",
+                                     lambda f=filters: Product.get_all(cursor='', include_total='none', **f)))
+            if filters:
+                shapes.append(QueryShape(f"Product.get_all count+facets ({label})",
+                                         lambda f=filters: Product.get_all(facets=True, **f)))
+    shapes.append(QueryShape("Product.get_all count+facets (no filters)",
+                             lambda: Product.get_all(facets=True),
+                             reason="counting and faceting every product reads them all", **full_aggregate))
+    shapes.append(QueryShape("Product.get_by_id", lambda: Product.get_by_id(sample['product_id'])))
+    shapes.append(QueryShape("Product.get_by_sku", lambda: Product.get_by_sku(sample['sku'])))
+    shapes.append(QueryShape("Product.check_sku_exists", lambda: Product.check_sku_exists(sample['sku'])))
+    shapes.append(QueryShape("Product.get_low_stock (threshold)", lambda: Product.get_low_stock(5)))
+    shapes.append(QueryShape("Product.get_low_stock (reorder level)", lambda: Product.get_low_stock(),
+                             reason="quantity <= reorder_level compares two columns; no index applies",
+                             **full_aggregate))
+
+    # Suppliers, categories
+    for filters in filter_combinations({'search': sample['supplier_word']}):
+        label = describe(filters)
+        shapes.append(QueryShape(f"Supplier.get_all page ({label})",
+                                 lambda f=filters: Supplier.get_all(include_total='none', **f)))
+        shapes.append(QueryShape(f"Supplier.get_all keyset ({label})",
+                                 lambda f=filters: Supplier.get_all(cursor='', include_total='none', **f)))
+    shapes.append(QueryShape("Supplier.get_products", lambda: Supplier.get_products(sample['supplier_id'])))
+    shapes.append(QueryShape("Category.get_all", Category.get_all,
+                             reason="lists every category with its product count", **full_aggregate))
+
+    # Inventory
+    for term in [None, *searches.values()]:
+        filters = {'search': term} if term is not None else {}
+        label = describe(filters)
+        shapes.append(QueryShape(f"Inventory.get_all page ({label})",
+                                 lambda f=filters: Inventory.get_all(include_total='none', **f)))
+        shapes.append(QueryShape(f"Inventory.get_all keyset ({label})",
+                                 lambda f=filters: Inventory.get_all(cursor='', include_total='none', **f)))
+    shapes.append(QueryShape("Inventory.get_by_product_id", lambda: Inventory.get_by_product_id(sample['product_id'])))
+    for name in ('get_stock_summary', 'get_by_category', 'get_by_supplier'):
+        shapes.append(QueryShape(f"Inventory.{name}", getattr(Inventory, name),
+                                 reason="whole-inventory report", **full_aggregate))
+
+    # Transactions: product x type x date range, offset and keyset
+    options = {
+        'product_id': sample['product_id'],
+        'transaction_type': 'STOCK_OUT',
+        'dates': (sample['start_date'], sample['end_date'])
+    }
+    for filters in filter_combinations(options):
+        label = describe(filters)
+        arguments = dict(filters)
+        if 'dates' in arguments:
+            arguments['start_date'], arguments['end_date'] = arguments.pop('dates')
+        shapes.append(QueryShape(f"Transaction.get_all page ({label})",
+                                 lambda a=arguments: Transaction.get_all(include_total='none', **a)))
+        shapes.append(QueryShape(f"Transaction.get_all keyset ({label})",
+                                 lambda a=arguments: Transaction.get_all(cursor='', include_total='none', **a)))
+        if filters:
+            shapes.append(QueryShape(f"Transaction.get_all count ({label})",
+                                     lambda a=arguments: Transaction.get_all(**a)))
+    shapes.append(QueryShape("Transaction.get_all count (no filters)", lambda: Transaction.get_all(),
+                             reason="an exact count of every transaction reads them all", **full_aggregate))
+    for filters in filter_combinations({'dates': (sample['start_date'], sample['end_date'])}):
+        dates = filters.get('dates', (None, None))
+        shapes.append(QueryShape(f"Transaction.get_by_product ({describe(filters)})",
+                                 lambda d=dates: Transaction.get_by_product(sample['product_id'], *d)))
+    shapes.append(QueryShape("Transaction.get_summary (date range)",
+                             lambda: Transaction.get_summary(sample['start_date'], sample['end_date'])))
+    shapes.append(QueryShape("Transaction.get_summary (all time)", lambda: Transaction.get_summary(),
+                             reason="an all-time summary reads every transaction", **full_aggregate))
+    for interval in Transaction.TREND_INTERVALS:
+        shapes.append(QueryShape(f"Transaction.get_trend ({interval})",
+                                 lambda i=interval: Transaction.get_trend(sample['start_date'], sample['end_date'], i)))
+    shapes.append(QueryShape("Transaction.get_trend (product)",
+                             lambda: Transaction.get_trend(sample['start_date'], sample['end_date'],
+                                                           product_id=sample['product_id'])))
+    shapes.append(QueryShape("Transaction.get_recent_transactions",
+                             lambda: Transaction.get_recent_transactions(10)))
+
+    # Client sorts (SORT_COLUMNS whitelists), first offset page
+    for model in (Product, Inventory, Transaction):
+        name = model.__name__
+        for column in model.SORT_COLUMNS:
+            for direction in ('asc', 'desc'):
+                ordered = column == SORT_TIEBREAKERS[name] or (column in INDEXED_SORTS[name] and direction == 'asc')
+                allowance = {} if ordered else dict(
+                    reason="no index gives this order; the whitelist accepts sorting the whole list",
+                    **full_aggregate
+                )
+                shapes.append(QueryShape(
+                    f"{name}.get_all sort ({column} {direction})",
+                    lambda m=model, s=[(column, direction)]: m.get_all(include_total='none', sort=s),
+                    **allowance
+                ))
+    return shapes
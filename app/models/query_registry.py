@@ -0,0 +1,173 @@
+"""
+Query Registry Module
+=====================
+Compiles model SQL once per filter combination and caches server-side
+prepared statements per pooled connection
+"""
+
+import threading
+from collections import OrderedDict
+
+from mysql.connector import Error
+
+from app.config import Config
+
+
+class QueryRegistry:
+    """
+    Registry of compiled SQL text keyed by query name and active filters
+
+    Names may embed client-chosen ORDER BY text, so the registry is an LRU
+    bounded by QUERY_REGISTRY_MAX_SIZE.
+    """
+
+    _compiled = OrderedDict()
+    _lock = threading.Lock()
+    _stats = {
+        'compile_hits': 0,
+        'compile_misses': 0,
+        'compile_evictions': 0,
+        'statement_hits': 0,
+        'statement_misses': 0,
+        'statement_evictions': 0
+    }
+
+    @classmethod
+    def compile(cls, name, conditions, builder):
+        """
+        Get the SQL for a query variant, building it on first use
+
+        Conditions are the parameterised WHERE fragments (values are bound
+        separately), so there is one compiled variant per filter combination.
+
+        Args:
+            name (str): Query name, e.g. 'products.page'
+            conditions (list): WHERE condition fragments joined with AND
+            builder (callable): Receives the WHERE clause, returns the SQL
+
+        Returns:
+            str: Compiled SQL text
+        """
+        key = (name, tuple(conditions))
+        with cls._lock:
+            sql = cls._compiled.get(key)
+            if sql is not None:
+                cls._compiled.move_to_end(key)
+                cls._stats['compile_hits'] += 1
+                return sql
+
+        where_clause = " AND ".join(conditions) if conditions else "1=1"
+        sql = builder(where_clause)
+        with cls._lock:
+            cls._compiled[key] = sql
+            cls._stats['compile_misses'] += 1
+            while len(cls._compiled) > Config.QUERY_REGISTRY_MAX_SIZE:
+                cls._compiled.popitem(last=False)
+                cls._stats['compile_evictions'] += 1
+        return sql
+
+    @classmethod
+    def stats(cls):
+        """
+        Get registry statistics
+
+        Returns:
+            dict: Compiled variants plus compile and prepared-statement hit/miss counters
+        """
+        with cls._lock:
+            return {'compiled_queries': len(cls._compiled), **cls._stats}
+
+    @classmethod
+    def _count(cls, counter, amount=1):
+        with cls._lock:
+            cls._stats[counter] += amount
+
+
+class StatementCache:
+    """
+    LRU cache of prepared-statement cursors belonging to one connection
+
+    Each cursor keeps its server-side statement handle between checkouts, so
+    re-running the same SQL skips the parse/prepare round trip.
+    """
+
+    def __init__(self, connection, max_size=64):
+        self._connection = connection
+        self._max_size = max_size
+        self._cursors = OrderedDict()
+
+    def cursor(self, operation, dictionary=True):
+        """
+        Get the prepared cursor for a statement, preparing it on first use
+
+        Args:
+            operation (str): SQL text
+            dictionary (bool): Return rows as dictionaries
+
+        Returns:
+            MySQLCursorPrepared: Cursor bound to the server-side statement
+        """
+        key = (operation, dictionary)
+        cursor = self._cursors.get(key)
+        if cursor is not None:
+            self._cursors.move_to_end(key)
+            QueryRegistry._count('statement_hits')
+            return cursor
+
+        QueryRegistry._count('statement_misses')
+        cursor = self._connection.cursor(prepared=True, dictionary=dictionary)
+        self._cursors[key] = cursor
+        if len(self._cursors) > self._max_size:
+            _, evicted = self._cursors.popitem(last=False)
+            QueryRegistry._count('statement_evictions')
+            self._close_quietly(evicted)
+        return cursor
+
+    def clear(self):
+        """Deallocate every cached statement on the server"""
+        while self._cursors:
+            _, cursor = self._cursors.popitem()
+            self._close_quietly(cursor)
+
+    def discard(self):
+        """Forget cached statements without talking to the server"""
+        self._cursors.clear()
+
+    @staticmethod
+    def _close_quietly(cursor):
+        try:
+            cursor.close()
+        except Error:
+            pass
+
+
+class PreparedStatementCursor:
+    """
+    Cursor facade that executes through a connection's statement cache
+
+    Results are always read to completion so the cached cursor can be reused
+    by the next statement on the same connection.
+    """
+
+    def __init__(self, statement_cache, dictionary=True):
+        self._statement_cache = statement_cache
+        self._dictionary = dictionary
+        self._cursor = None
+
+    def execute(self, operation, params=()):
+        self._cursor = self._statement_cache.cursor(operation, self._dictionary)
+        self._cursor.execute(operation, params)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchone(self):
+        rows = self._cursor.fetchall()
+        return rows[0] if rows else None
+
+    def close(self):
+        """Keep the underlying statement cached for the next execution"""
+        self._cursor = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
@@ -0,0 +1,123 @@
+"""
+Search Module
+=============
+Plans index-friendly WHERE conditions for free-text list searches
+"""
+
+import re
+
+from app.config import Config
+
+
+# Terms in the SKU format CATEGORY-SUBCATEGORY-NNN (e.g. COMP-LAP-001, comp-lap-)
+# are matched as a SKU prefix. At least two hyphens, so hyphenated words in
+# names (Wi-Fi, USB-C, T-Shirt) still go to the full-text search.
+SKU_PATTERN = re.compile(r"^[A-Z0-9]+-[A-Z0-9]+-[A-Z0-9]*$", re.IGNORECASE)
+
+# Characters with a meaning in LIKE patterns or FULLTEXT boolean mode
+LIKE_SPECIAL = re.compile(r"([\\%_])")
+BOOLEAN_SPECIAL = re.compile(r"[+\-<>()~*\"@]")
+
+
+def escape_like(term):
+    """
+    Escape LIKE wildcards so the term matches literally
+
+    Args:
+        term (str): Raw search term
+
+    Returns:
+        str: Escaped term
+    """
+    return LIKE_SPECIAL.sub(r"\\\1", term)
+
+
+class SearchPlan:
+    """WHERE condition (and optional relevance expression) for one search term"""
+
+    def __init__(self, strategy, condition, params, rank=None, rank_params=()):
+        self.strategy = strategy
+        self.condition = condition
+        self.params = list(params)
+        self.rank = rank
+        self.rank_params = list(rank_params)
+
+
+class SearchPlanner:
+    """
+    Chooses how to search a set of columns for a user-entered term
+
+    - ``sku_prefix``: terms shaped like a SKU become ``sku LIKE 'term%'``,
+      an index range scan on the SKU index
+    - ``fulltext``: other terms use the ngram FULLTEXT index with every word
+      required (substring semantics, like the old ``LIKE '%term%'``) and
+      expose a relevance expression for ranking
+    - ``prefix``: terms shorter than the ngram token size cannot use the
+      FULLTEXT index and become prefix LIKEs on the indexed columns
+    - ``like``: the original leading-wildcard LIKE, used when
+      SEARCH_FULLTEXT_ENABLED is off (e.g. before migration 002 is applied)
+    """
+
+    def __init__(self, fulltext_columns, prefix_columns, sku_column=None):
+        """
+        Args:
+            fulltext_columns (tuple): Columns of the FULLTEXT index, in index order
+            prefix_columns (tuple): B-tree indexed columns for prefix matching
+            sku_column (str): SKU column, enables the sku_prefix strategy
+        """
+        self.fulltext_columns = fulltext_columns
+        self.prefix_columns = prefix_columns
+        self.sku_column = sku_column
+
+    def plan(self, term):
+        """
+        Plan the search for a term
+
+        Args:
+            term (str): Search term as entered
+
+        Returns:
+            SearchPlan: Condition to AND into the WHERE clause, or None for no search
+        """
+        term = (term or "").strip()
+        if not term:
+            return None
+
+        if not Config.SEARCH_FULLTEXT_ENABLED:
+            return self._like_plan(term)
+
+        if self.sku_column and SKU_PATTERN.match(term):
+            return SearchPlan('sku_prefix', f"{self.sku_column} LIKE %s", [escape_like(term.upper()) + "%"])
+
+        words = [word for word in BOOLEAN_SPECIAL.sub(" ", term).split()
+                 if len(word) >= Config.SEARCH_NGRAM_SIZE]
+        if not words:
+            return self._prefix_plan(term)
+
+        expression = " ".join(f'+"{word}"' for word in words)
+        match = f"MATCH({', '.join(self.fulltext_columns)}) AGAINST (%s IN BOOLEAN MODE)"
+        return SearchPlan('fulltext', match, [expression], rank=match, rank_params=[expression])
+
+    def _prefix_plan(self, term):
+        pattern = escape_like(term) + "%"
+        condition = " OR ".join(f"{column} LIKE %s" for column in self.prefix_columns)
+        return SearchPlan('prefix', f"({condition})", [pattern] * len(self.prefix_columns))
+
+    def _like_plan(self, term):
+        pattern = f"%{escape_like(term)}%"
+        condition = " OR ".join(f"{column} LIKE %s" for column in self.fulltext_columns)
+        return SearchPlan('like', f"({condition})", [pattern] * len(self.fulltext_columns))
+
+
+# Product name / SKU search (products and inventory lists)
+PRODUCT_SEARCH = SearchPlanner(
+    fulltext_columns=('p.product_name', 'p.sku'),
+    prefix_columns=('p.product_name', 'p.sku'),
+    sku_column='p.sku'
+)
+
+# Supplier company / contact / city search
+SUPPLIER_SEARCH = SearchPlanner(
+    fulltext_columns=('company_name', 'contact_person', 'city'),
+    prefix_columns=('company_name', 'city')
+)
@@ -0,0 +1,299 @@
+"""
+Product Suggest Module
+======================
+In-process prefix index over product names and SKUs for typeahead
+"""
+
+import re
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from app.config import Config
+from app.models.database import Database
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lower-case alphanumeric words of a product name or query"""
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+class SortedPrefixIndex:
+    """
+    Sorted (key, product_id) pairs stored as two parallel arrays
+
+    Keys are kept in a plain list (equal keys share one interned string) and
+    ids in an int array, so a million products cost a few dozen megabytes.
+    Prefix lookups are a bisect plus a forward scan; inserts and deletes
+    keep the arrays sorted by (key, product_id).
+    """
+
+    def __init__(self, pairs=()):
+        pairs = sorted(pairs)
+        self.keys = [key for key, _ in pairs]
+        self.ids = array('q', (product_id for _, product_id in pairs))
+
+    def add(self, key, product_id):
+        lo = bisect_left(self.keys, key)
+        hi = bisect_right(self.keys, key, lo)
+        position = bisect_left(self.ids, product_id, lo, hi)
+        self.keys.insert(position, key)
+        self.ids.insert(position, product_id)
+
+    def remove(self, key, product_id):
+        lo = bisect_left(self.keys, key)
+        hi = bisect_right(self.keys, key, lo)
+        position = bisect_left(self.ids, product_id, lo, hi)
+        if position < hi and self.ids[position] == product_id:
+            del self.keys[position]
+            del self.ids[position]
+
+    def scan(self, prefix):
+        """Yield product ids whose key starts with prefix, in key order"""
+        position = bisect_left(self.keys, prefix)
+        keys, ids = self.keys, self.ids
+        while position < len(keys) and keys[position].startswith(prefix):
+            yield ids[position]
+            position += 1
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class SuggestIndex:
+    """
+    Prefix index over product name words and SKUs
+
+    A query matches a product when its SKU starts with the query, or when
+    every query word is a prefix of some word of the product name (so
+    "ins lap" finds "Dell Inspiron 15 Laptop"). SKU matches come first, then
+    names starting with the query, then other name matches, alphabetically.
+    """
+
+    def __init__(self, products=()):
+        """
+        Args:
+            products (iterable): (product_id, product_name, sku) tuples
+        """
+        self._products = {}
+        word_pairs = []
+        sku_pairs = []
+        for product_id, name, sku in products:
+            entry = self._entry(name, sku)
+            self._products[product_id] = entry
+            word_pairs.extend((word, product_id) for word in entry[3])
+            sku_pairs.append((entry[2], product_id))
+        self._words = SortedPrefixIndex(word_pairs)
+        self._skus = SortedPrefixIndex(sku_pairs)
+
+    @staticmethod
+    def _entry(name, sku):
+        """(name, sku, lower-case sku, unique interned name words)"""
+        words = tuple(sorted({sys.intern(word) for word in tokenize(name)}))
+        return (name, sku, (sku or "").lower(), words)
+
+    def add(self, product_id, name, sku):
+        """Index a product, replacing any previous version of it"""
+        self.remove(product_id)
+        entry = self._entry(name, sku)
+        self._products[product_id] = entry
+        for word in entry[3]:
+            self._words.add(word, product_id)
+        self._skus.add(entry[2], product_id)
+
+    def remove(self, product_id):
+        """Drop a product from the index"""
+        entry = self._products.pop(product_id, None)
+        if entry is None:
+            return
+        for word in entry[3]:
+            self._words.remove(word, product_id)
+        self._skus.remove(entry[2], product_id)
+
+    def suggest(self, query, limit=10):
+        """
+        Find products matching a typed prefix
+
+        Args:
+            query (str): Text typed so far
+            limit (int): Maximum suggestions
+
+        Returns:
+            list: Suggestions with product_id, product_name and sku
+        """
+        query = (query or "").strip().lower()
+        if not query:
+            return []
+
+        # Examine a bounded number of candidates (matching or not), then rank them
+        budget = limit * Config.SUGGEST_SCAN_FACTOR
+        examined = 0
+        ranked = {}
+
+        for product_id in self._skus.scan(query):
+            ranked[product_id] = 0
+            examined += 1
+            if examined >= budget:
+                break
+
+        words = tokenize(query)
+        if words and examined < budget:
+            # Drive the scan from the longest (most selective) word
+            driver = max(words, key=len)
+            for product_id in self._words.scan(driver):
+                examined += 1
+                if examined > budget:
+                    break
+                if product_id in ranked:
+                    continue
+                name, _, _, product_words = self._products[product_id]
+                if all(any(word.startswith(prefix) for word in product_words) for prefix in words):
+                    ranked[product_id] = 1 if name.lower().startswith(query) else 2
+
+        order = sorted(ranked, key=lambda product_id: (ranked[product_id], self._products[product_id][0].lower()))
+        return [
+            {'product_id': product_id, 'product_name': self._products[product_id][0], 'sku': self._products[product_id][1]}
+            for product_id in order[:limit]
+        ]
+
+    def stats(self):
+        """Number of products and index entries"""
+        return {'products': len(self._products), 'word_entries': len(self._words), 'sku_entries': len(self._skus)}
+
+
+class ProductSuggest:
+    """
+    Process-wide product suggest index
+
+    Built from the products table when the process serves its first
+    request (CLI commands never build it) and kept current by
+    Product.create/update/delete once their transaction commits. Each
+    worker process has its own copy; SUGGEST_REFRESH_SECONDS rebuilds it
+    periodically to pick up writes made by other processes.
+    """
+
+    _index = SuggestIndex()
+    _lock = threading.Lock()
+    # Serialises rebuilds (refresh thread vs POST /api/system/suggest-index)
+    _build_lock = threading.Lock()
+    _journal = None
+    _started = False
+    _built_at = None
+    _build_ms = None
+
+    @classmethod
+    def init_app(cls, app):
+        """
+        Build the index and start the optional refresh thread on the first request
+
+        Args:
+            app (Flask): Application instance
+        """
+        if not app.config.get('SUGGEST_ENABLED'):
+            return
+
+        interval = app.config.get('SUGGEST_REFRESH_SECONDS', 0)
+
+        @app.before_request
+        def start_product_suggest():
+            if not cls._started:
+                cls._start(interval)
+
+    @classmethod
+    def _start(cls, interval):
+        """Build the index once per process and start the refresh thread"""
+        with cls._build_lock:
+            if cls._started:
+                return
+            cls._started = True
+        cls.build()
+        if interval > 0:
+            thread = threading.Thread(target=cls._refresh_loop, args=(interval,),
+                                      name='suggest-refresh', daemon=True)
+            thread.start()
+
+    @classmethod
+    def build(cls):
+        """
+        Rebuild the index from the products table
+
+        Writes applied while the rebuild reads the table are journaled and
+        replayed on the new index, so none are lost by the swap. Concurrent
+        calls run one after another, so a build never discards another's
+        journal or installs an older index over a newer one.
+
+        Returns:
+            bool: True when the index was rebuilt
+        """
+        with cls._build_lock:
+            start = time.perf_counter()
+            with cls._lock:
+                cls._journal = []
+            try:
+                rows = Database.iter_query("SELECT product_id, product_name, sku FROM products", dictionary=False)
+                index = SuggestIndex(rows)
+            except Exception as e:
+                print(f"✗ Error building product suggest index: {e}")
+                with cls._lock:
+                    cls._journal = None
+                return False
+
+            with cls._lock:
+                for operation, args in cls._journal:
+                    getattr(index, operation)(*args)
+                cls._index = index
+                cls._journal = None
+                cls._built_at = time.time()
+                cls._build_ms = round((time.perf_counter() - start) * 1000, 1)
+        return True
+
+    @classmethod
+    def add(cls, product_id, name, sku):
+        """Index a created or updated product"""
+        cls._apply('add', (product_id, name, sku))
+
+    @classmethod
+    def remove(cls, product_id):
+        """Remove a deleted product"""
+        cls._apply('remove', (product_id,))
+
+    @classmethod
+    def suggest(cls, query, limit=10):
+        """
+        Get typeahead suggestions without touching the database
+
+        Returns:
+            list: Suggestions (product_id, product_name, sku)
+        """
+        with cls._lock:
+            return cls._index.suggest(query, limit)
+
+    @classmethod
+    def stats(cls):
+        """
+        Get index size and build information
+
+        Returns:
+            dict: Index statistics
+        """
+        with cls._lock:
+            return {**cls._index.stats(), 'built_at': cls._built_at, 'build_ms': cls._build_ms}
+
+    @classmethod
+    def _apply(cls, operation, args):
+        """Apply a write to the live index and journal it for a running rebuild"""
+        with cls._lock:
+            getattr(cls._index, operation)(*args)
+            if cls._journal is not None:
+                cls._journal.append((operation, args))
+
+    @classmethod
+    def _refresh_loop(cls, interval):
+        while True:
+            time.sleep(interval)
+            cls.build()
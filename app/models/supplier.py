@@ -4,69 +4,122 @@ Supplier Model
 Handles all supplier-related database operations
 """
 
-from app.models.database import Database
+from app.models.database import Database, clamp_page_size, offset_pagination, split_page
+from app.models.keyset import KeysetPager
+from app.models.product_cache import ProductLookup
+from app.models.query_registry import QueryRegistry
+from app.models.search import SUPPLIER_SEARCH
 from mysql.connector import Error
 
 
 class Supplier:
     """Supplier model for managing supplier data"""
 
+    # Keyset pagination order: newest first, supplier_id breaks ties
+    KEYSET = KeysetPager(
+        'suppliers',
+        [('created_at', 'created_at'), ('supplier_id', 'supplier_id')],
+        descending=True
+    )
+
     @staticmethod
-    def get_all(page=1, per_page=10, search=None):
+    def get_all(page=1, per_page=10, search=None, row_format='rows', cursor=None, include_total='exact'):
         """
         Get all suppliers with pagination
 
+        Passing a cursor (empty string for the first page) switches from
+        offset to keyset pagination on (created_at, supplier_id).
+
         Args:
             page (int): Page number
             per_page (int): Items per page
             search (str): Search term
+            row_format (str): 'rows' (dict per row) or 'columns' (column list plus row lists)
+            cursor (str): Keyset cursor from the previous page
+            include_total (str): 'exact' (cached COUNT), 'estimated' (optimizer estimate) or 'none'
 
         Returns:
             dict: Suppliers and pagination info
         """
         try:
-            where_clause = "1=1"
+            per_page = clamp_page_size(per_page)
+            where_conditions = []
             params = []
 
-            if search:
-                where_clause = "(company_name LIKE %s OR contact_person LIKE %s OR city LIKE %s)"
-                params = [f"%{search}%", f"%{search}%", f"%{search}%"]
+            search_plan = SUPPLIER_SEARCH.plan(search)
+            if search_plan:
+                where_conditions.append(search_plan.condition)
+                params.extend(search_plan.params)
 
-            # Count total
-            count_query = f"SELECT COUNT(*) as total FROM suppliers WHERE {where_clause}"
-            total_result = Database.execute_query(count_query, tuple(params), fetch_one=True)
-            total = total_result['total'] if total_result else 0
+            if cursor is not None:
+                return Supplier._get_keyset_page(where_conditions, params, per_page, row_format, cursor)
+
+            # Count total (cached, estimated or skipped)
+            count_query = QueryRegistry.compile(
+                'suppliers.count', where_conditions,
+                lambda where_clause: f"SELECT COUNT(*) as total FROM suppliers WHERE {where_clause}"
+            )
+            total = Database.count_total(count_query, tuple(params), include_total, ('suppliers',))
 
             # Get paginated data
             offset = (page - 1) * per_page
-            query = f"""
+            order_by = "created_at DESC"
+            if search_plan and search_plan.rank:
+                # Most relevant matches first
+                order_by = f"{search_plan.rank} DESC, {order_by}"
+                params.extend(search_plan.rank_params)
+            query = QueryRegistry.compile(f'suppliers.page:{order_by}', where_conditions, lambda where_clause: f"""
                 SELECT * FROM suppliers
                 WHERE {where_clause}
-                ORDER BY created_at DESC
+                ORDER BY {order_by}
                 LIMIT %s OFFSET %s
-            """
-            params.extend([per_page, offset])
-            suppliers = Database.execute_query(query, tuple(params))
+            """)
+            params.extend([per_page + 1, offset])
+            result = Database.execute_query(query, tuple(params), prepared=True, row_format=row_format)
+
+            suppliers, has_more = split_page(result, per_page)
 
             return {
                 'success': True,
                 'data': suppliers,
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': total,
-                    'pages': (total + per_page - 1) // per_page
-                }
+                'pagination': offset_pagination(page, per_page, total, include_total, has_more)
             }
-        except Error as e:
+        except (Error, ValueError) as e:
             return {'success': False, 'error': str(e)}
 
+    @staticmethod
+    def _get_keyset_page(where_conditions, params, per_page, row_format, cursor):
+        """Fetch one keyset page (one index seek, no COUNT)"""
+        after = Supplier.KEYSET.decode(cursor)
+        if after is not None:
+            where_conditions = where_conditions + [Supplier.KEYSET.seek_condition]
+            params = params + Supplier.KEYSET.seek_params(after)
+
+        query = QueryRegistry.compile('suppliers.keyset', where_conditions, lambda where_clause: f"""
+            SELECT * FROM suppliers
+            WHERE {where_clause}
+            ORDER BY {Supplier.KEYSET.order_by}
+            LIMIT %s
+        """)
+        result = Database.execute_query(query, tuple(params + [per_page + 1]), prepared=True, row_format=row_format)
+        suppliers, next_cursor = Supplier.KEYSET.page(result, per_page)
+
+        return {
+            'success': True,
+            'data': suppliers,
+            'pagination': {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None
+            }
+        }
+
     @staticmethod
     def get_by_id(supplier_id):
         """Get supplier by ID"""
         try:
             query = "SELECT * FROM suppliers WHERE supplier_id = %s"
-            supplier = Database.execute_query(query, (supplier_id,), fetch_one=True)
+            supplier = Database.execute_query(query, (supplier_id,), fetch_one=True, cache_tags=('suppliers',))
 
             if supplier:
                 return {'success': True, 'data': supplier}
@@ -128,6 +181,8 @@ class Supplier:
             rows_affected = Database.execute_update(query, params)
 
             if rows_affected > 0:
+                # Cached product lookups carry the supplier name
+                ProductLookup.clear()
                 return {'success': True, 'message': 'Supplier updated successfully'}
             else:
                 return {'success': False, 'error': 'Supplier not found'}
@@ -138,23 +193,24 @@ class Supplier:
     def delete(supplier_id):
         """Delete supplier"""
         try:
-            # Check if supplier has products
-            check_query = "SELECT COUNT(*) as count FROM products WHERE supplier_id = %s"
-            result = Database.execute_query(check_query, (supplier_id,), fetch_one=True)
-
-            if result['count'] > 0:
-                return {
-                    'success': False,
-                    'error': 'Cannot delete supplier with existing products'
-                }
-
-            query = "DELETE FROM suppliers WHERE supplier_id = %s"
-            rows_affected = Database.execute_update(query, (supplier_id,))
-
-            if rows_affected > 0:
-                return {'success': True, 'message': 'Supplier deleted successfully'}
-            else:
-                return {'success': False, 'error': 'Supplier not found'}
+            with Database.transaction():
+                # Check if supplier has products
+                check_query = "SELECT COUNT(*) as count FROM products WHERE supplier_id = %s"
+                result = Database.execute_query(check_query, (supplier_id,), fetch_one=True)
+
+                if result['count'] > 0:
+                    return {
+                        'success': False,
+                        'error': 'Cannot delete supplier with existing products'
+                    }
+
+                query = "DELETE FROM suppliers WHERE supplier_id = %s"
+                rows_affected = Database.execute_update(query, (supplier_id,))
+
+                if rows_affected > 0:
+                    return {'success': True, 'message': 'Supplier deleted successfully'}
+                else:
+                    return {'success': False, 'error': 'Supplier not found'}
         except Error as e:
             return {'success': False, 'error': str(e)}
 
@@ -4,19 +4,116 @@ Transaction Model
 Handles all transaction-related database operations
 """
 
-from app.models.database import Database
+from app.config import Config
+from app.models.database import (
+    Database, build_order_by, clamp_page_size, date_range_conditions, offset_pagination, split_page
+)
+from app.models.group_commit import GroupCommitQueue
+from app.models.keyset import KeysetPager
+from app.models.partitioning import TransactionArchive
+from app.models.product_cache import ProductLookup
+from app.models.query_registry import QueryRegistry
 from mysql.connector import Error
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
 
 class Transaction:
     """Transaction model for managing stock transactions"""
 
+    # Columns written by the streaming export, in output order
+    EXPORT_COLUMNS = [
+        'transaction_id', 'product_id', 'product_name', 'sku',
+        'transaction_type', 'quantity', 'transaction_date',
+        'reference_number', 'remarks', 'created_by', 'transaction_value'
+    ]
+
+    # Columns the list can be sorted by (client name -> SQL expression)
+    SORT_COLUMNS = {
+        'transaction_id': 't.transaction_id',
+        'product_id': 't.product_id',
+        'product_name': 'p.product_name',
+        'sku': 'p.sku',
+        'transaction_type': 't.transaction_type',
+        'quantity': 't.quantity',
+        'transaction_date': 't.transaction_date',
+        'reference_number': 't.reference_number',
+        'created_by': 't.created_by',
+        'transaction_value': '(t.quantity * p.unit_price)'
+    }
+
+    # Movement types accepted by record_batch
+    BATCH_TYPES = ('STOCK_IN', 'STOCK_OUT')
+
+    # transaction_type ENUM order (summaries are sorted by it)
+    TRANSACTION_TYPES = ('STOCK_IN', 'STOCK_OUT', 'ADJUSTMENT')
+
+    # Trend bucket of a DATE expression (weeks start on Monday)
+    TREND_INTERVALS = {
+        'day': "{day}",
+        'week': "DATE_SUB({day}, INTERVAL WEEKDAY({day}) DAY)",
+        'month': "DATE_SUB({day}, INTERVAL DAYOFMONTH({day}) - 1 DAY)"
+    }
+
+    # Keyset pagination order: newest first, transaction_id breaks ties
+    KEYSET = KeysetPager(
+        'transactions',
+        [('t.transaction_date', 'transaction_date'), ('t.transaction_id', 'transaction_id')],
+        descending=True
+    )
+
+    @staticmethod
+    def _build_filters(product_id=None, transaction_type=None, start_date=None, end_date=None):
+        """
+        Build WHERE conditions for the transaction list filters
+
+        Returns:
+            tuple: (conditions list, params list)
+        """
+        where_conditions = []
+        params = []
+
+        if product_id:
+            where_conditions.append("t.product_id = %s")
+            params.append(product_id)
+
+        if transaction_type:
+            where_conditions.append("t.transaction_type = %s")
+            params.append(transaction_type)
+
+        date_conditions, date_params = date_range_conditions('t.transaction_date', start_date, end_date)
+        where_conditions.extend(date_conditions)
+        params.extend(date_params)
+
+        return where_conditions, params
+
     @staticmethod
-    def get_all(page=1, per_page=10, product_id=None, transaction_type=None, start_date=None, end_date=None):
+    def _list_sql(where_clause, order_by, limit_clause=""):
+        """Build the transaction list query shared by pages and exports"""
+        return f"""
+            SELECT
+                t.transaction_id, t.product_id,
+                p.product_name, p.sku,
+                t.transaction_type, t.quantity,
+                t.transaction_date, t.reference_number,
+                t.remarks, t.created_by,
+                (t.quantity * p.unit_price) as transaction_value
+            FROM transactions t
+            INNER JOIN products p ON t.product_id = p.product_id
+            WHERE {where_clause}
+            ORDER BY {order_by}
+            {limit_clause}
+        """
+
+    @staticmethod
+    def get_all(page=1, per_page=10, product_id=None, transaction_type=None, start_date=None, end_date=None,
+                row_format='rows', cursor=None, include_total='exact', sort=None):
         """
         Get all transactions with filters
 
+        Passing a cursor (empty string for the first page) switches from
+        offset to keyset pagination: pages are sought by (transaction_date,
+        transaction_id) and carry a next_cursor instead of page counts.
+
         Args:
             page (int): Page number
             per_page (int): Items per page
@@ -24,83 +121,120 @@ class Transaction:
             transaction_type (str): Filter by type
             start_date (str): Start date filter
             end_date (str): End date filter
+            row_format (str): 'rows' (dict per row) or 'columns' (column list plus row lists)
+            cursor (str): Keyset cursor from the previous page
+            include_total (str): 'exact' (cached COUNT), 'estimated' (optimizer estimate) or 'none'
+            sort (list): (column, 'asc'/'desc') pairs over SORT_COLUMNS (offset mode)
 
         Returns:
             dict: Transactions and pagination info
         """
         try:
-            where_conditions = []
-            params = []
-
-            if product_id:
-                where_conditions.append("t.product_id = %s")
-                params.append(product_id)
-
-            if transaction_type:
-                where_conditions.append("t.transaction_type = %s")
-                params.append(transaction_type)
-
-            if start_date:
-                where_conditions.append("DATE(t.transaction_date) >= %s")
-                params.append(start_date)
-
-            if end_date:
-                where_conditions.append("DATE(t.transaction_date) <= %s")
-                params.append(end_date)
+            per_page = clamp_page_size(per_page)
+            where_conditions, params = Transaction._build_filters(
+                product_id, transaction_type, start_date, end_date
+            )
 
-            where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+            if cursor is not None:
+                return Transaction._get_keyset_page(where_conditions, params, per_page, row_format, cursor)
 
-            # Count total
-            count_query = f"SELECT COUNT(*) as total FROM transactions t WHERE {where_clause}"
-            total_result = Database.execute_query(count_query, tuple(params), fetch_one=True)
-            total = total_result['total'] if total_result else 0
+            # Count total (cached, estimated or skipped)
+            count_query = QueryRegistry.compile(
+                'transactions.count', where_conditions,
+                lambda where_clause: f"SELECT COUNT(*) as total FROM transactions t WHERE {where_clause}"
+            )
+            total = Database.count_total(count_query, tuple(params), include_total, ('transactions',))
 
             # Get paginated data
             offset = (page - 1) * per_page
-            query = f"""
-                SELECT
-                    t.transaction_id, t.product_id,
-                    p.product_name, p.sku,
-                    t.transaction_type, t.quantity,
-                    t.transaction_date, t.reference_number,
-                    t.remarks, t.created_by,
-                    (t.quantity * p.unit_price) as transaction_value
-                FROM transactions t
-                INNER JOIN products p ON t.product_id = p.product_id
-                WHERE {where_clause}
-                ORDER BY t.transaction_date DESC
-                LIMIT %s OFFSET %s
-            """
-            params.extend([per_page, offset])
-            transactions = Database.execute_query(query, tuple(params))
+            order_by = (build_order_by(sort, Transaction.SORT_COLUMNS, 't.transaction_id') if sort
+                        else "t.transaction_date DESC")
+            query = QueryRegistry.compile(
+                f'transactions.page:{order_by}', where_conditions,
+                lambda where_clause: Transaction._list_sql(where_clause, order_by, "LIMIT %s OFFSET %s")
+            )
+            params.extend([per_page + 1, offset])
+            result = Database.execute_query(query, tuple(params), prepared=True, row_format=row_format)
+
+            transactions, has_more = split_page(result, per_page)
 
             return {
                 'success': True,
                 'data': transactions,
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': total,
-                    'pages': (total + per_page - 1) // per_page
-                }
+                'pagination': offset_pagination(page, per_page, total, include_total, has_more)
             }
-        except Error as e:
+        except (Error, ValueError) as e:
             return {'success': False, 'error': str(e)}
 
     @staticmethod
-    def get_by_product(product_id, start_date=None, end_date=None):
-        """Get transaction history for a product"""
-        try:
-            where_conditions = ["t.product_id = %s"]
-            params = [product_id]
+    def _get_keyset_page(where_conditions, params, per_page, row_format, cursor):
+        """Fetch one keyset page (one index seek, no COUNT)"""
+        after = Transaction.KEYSET.decode(cursor)
+        if after is not None:
+            where_conditions = where_conditions + [Transaction.KEYSET.seek_condition]
+            params = params + Transaction.KEYSET.seek_params(after)
+
+        query = QueryRegistry.compile(
+            'transactions.keyset', where_conditions,
+            lambda where_clause: Transaction._list_sql(where_clause, Transaction.KEYSET.order_by, "LIMIT %s")
+        )
+        result = Database.execute_query(query, tuple(params + [per_page + 1]), prepared=True, row_format=row_format)
+        transactions, next_cursor = Transaction.KEYSET.page(result, per_page)
+
+        return {
+            'success': True,
+            'data': transactions,
+            'pagination': {
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'has_more': next_cursor is not None
+            }
+        }
+
+    @staticmethod
+    def iter_export(product_id=None, transaction_type=None, start_date=None, end_date=None):
+        """
+        Stream every transaction matching the list filters
+
+        Args:
+            product_id (int): Filter by product
+            transaction_type (str): Filter by type
+            start_date (str): Start date filter
+            end_date (str): End date filter
 
-            if start_date:
-                where_conditions.append("DATE(t.transaction_date) >= %s")
-                params.append(start_date)
+        Returns:
+            generator: Transaction rows, newest first, read in chunks
+
+        Raises:
+            ValueError: If a filter date is invalid (before any row is read)
+        """
+        where_conditions, params = Transaction._build_filters(
+            product_id, transaction_type, start_date, end_date
+        )
+        where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
 
-            if end_date:
-                where_conditions.append("DATE(t.transaction_date) <= %s")
-                params.append(end_date)
+        query = Transaction._list_sql(where_clause, "t.transaction_date DESC")
+        return Database.iter_query(query, tuple(params))
+
+    @staticmethod
+    def get_by_product(product_id, start_date=None, end_date=None, include_archived=False):
+        """
+        Get transaction history for a product
+
+        Args:
+            product_id (int): Product ID
+            start_date (str): Start date filter
+            end_date (str): End date filter
+            include_archived (bool): Also read archived months (see TransactionArchive),
+                appended after the live rows and marked 'archived'
+
+        Returns:
+            dict: Transactions, newest first
+        """
+        try:
+            date_conditions, date_params = date_range_conditions('t.transaction_date', start_date, end_date)
+            where_conditions = ["t.product_id = %s"] + date_conditions
+            params = [product_id] + date_params
 
             where_clause = " AND ".join(where_conditions)
 
@@ -116,10 +250,28 @@ class Transaction:
                 ORDER BY t.transaction_date DESC
             """
             transactions = Database.execute_query(query, tuple(params))
+            if include_archived:
+                transactions.extend(Transaction._archived_history(product_id, start_date, end_date))
             return {'success': True, 'data': transactions}
-        except Error as e:
+        except (Error, OSError, ValueError) as e:
             return {'success': False, 'error': str(e)}
 
+    @staticmethod
+    def _archived_history(product_id, start_date, end_date):
+        """Archived rows of a product in the history row shape"""
+        product = ProductLookup.get_by_id(product_id) or {}
+        rows = sorted(
+            TransactionArchive.iter_rows(start_date, end_date, product_id=product_id),
+            key=lambda row: (row['transaction_date'], row['transaction_id']),
+            reverse=True
+        )
+        for row in rows:
+            del row['product_id']
+            row['product_name'] = product.get('product_name')
+            row['sku'] = product.get('sku')
+            row['archived'] = True
+        return rows
+
     @staticmethod
     def record_stock_in(product_id, quantity, reference_number, remarks, created_by):
         """
@@ -135,12 +287,16 @@ class Transaction:
         Returns:
             dict: Success status with transaction ID
         """
+        if Config.GROUP_COMMIT_ENABLED:
+            return Transaction._record_grouped(product_id, 'STOCK_IN', quantity, reference_number, remarks, created_by)
+
         try:
             # Call stored procedure
             results = Database.call_procedure(
                 'sp_record_stock_in',
                 (product_id, quantity, reference_number, remarks, created_by)
             )
+            ProductLookup.invalidate(product_id)
 
             if results and 'success_message' in results[0]:
                 return {
@@ -171,12 +327,16 @@ class Transaction:
         Returns:
             dict: Success status with transaction ID
         """
+        if Config.GROUP_COMMIT_ENABLED:
+            return Transaction._record_grouped(product_id, 'STOCK_OUT', quantity, reference_number, remarks, created_by)
+
         try:
             # Call stored procedure
             results = Database.call_procedure(
                 'sp_record_stock_out',
                 (product_id, quantity, reference_number, remarks, created_by)
             )
+            ProductLookup.invalidate(product_id)
 
             if results and 'success_message' in results[0]:
                 return {
@@ -193,6 +353,43 @@ class Transaction:
                 return {'success': False, 'error': error_msg.split('Error:')[1].strip()}
             return {'success': False, 'error': error_msg}
 
+    @staticmethod
+    def _record_grouped(product_id, transaction_type, quantity, reference_number, remarks, created_by):
+        """
+        Record one stock movement through the group-commit queue
+
+        Blocks until the group containing the movement has committed. The
+        response has the same shape as the stored procedure path.
+        """
+        try:
+            if int(quantity) <= 0:
+                return {'success': False, 'error': 'Quantity must be greater than 0.'}
+            movement = (int(product_id), transaction_type, int(quantity), reference_number, remarks, created_by)
+        except (TypeError, ValueError):
+            return {'success': False, 'error': 'product_id and quantity must be numbers'}
+
+        try:
+            result = STOCK_MOVEMENT_QUEUE.submit(movement).result()
+        except Error as e:
+            return {'success': False, 'error': str(e)}
+        # The write committed on the queue's thread; keep this caller's reads on the primary
+        Database.mark_write()
+
+        if 'error' in result:
+            return {'success': False, 'error': result['error']}
+        if transaction_type == 'STOCK_IN':
+            return {
+                'success': True,
+                'message': f'Success: {quantity} units added to product ID {product_id}',
+                'transaction_id': result['transaction_id']
+            }
+        return {
+            'success': True,
+            'message': f'Success: {quantity} units removed from product ID {product_id}',
+            'transaction_id': result['transaction_id'],
+            'remaining_stock': result['stock_after']
+        }
+
     @staticmethod
     def adjust_stock(product_id, new_quantity, remarks, created_by):
         """
@@ -213,6 +410,7 @@ class Transaction:
                 'sp_adjust_stock',
                 (product_id, new_quantity, remarks, created_by)
             )
+            ProductLookup.invalidate(product_id)
 
             if results and 'success_message' in results[0]:
                 return {
@@ -228,6 +426,171 @@ class Transaction:
                 return {'success': False, 'error': error_msg.split('Error:')[1].strip()}
             return {'success': False, 'error': error_msg}
 
+    @staticmethod
+    def record_batch(lines, created_by, reference_number='', remarks=''):
+        """
+        Record many stock movements (a receipt or an order) all-or-nothing
+
+        Every product is validated and locked with one SELECT ... FOR UPDATE,
+        stock levels are checked line by line in memory, then inventory is
+        updated with one CASE UPDATE (plus one multi-row INSERT for products
+        without an inventory row) and the transactions rows are written with
+        one multi-row INSERT, all in a single database transaction. If any
+        line fails validation nothing is written.
+
+        Args:
+            lines (list): Dicts with product_id, quantity, transaction_type
+                ('STOCK_IN' or 'STOCK_OUT') and optional reference_number and remarks
+            created_by (str): Username
+            reference_number (str): Default reference number of the lines
+            remarks (str): Default remarks of the lines
+
+        Returns:
+            dict: Success status with one result per line (stock before and
+                after, or the line's error)
+        """
+        try:
+            if not lines:
+                return {'success': False, 'error': 'No lines to record'}
+            if len(lines) > Config.MAX_BATCH_LINES:
+                return {'success': False, 'error': f'At most {Config.MAX_BATCH_LINES} lines per batch'}
+
+            movements, results = Transaction._parse_lines(lines, created_by, reference_number, remarks)
+            if any('error' in result for result in results):
+                return {'success': False, 'error': 'Invalid lines, nothing recorded', 'lines': results}
+
+            with Database.transaction():
+                results = Transaction._apply_movements(movements)
+                if any('error' in result for result in results):
+                    return {'success': False, 'error': 'Insufficient stock or unknown product, nothing recorded',
+                            'lines': results}
+
+            return {
+                'success': True,
+                'message': f'{len(movements)} stock movements recorded',
+                'lines': results
+            }
+        except Error as e:
+            return {'success': False, 'error': str(e)}
+
+    @staticmethod
+    def _parse_lines(lines, created_by, reference_number, remarks):
+        """Validate batch lines without touching the database"""
+        movements = []
+        results = []
+        for index, line in enumerate(lines):
+            result = {'line': index}
+            try:
+                product_id = int(line['product_id'])
+                quantity = int(line['quantity'])
+                transaction_type = str(line['transaction_type']).upper()
+            except (KeyError, TypeError, ValueError):
+                result['error'] = 'product_id, quantity and transaction_type are required'
+            else:
+                result.update(product_id=product_id, transaction_type=transaction_type, quantity=quantity)
+                if transaction_type not in Transaction.BATCH_TYPES:
+                    result['error'] = f"transaction_type must be one of {', '.join(Transaction.BATCH_TYPES)}"
+                elif quantity <= 0:
+                    result['error'] = 'Quantity must be greater than 0'
+                else:
+                    movements.append((
+                        product_id, transaction_type, quantity,
+                        line.get('reference_number', reference_number), line.get('remarks', remarks), created_by
+                    ))
+            results.append(result)
+        return movements, results
+
+    @staticmethod
+    def _apply_movements(movements, atomic=True, transaction_ids=False):
+        """
+        Lock, check and write validated movements (inside a transaction)
+
+        Args:
+            movements (list): (product_id, transaction_type, quantity,
+                reference_number, remarks, created_by) tuples
+            atomic (bool): Write nothing when any movement fails; otherwise
+                only the failing movements are skipped
+            transaction_ids (bool): Insert the transactions rows one by one
+                to report each movement's transaction_id
+
+        Returns:
+            list: Per-movement results (stock before and after, or an error)
+        """
+        product_ids = sorted({movement[0] for movement in movements})
+        placeholders = ", ".join(["%s"] * len(product_ids))
+
+        # Lock every product's inventory row, in primary key order so that
+        # concurrent batches cannot deadlock on each other
+        with Database.get_cursor() as cursor:
+            cursor.execute(f"""
+                SELECT p.product_id, i.quantity_in_stock
+                FROM products p
+                LEFT JOIN inventory i ON p.product_id = i.product_id
+                WHERE p.product_id IN ({placeholders})
+                ORDER BY p.product_id
+                FOR UPDATE
+            """, tuple(product_ids))
+            stock = {row['product_id']: row['quantity_in_stock'] for row in cursor.fetchall()}
+        has_inventory = {product_id for product_id, quantity in stock.items() if quantity is not None}
+
+        results = []
+        applied = []
+        for index, movement in enumerate(movements):
+            product_id, transaction_type, quantity = movement[:3]
+            result = {'line': index, 'product_id': product_id, 'transaction_type': transaction_type, 'quantity': quantity}
+            if product_id not in stock:
+                result['error'] = f'Product ID {product_id} does not exist'
+            else:
+                before = stock[product_id] or 0
+                after = before + quantity if transaction_type == 'STOCK_IN' else before - quantity
+                if after < 0:
+                    result['error'] = f'Insufficient stock. Available: {before}, Requested: {quantity}'
+                else:
+                    stock[product_id] = after
+                    result.update(stock_before=before, stock_after=after)
+                    applied.append((movement, result))
+            results.append(result)
+        if not applied or (atomic and len(applied) < len(movements)):
+            return results
+
+        # Each touched inventory row is written once, with its final quantity
+        touched = sorted({movement[0] for movement, _ in applied})
+        existing = [product_id for product_id in touched if product_id in has_inventory]
+        if existing:
+            cases = " ".join(["WHEN %s THEN %s"] * len(existing))
+            params = [value for product_id in existing for value in (product_id, stock[product_id])]
+            Database.execute_update(f"""
+                UPDATE inventory
+                SET quantity_in_stock = CASE product_id {cases} END,
+                    last_updated = NOW()
+                WHERE product_id IN ({", ".join(["%s"] * len(existing))})
+            """, tuple(params + existing))
+
+        missing = [product_id for product_id in touched if product_id not in has_inventory]
+        if missing:
+            Database.execute_update(
+                "INSERT INTO inventory (product_id, quantity_in_stock, last_updated) VALUES "
+                + ", ".join(["(%s, %s, NOW())"] * len(missing)),
+                tuple(value for product_id in missing for value in (product_id, stock[product_id]))
+            )
+
+        insert = "INSERT INTO transactions (product_id, transaction_type, quantity, reference_number, remarks, created_by) VALUES "
+        if transaction_ids:
+            with Database.get_cursor() as cursor:
+                for movement, result in applied:
+                    cursor.execute(insert + "(%s, %s, %s, %s, %s, %s)", movement)
+                    result['transaction_id'] = cursor.lastrowid
+            Database.invalidate_tables(('transactions',))
+        else:
+            Database.execute_update(
+                insert + ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(applied)),
+                tuple(value for movement, _ in applied for value in movement)
+            )
+
+        for product_id in touched:
+            ProductLookup.invalidate(product_id)
+        return results
+
     @staticmethod
     def get_summary(start_date=None, end_date=None):
         """
@@ -241,36 +604,152 @@ class Transaction:
             dict: Transaction summary by type
         """
         try:
-            where_conditions = []
-            params = []
-
-            if start_date:
-                where_conditions.append("DATE(t.transaction_date) >= %s")
-                params.append(start_date)
+            summary = Transaction._movement_totals(start_date, end_date)
+            for row in summary:
+                del row['period']
+            return {'success': True, 'data': summary}
+        except (Error, ValueError) as e:
+            return {'success': False, 'error': str(e)}
 
-            if end_date:
-                where_conditions.append("DATE(t.transaction_date) <= %s")
-                params.append(end_date)
+    @staticmethod
+    def get_trend(start_date=None, end_date=None, interval='day', product_id=None, transaction_type=None):
+        """
+        Get movement totals per period and type
 
-            where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+        Args:
+            start_date (str): Start date (defaults to 30 days before the end date)
+            end_date (str): End date (defaults to today)
+            interval (str): 'day', 'week' or 'month'
+            product_id (int): Filter by product
+            transaction_type (str): Filter by type
 
-            query = f"""
-                SELECT
-                    t.transaction_type,
-                    COUNT(*) as transaction_count,
-                    SUM(t.quantity) as total_quantity,
-                    SUM(t.quantity * p.unit_price) as total_value
-                FROM transactions t
-                INNER JOIN products p ON t.product_id = p.product_id
-                WHERE {where_clause}
-                GROUP BY t.transaction_type
-                ORDER BY t.transaction_type
-            """
-            summary = Database.execute_query(query, tuple(params))
-            return {'success': True, 'data': summary}
-        except Error as e:
+        Returns:
+            dict: One row per period and type (period is the first day of the period)
+        """
+        try:
+            if interval not in Transaction.TREND_INTERVALS:
+                raise ValueError(f"interval must be one of: {', '.join(Transaction.TREND_INTERVALS)}")
+            end_date = end_date or date.today().isoformat()
+            if not start_date:
+                start_date = (Transaction._parse_day(end_date) - timedelta(days=30)).isoformat()
+
+            trend = Transaction._movement_totals(start_date, end_date, interval, product_id, transaction_type)
+            return {'success': True, 'data': trend, 'interval': interval}
+        except (Error, ValueError) as e:
             return {'success': False, 'error': str(e)}
 
+    @staticmethod
+    def _movement_totals(start_date, end_date, interval=None, product_id=None, transaction_type=None):
+        """
+        Count, quantity and value of movements per (period and) type
+
+        With TRANSACTION_AGG_ENABLED, days before today are read from
+        transaction_daily_agg and only today's movements are grouped from
+        raw transactions. Today is the database's CURDATE(), read in the same
+        transaction as both parts, since the triggers bucket rows by DATE()
+        in the session time zone. Either way quantities are priced at the
+        current unit_price.
+
+        Returns:
+            list: Rows with period (None without interval), transaction_type,
+                transaction_count, total_quantity, total_value
+        """
+        start = Transaction._parse_day(start_date)
+        end = Transaction._parse_day(end_date)
+        filters = ([("product_id = %s", product_id)] if product_id else []) + \
+                  ([("transaction_type = %s", transaction_type)] if transaction_type else [])
+
+        parts = []
+        if Config.TRANSACTION_AGG_ENABLED:
+            with Database.transaction():
+                today = Database.execute_query("SELECT CURDATE() as today", fetch_one=True)['today']
+                yesterday = today - timedelta(days=1)
+                if start is None or start <= yesterday:
+                    parts.append(Transaction._agg_totals(start, min(end or yesterday, yesterday), interval, filters))
+                if end is None or end >= today:
+                    parts.append(Transaction._raw_totals(max(start or today, today), end, interval, filters))
+        else:
+            parts.append(Transaction._raw_totals(start, end, interval, filters))
+
+        totals = {}
+        for rows in parts:
+            for row in rows:
+                key = (row['period'], row['transaction_type'])
+                if key in totals:
+                    for column in ('transaction_count', 'total_quantity', 'total_value'):
+                        totals[key][column] += row[column]
+                else:
+                    totals[key] = row
+        rows = [row for row in totals.values() if row['transaction_count'] > 0]
+        for row in rows:
+            row['transaction_count'] = int(row['transaction_count'])
+        rows.sort(key=lambda row: (row['period'] or date.min, Transaction.TRANSACTION_TYPES.index(row['transaction_type'])))
+        return rows
+
+    @staticmethod
+    def _agg_totals(start, end, interval, filters):
+        """Totals of whole days from transaction_daily_agg"""
+        period = Transaction.TREND_INTERVALS[interval].format(day='a.agg_date') if interval else 'NULL'
+        where_conditions = ["a.agg_date <= %s"]
+        params = [end]
+        if start:
+            where_conditions.append("a.agg_date >= %s")
+            params.append(start)
+        for condition, value in filters:
+            where_conditions.append(f"a.{condition}")
+            params.append(value)
+
+        query = f"""
+            SELECT
+                {period} as period,
+                a.transaction_type,
+                SUM(a.transaction_count) as transaction_count,
+                SUM(a.total_quantity) as total_quantity,
+                SUM(a.total_quantity * p.unit_price) as total_value
+            FROM transaction_daily_agg a
+            INNER JOIN products p ON a.product_id = p.product_id
+            WHERE {" AND ".join(where_conditions)}
+            GROUP BY period, a.transaction_type
+        """
+        return Database.execute_query(query, tuple(params))
+
+    @staticmethod
+    def _raw_totals(start, end, interval, filters):
+        """Totals grouped from raw transactions"""
+        period = (Transaction.TREND_INTERVALS[interval].format(day='DATE(t.transaction_date)')
+                  if interval else 'NULL')
+        where_conditions, params = date_range_conditions(
+            't.transaction_date', start.isoformat() if start else None, end.isoformat() if end else None
+        )
+        for condition, value in filters:
+            where_conditions.append(f"t.{condition}")
+            params.append(value)
+        where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+
+        query = f"""
+            SELECT
+                {period} as period,
+                t.transaction_type,
+                COUNT(*) as transaction_count,
+                SUM(t.quantity) as total_quantity,
+                SUM(t.quantity * p.unit_price) as total_value
+            FROM transactions t
+            INNER JOIN products p ON t.product_id = p.product_id
+            WHERE {where_clause}
+            GROUP BY period, t.transaction_type
+        """
+        return Database.execute_query(query, tuple(params))
+
+    @staticmethod
+    def _parse_day(value):
+        """Parse a YYYY-MM-DD date filter (None stays None)"""
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValueError("Dates must be in YYYY-MM-DD format")
+
     @staticmethod
     def get_recent_transactions(limit=10):
         """Get recent transactions"""
@@ -290,3 +769,13 @@ class Transaction:
             return {'success': True, 'data': transactions}
         except Error as e:
             return {'success': False, 'error': str(e)}
+
+
+# Stock-in/stock-out movements committed in groups when GROUP_COMMIT_ENABLED is set;
+# each group skips only its own failing movements
+STOCK_MOVEMENT_QUEUE = GroupCommitQueue(
+    lambda movements: Transaction._apply_movements(movements, atomic=False, transaction_ids=True),
+    window_ms=Config.GROUP_COMMIT_WINDOW_MS,
+    max_batch=Config.GROUP_COMMIT_MAX_BATCH,
+    name='stock-group-commit'
+)
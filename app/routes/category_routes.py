@@ -6,6 +6,7 @@ API endpoints for category management
 
 from flask import Blueprint, request, jsonify
 from app.models.category import Category
+from app.routes.imports import import_request
 
 category_bp = Blueprint('categories', __name__)
 
@@ -20,6 +21,19 @@ def get_categories():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@category_bp.route('/import', methods=['POST'])
+def import_categories():
+    """
+    POST /api/categories/import
+    Bulk import categories from a CSV or NDJSON body (or a 'file' upload)
+    Query params: format (csv, ndjson), chunk_size
+    """
+    try:
+        return import_request('categories')
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @category_bp.route('/<int:category_id>', methods=['GET'])
 def get_category(category_id):
     """GET /api/categories/<id> - Get single category"""
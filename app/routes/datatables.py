@@ -0,0 +1,91 @@
+"""
+DataTables Helpers
+==================
+Server-side processing protocol of the DataTables jQuery plugin
+"""
+
+from app.config import Config
+from app.models.database import Database
+
+
+def is_datatables_request(args):
+    """
+    Check whether a list request comes from a server-side DataTable
+
+    Args:
+        args (MultiDict): Request query arguments
+
+    Returns:
+        bool: True when the DataTables 'draw' counter is present
+    """
+    return 'draw' in args
+
+
+def parse_datatables_args(args):
+    """
+    Translate DataTables request parameters into list arguments
+
+    ``length`` is capped at MAX_PAGE_SIZE (``-1``, "show all", gets the cap)
+    and ``start`` is mapped to the page containing it. Sort keys are the
+    ``data`` names of the ordered columns; models reject columns outside
+    their whitelist.
+
+    Args:
+        args (MultiDict): Request query arguments
+
+    Returns:
+        dict: draw, page, per_page, search and sort
+    """
+    length = args.get('length', Config.ITEMS_PER_PAGE, type=int)
+    if length <= 0:
+        length = Config.MAX_PAGE_SIZE
+    per_page = min(length, Config.MAX_PAGE_SIZE)
+    start = max(args.get('start', 0, type=int), 0)
+
+    sort = []
+    index = 0
+    while f'order[{index}][column]' in args:
+        column_index = args.get(f'order[{index}][column]', type=int)
+        column = args.get(f'columns[{column_index}][data]')
+        orderable = args.get(f'columns[{column_index}][orderable]', 'true') == 'true'
+        if column and orderable:
+            sort.append((column, args.get(f'order[{index}][dir]', 'asc')))
+        index += 1
+
+    return {
+        'draw': args.get('draw', 0, type=int),
+        'page': start // per_page + 1,
+        'per_page': per_page,
+        'search': args.get('search[value]') or None,
+        'sort': sort
+    }
+
+
+def datatables_response(draw, result, table, filtered):
+    """
+    Build the DataTables server-side response for a model list result
+
+    Args:
+        draw (int): Draw counter echoed back to the client
+        result (dict): Model get_all() result with an exact total
+        table (str): Table whose unfiltered row count is recordsTotal
+        filtered (bool): Whether any filter was applied to result
+
+    Returns:
+        dict: draw, recordsTotal, recordsFiltered and data (or error)
+    """
+    if not result['success']:
+        return {'draw': draw, 'error': result['error']}
+
+    records_filtered = result['pagination']['total']
+    records_total = records_filtered
+    if filtered:
+        # Cached until the table is written to
+        records_total = Database.count_total(f"SELECT COUNT(*) as total FROM {table}", (), 'exact', (table,))
+
+    return {
+        'draw': draw,
+        'recordsTotal': records_total,
+        'recordsFiltered': records_filtered,
+        'data': result['data']
+    }
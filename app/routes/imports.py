@@ -0,0 +1,45 @@
+"""
+Import Helpers
+==============
+Shared handler of the bulk import endpoints
+"""
+
+import io
+
+from flask import request, jsonify
+from app.models.bulk_import import IMPORT_FORMATS, BulkImporter, read_rows
+
+# Content types accepted in place of the format query parameter
+CONTENT_TYPE_FORMATS = {
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson'
+}
+
+
+def import_request(entity):
+    """
+    Import the CSV / NDJSON body (or 'file' upload) of the current request
+
+    The body is parsed while it is read, so the file is never held in memory
+    as a whole. Query params: format (csv, ndjson), chunk_size.
+
+    Args:
+        entity (str): 'categories', 'suppliers' or 'products'
+
+    Returns:
+        tuple: JSON response and status code
+    """
+    upload = request.files.get('file')
+    content_type = (upload.mimetype if upload else request.mimetype) or ''
+    file_format = request.args.get('format') or CONTENT_TYPE_FORMATS.get(content_type)
+    if file_format not in IMPORT_FORMATS:
+        return jsonify({'success': False, 'error': f"format must be one of {', '.join(IMPORT_FORMATS)}"}), 400
+
+    stream = io.TextIOWrapper(upload.stream if upload else request.stream, encoding='utf-8-sig', newline='')
+    importer = BulkImporter(entity, chunk_size=request.args.get('chunk_size', type=int))
+    report = importer.run(read_rows(stream, file_format))
+
+    # Partial imports succeed (committed chunks stay); the report lists the rejected rows
+    status = 200 if report['imported'] or not report['failed'] else 400
+    return jsonify({'success': report['failed'] == 0, 'data': report}), status
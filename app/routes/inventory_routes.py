@@ -5,25 +5,61 @@ API endpoints for inventory management
 """
 
 from flask import Blueprint, request, jsonify
+from app.models.database import ROW_FORMATS
 from app.models.inventory import Inventory
+from app.routes.datatables import datatables_response, is_datatables_request, parse_datatables_args
+from app.routes.streaming import EXPORT_FORMATS, stream_rows
 
 inventory_bp = Blueprint('inventory', __name__)
 
 
 @inventory_bp.route('', methods=['GET'])
 def get_inventory():
-    """GET /api/inventory - Get all inventory with pagination"""
+    """
+    GET /api/inventory - Get all inventory with pagination, format: rows or columns
+    DataTables server-side requests (draw, start, length, order, search) get the DataTables response shape.
+    """
     try:
+        if is_datatables_request(request.args):
+            table = parse_datatables_args(request.args)
+            result = Inventory.get_all(table['page'], table['per_page'], table['search'], sort=table['sort'])
+            response = datatables_response(table['draw'], result, 'inventory', bool(table['search']))
+            return jsonify(response), 200 if result['success'] else 400
+
+        row_format = request.args.get('format', 'rows')
+        if row_format not in ROW_FORMATS:
+            return jsonify({'success': False, 'error': f'Unsupported format: {row_format}'}), 400
+
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 10))
         search = request.args.get('search')
 
-        result = Inventory.get_all(page, per_page, search)
+        result = Inventory.get_all(
+            page, per_page, search, row_format,
+            cursor=request.args.get('cursor'), include_total=request.args.get('include_total', 'exact')
+        )
         return jsonify(result), 200 if result['success'] else 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@inventory_bp.route('/export', methods=['GET'])
+def export_inventory():
+    """
+    GET /api/inventory/export - Stream all matching inventory records
+    Query params: format (csv, ndjson), search
+    """
+    try:
+        export_format = request.args.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'success': False, 'error': f'Unsupported format: {export_format}'}), 400
+
+        rows = Inventory.iter_export(request.args.get('search'))
+        return stream_rows(rows, Inventory.EXPORT_COLUMNS, export_format, 'inventory')
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @inventory_bp.route('/<int:product_id>', methods=['GET'])
 def get_inventory_by_product(product_id):
     """GET /api/inventory/<product_id> - Get inventory for product"""
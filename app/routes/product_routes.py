@@ -5,7 +5,12 @@ API endpoints for product management
 """
 
 from flask import Blueprint, request, jsonify
+from app.models.database import ROW_FORMATS
+from app.config import Config
 from app.models.product import Product
+from app.models.suggest import ProductSuggest
+from app.routes.datatables import datatables_response, is_datatables_request, parse_datatables_args
+from app.routes.imports import import_request
 
 product_bp = Blueprint('products', __name__)
 
@@ -15,21 +20,93 @@ def get_products():
     """
     GET /api/products
     Get all products with pagination, search, and filters
-    Query params: page, per_page, search, category_id, supplier_id
+    Query params: page, per_page, search, category_id, supplier_id, format (rows, columns),
+                  cursor (keyset pagination, empty for the first page), include_total (exact, estimated, none),
+                  facets (true: add category, supplier and stock status counts)
+    DataTables server-side requests (draw, start, length, order, search) get the DataTables response shape.
     """
     try:
+        if is_datatables_request(request.args):
+            return get_products_datatable()
+
+        row_format = request.args.get('format', 'rows')
+        if row_format not in ROW_FORMATS:
+            return jsonify({'success': False, 'error': f'Unsupported format: {row_format}'}), 400
+
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 10))
         search = request.args.get('search')
         category_id = request.args.get('category_id', type=int)
         supplier_id = request.args.get('supplier_id', type=int)
+        facets = request.args.get('facets', 'false').lower() == 'true'
 
-        result = Product.get_all(page, per_page, search, category_id, supplier_id)
+        result = Product.get_all(
+            page, per_page, search, category_id, supplier_id, row_format,
+            cursor=request.args.get('cursor'), include_total=request.args.get('include_total', 'exact'),
+            facets=facets
+        )
         return jsonify(result), 200 if result['success'] else 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def get_products_datatable():
+    """Serve one page of the products DataTable (server-side processing)"""
+    table = parse_datatables_args(request.args)
+    category_id = request.args.get('category_id', type=int)
+    supplier_id = request.args.get('supplier_id', type=int)
+
+    result = Product.get_all(
+        table['page'], table['per_page'], table['search'], category_id, supplier_id, sort=table['sort']
+    )
+    filtered = bool(table['search'] or category_id or supplier_id)
+    response = datatables_response(table['draw'], result, 'products', filtered)
+    return jsonify(response), 200 if result['success'] else 400
+
+
+@product_bp.route('/suggest', methods=['GET'])
+def suggest_products():
+    """
+    GET /api/products/suggest
+    Typeahead suggestions by name word or SKU prefix, served from memory
+    Query params: q, limit
+    """
+    try:
+        query = request.args.get('q', '')
+        limit = min(request.args.get('limit', Config.SUGGEST_LIMIT, type=int), Config.MAX_PAGE_SIZE)
+        if limit <= 0:
+            return jsonify({'success': False, 'error': 'limit must be positive'}), 400
+        return jsonify({'success': True, 'data': ProductSuggest.suggest(query, limit)}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@product_bp.route('/sku/<path:sku>', methods=['GET'])
+def get_product_by_sku(sku):
+    """
+    GET /api/products/sku/<sku>
+    Get single product by SKU (barcode scanners)
+    """
+    try:
+        result = Product.get_by_sku(sku)
+        return jsonify(result), 200 if result['success'] else 404
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@product_bp.route('/import', methods=['POST'])
+def import_products():
+    """
+    POST /api/products/import
+    Bulk import products from a CSV or NDJSON body (or a 'file' upload)
+    Query params: format (csv, ndjson), chunk_size
+    """
+    try:
+        return import_request('products')
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @product_bp.route('/<int:product_id>', methods=['GET'])
 def get_product(product_id):
     """
@@ -6,6 +6,7 @@ API endpoints for reports and analytics
 
 from flask import Blueprint, request, jsonify
 from app.models.inventory import Inventory
+from app.models.parallel import ParallelQuery
 from app.models.product import Product
 from app.models.transaction import Transaction
 
@@ -46,6 +47,22 @@ def transaction_summary():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@report_bp.route('/transaction-trend', methods=['GET'])
+def transaction_trend():
+    """GET /api/reports/transaction-trend - Movements per day, week or month"""
+    try:
+        start_date = request.args.get('start_date')
+        end_date = request.args.get('end_date')
+        interval = request.args.get('interval', 'day')
+        product_id = request.args.get('product_id', type=int)
+        transaction_type = request.args.get('transaction_type')
+
+        result = Transaction.get_trend(start_date, end_date, interval, product_id, transaction_type)
+        return jsonify(result), 200 if result['success'] else 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @report_bp.route('/category-wise', methods=['GET'])
 def category_wise():
     """GET /api/reports/category-wise - Products grouped by category"""
@@ -68,27 +85,36 @@ def supplier_wise():
 
 @report_bp.route('/dashboard-stats', methods=['GET'])
 def dashboard_stats():
-    """GET /api/reports/dashboard-stats - Dashboard statistics"""
-    try:
-        # Get stock summary
-        stock_summary = Inventory.get_stock_summary()
-
-        # Get low stock products count
-        low_stock = Product.get_low_stock()
+    """
+    GET /api/reports/dashboard-stats - Dashboard statistics
 
-        # Get recent transactions
-        recent_transactions = Transaction.get_recent_transactions(5)
+    Query params:
+        extended (bool): Also include category-wise stock
+        consistent (bool): Read everything from one consistent snapshot
+    """
+    try:
+        extended = request.args.get('extended', 'false').lower() == 'true'
+        consistent = request.args.get('consistent', 'false').lower() == 'true'
+
+        # Independent queries run concurrently on pooled connections
+        batch = (ParallelQuery()
+                 .add('stock_summary', Inventory.get_stock_summary)
+                 .add('low_stock', Product.get_low_stock)
+                 .add('recent_transactions', Transaction.get_recent_transactions, 5))
+        if extended:
+            batch.add('category_wise', Inventory.get_by_category)
+        results = batch.run(snapshot=consistent)
 
         # Combine all stats
-        if stock_summary['success'] and low_stock['success'] and recent_transactions['success']:
-            return jsonify({
-                'success': True,
-                'data': {
-                    'stock_summary': stock_summary['data'],
-                    'low_stock_count': len(low_stock['data']),
-                    'recent_transactions': recent_transactions['data']
-                }
-            }), 200
+        if all(result['success'] for result in results.values()):
+            data = {
+                'stock_summary': results['stock_summary']['data'],
+                'low_stock_count': len(results['low_stock']['data']),
+                'recent_transactions': results['recent_transactions']['data']
+            }
+            if extended:
+                data['category_wise'] = results['category_wise']['data']
+            return jsonify({'success': True, 'data': data}), 200
         else:
             return jsonify({'success': False, 'error': 'Failed to fetch dashboard stats'}), 400
     except Exception as e:
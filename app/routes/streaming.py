@@ -0,0 +1,90 @@
+"""
+Streaming Responses
+===================
+Helpers for streaming large result sets as CSV or NDJSON
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask import Response, stream_with_context
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+# Flush the response buffer once it grows past this many characters
+FLUSH_SIZE = 64 * 1024
+
+
+def _json_default(value):
+    """Serialize database types that json cannot handle natively"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    """Format a single CSV cell"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunks(rows, columns):
+    """Encode rows as CSV text, yielding roughly FLUSH_SIZE characters at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_value(row[column]) for column in columns])
+        if buffer.tell() >= FLUSH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _ndjson_chunks(rows, columns):
+    """Encode rows as newline-delimited JSON, yielding roughly FLUSH_SIZE characters at a time"""
+    lines = []
+    size = 0
+    for row in rows:
+        line = json.dumps({column: row[column] for column in columns},
+                          default=_json_default, separators=(',', ':'))
+        lines.append(line)
+        size += len(line) + 1
+        if size >= FLUSH_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+            size = 0
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def stream_rows(rows, columns, export_format, filename):
+    """
+    Build a streaming download response
+
+    Args:
+        rows (iterable): Row dictionaries, typically from Database.iter_query
+        columns (list): Column names, in output order
+        export_format (str): 'csv' or 'ndjson'
+        filename (str): Download name without extension
+
+    Returns:
+        Response: Chunked response generated while rows are read
+    """
+    encoder = _csv_chunks if export_format == 'csv' else _ndjson_chunks
+    response = Response(
+        stream_with_context(encoder(rows, columns)),
+        mimetype=EXPORT_FORMATS[export_format]
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}.{export_format}'
+    return response
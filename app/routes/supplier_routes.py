@@ -5,25 +5,47 @@ API endpoints for supplier management
 """
 
 from flask import Blueprint, request, jsonify
+from app.models.database import ROW_FORMATS
 from app.models.supplier import Supplier
+from app.routes.imports import import_request
 
 supplier_bp = Blueprint('suppliers', __name__)
 
 
 @supplier_bp.route('', methods=['GET'])
 def get_suppliers():
-    """GET /api/suppliers - Get all suppliers with pagination"""
+    """GET /api/suppliers - Get all suppliers with pagination, format: rows or columns"""
     try:
+        row_format = request.args.get('format', 'rows')
+        if row_format not in ROW_FORMATS:
+            return jsonify({'success': False, 'error': f'Unsupported format: {row_format}'}), 400
+
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 10))
         search = request.args.get('search')
 
-        result = Supplier.get_all(page, per_page, search)
+        result = Supplier.get_all(
+            page, per_page, search, row_format,
+            cursor=request.args.get('cursor'), include_total=request.args.get('include_total', 'exact')
+        )
         return jsonify(result), 200 if result['success'] else 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@supplier_bp.route('/import', methods=['POST'])
+def import_suppliers():
+    """
+    POST /api/suppliers/import
+    Bulk import suppliers from a CSV or NDJSON body (or a 'file' upload)
+    Query params: format (csv, ndjson), chunk_size
+    """
+    try:
+        return import_request('suppliers')
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @supplier_bp.route('/<int:supplier_id>', methods=['GET'])
 def get_supplier(supplier_id):
     """GET /api/suppliers/<id> - Get single supplier"""
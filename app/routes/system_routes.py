@@ -0,0 +1,131 @@
+"""
+System Routes
+=============
+API endpoints for database and runtime diagnostics
+"""
+
+from flask import Blueprint, request, jsonify
+from app.models.database import Database
+from app.models.partitioning import TransactionArchive, TransactionPartitions
+from app.models.product_cache import ProductLookup
+from app.models.profiler import QueryProfiler
+from app.models.query_registry import QueryRegistry
+from app.models.suggest import ProductSuggest
+from app.models.transaction import STOCK_MOVEMENT_QUEUE
+
+system_bp = Blueprint('system', __name__)
+
+
+@system_bp.route('/db-pool', methods=['GET'])
+def db_pool_stats():
+    """GET /api/system/db-pool - Live connection pool statistics"""
+    try:
+        return jsonify({'success': True, 'data': Database.get_pool_stats()}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/query-registry', methods=['GET'])
+def query_registry_stats():
+    """GET /api/system/query-registry - Compiled query and prepared statement cache counters"""
+    try:
+        return jsonify({'success': True, 'data': QueryRegistry.stats()}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/query-cache', methods=['GET'])
+def query_cache_stats():
+    """GET /api/system/query-cache - Query result cache counters"""
+    try:
+        return jsonify({'success': True, 'data': Database.get_query_cache().stats()}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/query-cache', methods=['DELETE'])
+def clear_query_cache():
+    """DELETE /api/system/query-cache - Drop every cached query result"""
+    try:
+        Database.get_query_cache().clear()
+        return jsonify({'success': True, 'message': 'Query cache cleared'}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/product-cache', methods=['GET'])
+def product_cache_stats():
+    """GET /api/system/product-cache - Product lookup cache counters"""
+    try:
+        return jsonify({'success': True, 'data': ProductLookup.get_cache().stats()}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/group-commit', methods=['GET'])
+def group_commit_stats():
+    """GET /api/system/group-commit - Stock movement group-commit counters"""
+    try:
+        return jsonify({'success': True, 'data': STOCK_MOVEMENT_QUEUE.stats()}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/transaction-partitions', methods=['GET'])
+def transaction_partition_stats():
+    """GET /api/system/transaction-partitions - Monthly transactions partitions and archived months"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': {
+                'partitions': TransactionPartitions.list(),
+                'archived_months': TransactionArchive.months()
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/suggest-index', methods=['GET'])
+def suggest_index_stats():
+    """GET /api/system/suggest-index - Product typeahead index size and last build"""
+    try:
+        return jsonify({'success': True, 'data': ProductSuggest.stats()}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/suggest-index', methods=['POST'])
+def rebuild_suggest_index():
+    """POST /api/system/suggest-index - Rebuild the product typeahead index now"""
+    try:
+        if ProductSuggest.build():
+            return jsonify({'success': True, 'data': ProductSuggest.stats()}), 200
+        return jsonify({'success': False, 'error': 'Suggest index rebuild failed'}), 500
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/profiles', methods=['GET'])
+def get_query_profiles():
+    """
+    GET /api/system/profiles - Recently profiled requests (newest first)
+    Query params: limit
+    """
+    try:
+        limit = int(request.args.get('limit', 50))
+        return jsonify({'success': True, 'data': QueryProfiler.recent(limit)}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@system_bp.route('/profiles/<profile_id>', methods=['GET'])
+def get_query_profile(profile_id):
+    """GET /api/system/profiles/<profile_id> - Every statement of one profiled request"""
+    try:
+        profile = QueryProfiler.get(profile_id)
+        if profile:
+            return jsonify({'success': True, 'data': profile}), 200
+        return jsonify({'success': False, 'error': 'Profile not found'}), 404
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
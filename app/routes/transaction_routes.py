@@ -5,15 +5,29 @@ API endpoints for transaction management
 """
 
 from flask import Blueprint, request, jsonify
+from app.models.database import ROW_FORMATS, clamp_page_size
+from app.models.partitioning import TransactionArchive
 from app.models.transaction import Transaction
+from app.routes.datatables import datatables_response, is_datatables_request, parse_datatables_args
+from app.routes.streaming import EXPORT_FORMATS, stream_rows
 
 transaction_bp = Blueprint('transactions', __name__)
 
 
 @transaction_bp.route('', methods=['GET'])
 def get_transactions():
-    """GET /api/transactions - Get all transactions with filters"""
+    """
+    GET /api/transactions - Get all transactions with filters, format: rows or columns
+    DataTables server-side requests (draw, start, length, order) get the DataTables response shape.
+    """
     try:
+        if is_datatables_request(request.args):
+            return get_transactions_datatable()
+
+        row_format = request.args.get('format', 'rows')
+        if row_format not in ROW_FORMATS:
+            return jsonify({'success': False, 'error': f'Unsupported format: {row_format}'}), 400
+
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 10))
         product_id = request.args.get('product_id', type=int)
@@ -21,25 +35,87 @@ def get_transactions():
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
 
-        result = Transaction.get_all(page, per_page, product_id, transaction_type, start_date, end_date)
+        result = Transaction.get_all(
+            page, per_page, product_id, transaction_type, start_date, end_date, row_format,
+            cursor=request.args.get('cursor'), include_total=request.args.get('include_total', 'exact')
+        )
         return jsonify(result), 200 if result['success'] else 400
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def get_transactions_datatable():
+    """Serve one page of a transactions DataTable (filters come as regular query params)"""
+    table = parse_datatables_args(request.args)
+    filters = (
+        request.args.get('product_id', type=int),
+        request.args.get('type'),
+        request.args.get('start_date'),
+        request.args.get('end_date')
+    )
+
+    result = Transaction.get_all(table['page'], table['per_page'], *filters, sort=table['sort'])
+    response = datatables_response(table['draw'], result, 'transactions', any(filters))
+    return jsonify(response), 200 if result['success'] else 400
+
+
+@transaction_bp.route('/export', methods=['GET'])
+def export_transactions():
+    """
+    GET /api/transactions/export - Stream all matching transactions
+    Query params: format (csv, ndjson), product_id, type, start_date, end_date
+    """
+    try:
+        export_format = request.args.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'success': False, 'error': f'Unsupported format: {export_format}'}), 400
+
+        rows = Transaction.iter_export(
+            request.args.get('product_id', type=int),
+            request.args.get('type'),
+            request.args.get('start_date'),
+            request.args.get('end_date')
+        )
+        return stream_rows(rows, Transaction.EXPORT_COLUMNS, export_format, 'transactions')
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @transaction_bp.route('/history/<int:product_id>', methods=['GET'])
 def get_product_history(product_id):
     """GET /api/transactions/history/<product_id> - Get transaction history for product"""
     try:
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
+        include_archived = request.args.get('include_archived', 'false').lower() == 'true'
 
-        result = Transaction.get_by_product(product_id, start_date, end_date)
+        result = Transaction.get_by_product(product_id, start_date, end_date, include_archived)
         return jsonify(result), 200 if result['success'] else 404
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@transaction_bp.route('/archive', methods=['GET'])
+def get_archived_transactions():
+    """
+    GET /api/transactions/archive - Transactions of archived months, newest first
+    Query params: product_id, transaction_type, start_date, end_date, limit
+    """
+    try:
+        result = TransactionArchive.query(
+            start_date=request.args.get('start_date'),
+            end_date=request.args.get('end_date'),
+            product_id=request.args.get('product_id', type=int),
+            transaction_type=request.args.get('transaction_type'),
+            limit=clamp_page_size(request.args.get('limit', 100, type=int))
+        )
+        return jsonify(result), 200 if result['success'] else 500
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @transaction_bp.route('/stock-in', methods=['POST'])
 def stock_in():
     """POST /api/transactions/stock-in - Record stock in transaction"""
@@ -86,6 +162,39 @@ def stock_out():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@transaction_bp.route('/batch', methods=['POST'])
+def record_batch():
+    """
+    POST /api/transactions/batch - Record a multi-line receipt or order all-or-nothing
+    Request body: created_by, lines (product_id, quantity, transaction_type, reference_number, remarks),
+                  transaction_type, reference_number, remarks (defaults for the lines)
+    """
+    try:
+        data = request.get_json()
+
+        required_fields = ['lines', 'created_by']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'success': False, 'error': f'Missing required field: {field}'}), 400
+        if not isinstance(data['lines'], list):
+            return jsonify({'success': False, 'error': 'lines must be a list'}), 400
+
+        default_type = data.get('transaction_type')
+        lines = [
+            {'transaction_type': default_type, **line} if isinstance(line, dict) else {}
+            for line in data['lines']
+        ]
+        result = Transaction.record_batch(
+            lines,
+            data['created_by'],
+            data.get('reference_number', ''),
+            data.get('remarks', '')
+        )
+        return jsonify(result), 201 if result['success'] else 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @transaction_bp.route('/adjust', methods=['POST'])
 def adjust_stock():
     """POST /api/transactions/adjust - Adjust stock quantity"""
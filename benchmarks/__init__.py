@@ -0,0 +1,6 @@
+"""
+Benchmarks Package
+==================
+Performance benchmarks for the inventory management system.
+Run from the project root, e.g. ``python -m benchmarks.bench_endpoints``
+"""
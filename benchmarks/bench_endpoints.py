@@ -0,0 +1,74 @@
+"""
+List Endpoint Throughput Benchmark
+==================================
+Drives GET /api/products and GET /api/transactions over HTTP at a fixed
+concurrency and reports throughput and latency for each running server
+given with --target, so deployments (threaded dev server, gunicorn worker
+and thread counts, ...) are compared under the same load:
+
+    flask --app run run --with-threads --port 5000
+    gunicorn -w 4 --threads 8 -b 127.0.0.1:5001 run:app
+    python -m benchmarks.bench_endpoints --concurrency 32 \\
+        --target dev=http://127.0.0.1:5000 --target gunicorn=http://127.0.0.1:5001
+"""
+
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ENDPOINTS = ('/api/products?page=1&per_page=10', '/api/transactions?page=1&per_page=10')
+
+
+def report(label, latencies, elapsed):
+    """Print throughput and latency percentiles"""
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"  {label:<12} {len(latencies) / elapsed:9.1f} req/s   "
+          f"p50 {statistics.median(latencies) * 1000:7.2f} ms   p95 {p95 * 1000:7.2f} ms")
+
+
+def run(url, requests, concurrency):
+    """Send requests GETs with concurrency of them in flight at a time"""
+    def timed_call(_):
+        start = time.perf_counter()
+        with urllib.request.urlopen(url, timeout=30) as response:
+            body = json.loads(response.read())
+        assert body['success'], body
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(timed_call, range(requests)))
+    return latencies, time.perf_counter() - start
+
+
+def parse_target(value):
+    """label=URL (or a bare URL, labelled by itself)"""
+    label, _, url = value.partition('=')
+    return (label, url) if url else (value, value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', type=parse_target, action='append',
+                        help='label=base URL of a running server (repeatable)')
+    parser.add_argument('--requests', type=int, default=1000, help='Requests per endpoint and target')
+    parser.add_argument('--concurrency', type=int, default=16, help='Requests in flight, the same for every target')
+    options = parser.parse_args()
+    targets = options.target or [('server', 'http://127.0.0.1:5000')]
+
+    for endpoint in ENDPOINTS:
+        print(f"{endpoint} ({options.requests} requests, {options.concurrency} in flight)")
+        for label, base_url in targets:
+            url = base_url.rstrip('/') + endpoint
+            # Warm up the pool and the prepared statement caches
+            run(url, options.concurrency * 2, options.concurrency)
+            latencies, elapsed = run(url, options.requests, options.concurrency)
+            report(label, latencies, elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Group Commit Throughput Benchmark
+=================================
+Compares stock movements recorded through the per-call stored procedures
+(one transaction and one commit per movement) with the group-commit queue
+(GROUP_COMMIT_ENABLED), with --threads callers posting concurrently like
+POS terminals.
+
+Every caller alternates stock-in and stock-out of one unit, so stock levels
+end where they started. The benchmark's transactions rows (created_by
+'bench-group-commit') are deleted afterwards.
+
+Usage:
+    python -m benchmarks.bench_group_commit --movements 5000 --threads 32
+    python -m benchmarks.bench_group_commit --window-ms 2 --products 20
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import Config
+from app.models.database import Database
+from app.models.transaction import STOCK_MOVEMENT_QUEUE, Transaction
+
+CREATED_BY = 'bench-group-commit'
+
+
+def report(label, latencies, elapsed):
+    """Print throughput and latency percentiles"""
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"  {label:<16} {len(latencies) / elapsed:9.1f} movements/s   "
+          f"p50 {statistics.median(latencies) * 1000:7.2f} ms   p95 {p95 * 1000:7.2f} ms")
+
+
+def run(product_ids, movements, threads):
+    """Post movements from a pool of threads, alternating stock in and out"""
+    def timed_call(number):
+        product_id = product_ids[number % len(product_ids)]
+        record = Transaction.record_stock_in if (number // len(product_ids)) % 2 == 0 else Transaction.record_stock_out
+        start = time.perf_counter()
+        result = record(product_id, 1, 'BENCH', '', CREATED_BY)
+        assert result['success'], result
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = list(executor.map(timed_call, range(movements)))
+    return latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--movements', type=int, default=2000, help='Movements per mode (even)')
+    parser.add_argument('--threads', type=int, default=32, help='Concurrent callers')
+    parser.add_argument('--products', type=int, default=50, help='Distinct products moved')
+    parser.add_argument('--window-ms', type=float, default=None, help='Group window (GROUP_COMMIT_WINDOW_MS)')
+    options = parser.parse_args()
+
+    product_ids = [row['product_id'] for row in Database.execute_query(
+        "SELECT product_id FROM inventory WHERE quantity_in_stock > 0 ORDER BY product_id LIMIT %s",
+        (options.products,)
+    )]
+    if not product_ids:
+        raise SystemExit("No products with stock; load sample_data.sql or run benchmarks.seed_data first")
+    if options.window_ms is not None:
+        STOCK_MOVEMENT_QUEUE.window = options.window_ms / 1000
+
+    # Pool max size bounds how many callers reach MySQL at once in procedure mode
+    print(f"{options.movements} movements, {options.threads} callers, {len(product_ids)} products "
+          f"(pool {Config.DB_POOL_SIZE}+{Config.DB_POOL_MAX_OVERFLOW})")
+    try:
+        Config.GROUP_COMMIT_ENABLED = False
+        latencies, elapsed = run(product_ids, options.movements, options.threads)
+        report('procedure', latencies, elapsed)
+
+        Config.GROUP_COMMIT_ENABLED = True
+        latencies, elapsed = run(product_ids, options.movements, options.threads)
+        report('group commit', latencies, elapsed)
+        stats = STOCK_MOVEMENT_QUEUE.stats()
+        print(f"  {stats['batches']} commits, {stats['average_batch']} movements per commit "
+              f"(largest {stats['largest_batch']})")
+    finally:
+        Config.GROUP_COMMIT_ENABLED = False
+        deleted = Database.execute_update("DELETE FROM transactions WHERE created_by = %s", (CREATED_BY,))
+        print(f"✓ Removed {deleted} benchmark transactions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Bulk Import Benchmark
+=====================
+Writes a synthetic product catalog to a CSV file and imports it with
+BulkImporter, next to a sample imported one product at a time through
+Product.create (the per-item POST /api/products path) for comparison.
+Imported SKUs start with BENCH-IMP- and are removed by
+``python -m benchmarks.seed_data --clean``.
+
+Usage:
+    python -m benchmarks.bench_import --products 100000
+    python -m benchmarks.bench_import --products 100000 --chunk-size 5000 --single 500
+"""
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.seed_data import ADJECTIVES, BRANDS, NOUNS
+from app.models.bulk_import import BulkImporter, read_rows
+from app.models.database import Database
+from app.models.product import Product
+
+SKU_PREFIX = 'BENCH-IMP-'
+
+COLUMNS = ['product_name', 'sku', 'description', 'category_name', 'supplier_id',
+           'unit_price', 'reorder_level', 'warehouse_location']
+
+
+def write_catalog(path, total, run_id):
+    """Write a CSV catalog of total products, resolving categories by name"""
+    categories = [row['category_name'] for row in Database.execute_query("SELECT category_name FROM categories")]
+    supplier_ids = [row['supplier_id'] for row in Database.execute_query("SELECT supplier_id FROM suppliers")]
+    if not categories or not supplier_ids:
+        raise SystemExit("Load schema.sql and sample_data.sql first (categories and suppliers are required)")
+
+    rng = random.Random(run_id)
+    with open(path, 'w', newline='', encoding='utf-8') as stream:
+        writer = csv.writer(stream)
+        writer.writerow(COLUMNS)
+        for number in range(total):
+            noun = rng.choice(NOUNS)
+            writer.writerow([
+                f"{rng.choice(BRANDS)} {rng.choice(ADJECTIVES)} {noun} {rng.randint(100, 9999)}",
+                f"{SKU_PREFIX}{run_id}-{number:07d}",
+                f"Imported benchmark product {number}",
+                rng.choice(categories),
+                rng.choice(supplier_ids),
+                round(rng.uniform(50, 150000), 2),
+                rng.randint(5, 50),
+                f"IMP-{rng.randint(1, 40):02d}"
+            ])
+
+
+def single_inserts(path, count):
+    """Create the first count catalog rows one product at a time"""
+    categories = {row['category_name']: row['category_id']
+                  for row in Database.execute_query("SELECT category_id, category_name FROM categories")}
+    started = time.perf_counter()
+    with open(path, newline='', encoding='utf-8') as stream:
+        for index, row in enumerate(csv.DictReader(stream)):
+            if index >= count:
+                break
+            row['sku'] += '-S'
+            if not Product.check_sku_exists(row['sku']):
+                Product.create({**row, 'category_id': categories[row['category_name']]})
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=100000, help='Catalog size')
+    parser.add_argument('--chunk-size', type=int, default=None, help='Rows per chunk (IMPORT_CHUNK_SIZE)')
+    parser.add_argument('--single', type=int, default=1000, help='Products created one at a time for comparison')
+    options = parser.parse_args()
+
+    run_id = int(time.time()) % 100000
+    fd, path = tempfile.mkstemp(suffix='.csv')
+    os.close(fd)
+    try:
+        write_catalog(path, options.products, run_id)
+
+        if options.single:
+            elapsed = single_inserts(path, options.single)
+            print(f"Product.create:  {options.single:>9,} products in {elapsed:6.1f}s "
+                  f"({options.single / elapsed:>9,.0f} rows/s)")
+
+        with open(path, newline='', encoding='utf-8') as stream:
+            report = BulkImporter('products', chunk_size=options.chunk_size).run(read_rows(stream, 'csv'))
+        elapsed = report['elapsed_ms'] / 1000
+        print(f"BulkImporter:    {report['imported']:>9,} products in {elapsed:6.1f}s "
+              f"({report['imported'] / elapsed:>9,.0f} rows/s, {report['chunks']} chunks, "
+              f"{report['failed']} failed)")
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Result Format Benchmark
+=======================
+Compares the dict-per-row result shape with the compact 'columns' shape
+for one list page: JSON payload bytes and memory allocated while building
+and serializing the page.
+
+By default a synthetic page shaped like GET /api/products rows is used;
+--live fetches the page from the configured database instead.
+
+Usage:
+    python -m benchmarks.bench_result_formats --rows 1000
+    python -m benchmarks.bench_result_formats --rows 1000 --live
+"""
+
+import argparse
+import json
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+COLUMNS = [
+    'product_id', 'product_name', 'sku', 'description',
+    'category_id', 'category_name', 'supplier_id', 'supplier_name',
+    'unit_price', 'reorder_level', 'quantity_in_stock', 'created_at', 'updated_at'
+]
+
+
+def synthetic_rows(count):
+    """Build tuple rows shaped like the products list query"""
+    start = datetime(2024, 1, 1)
+    return [
+        (
+            index, f'Product {index}', f'SKU-{index:06d}', f'Description of product {index}',
+            index % 12 + 1, f'Category {index % 12 + 1}', index % 30 + 1, f'Supplier {index % 30 + 1}',
+            Decimal('199.99') + index, 10, index % 250,
+            start + timedelta(minutes=index), start + timedelta(minutes=index, hours=1)
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def fetch_live(count, row_format):
+    """Fetch one products page from the database in the given format"""
+    from app.models.product import Product
+    result = Product.get_all(1, count, row_format=row_format)
+    assert result['success'], result
+    return result['data']
+
+
+def encode(data):
+    return json.dumps({'success': True, 'data': data}, default=str).encode()
+
+
+def measure(build):
+    """Return (payload bytes, peak bytes allocated) for build() + encode()"""
+    tracemalloc.start()
+    payload = encode(build())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(payload), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000, help='Rows per page')
+    parser.add_argument('--live', action='store_true', help='Fetch the page from the database')
+    options = parser.parse_args()
+
+    if options.live:
+        builders = {
+            'rows': lambda: fetch_live(options.rows, 'rows'),
+            'columns': lambda: fetch_live(options.rows, 'columns')
+        }
+    else:
+        rows = synthetic_rows(options.rows)
+        builders = {
+            'rows': lambda: [dict(zip(COLUMNS, row)) for row in rows],
+            'columns': lambda: {'columns': COLUMNS, 'rows': list(rows)}
+        }
+
+    results = {name: measure(build) for name, build in builders.items()}
+    base_bytes, base_peak = results['rows']
+    for name, (size, peak) in results.items():
+        print(f"{name:<8} payload {size / 1024:9.1f} KiB ({size / base_bytes:6.1%})   "
+              f"peak alloc {peak / 1024:9.1f} KiB ({peak / base_peak:6.1%})")
+
+
+if __name__ == '__main__':
+    main()
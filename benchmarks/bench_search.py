@@ -0,0 +1,74 @@
+"""
+Product Search Benchmark
+========================
+Measures GET /api/products search latency with the search planner against
+the legacy leading-wildcard LIKE, and shows the access path MySQL picks for
+each. Seed the catalog first (e.g. 100k and then 1M products):
+
+    python -m benchmarks.seed_data --products 100000
+    python -m benchmarks.bench_search --runs 20
+    python -m benchmarks.seed_data --products 900000
+    python -m benchmarks.bench_search --runs 20
+
+Requires database/migrations/002_fulltext_search.sql.
+"""
+
+import argparse
+import statistics
+import time
+
+from app.config import Config
+from app.models.database import Database
+from app.models.product import Product
+from app.models.search import PRODUCT_SEARCH
+
+# (label, term) pairs covering each planner strategy
+TERMS = [
+    ('sku prefix', 'BENCH-LAP-00012'),
+    ('one word', 'laptop'),
+    ('two words', 'wireless mouse'),
+    ('substring', 'phon'),
+    ('short term', 'a')
+]
+
+
+def access_path(term):
+    """Return the EXPLAIN access type and key for a search condition"""
+    plan = PRODUCT_SEARCH.plan(term)
+    rows = Database.execute_query(f"EXPLAIN SELECT p.product_id FROM products p WHERE {plan.condition}",
+                                  tuple(plan.params))
+    return f"{plan.strategy}: {rows[0]['type']} / {rows[0]['key'] or '-'}"
+
+
+def time_search(term, runs):
+    """Median and p95 latency of one search page (no caching of totals)"""
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = Product.get_all(1, 20, search=term, include_total='none')
+        latencies.append(time.perf_counter() - start)
+        assert result['success'], result
+    latencies.sort()
+    return statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.95) - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20, help='Searches per term and mode')
+    options = parser.parse_args()
+
+    total = Database.execute_query("SELECT COUNT(*) as total FROM products", fetch_one=True)['total']
+    print(f"Catalog: {total:,} products\n")
+    print(f"{'term':<12} {'legacy p50/p95 ms':>20} {'planned p50/p95 ms':>20}   access path")
+
+    for label, term in TERMS:
+        Config.SEARCH_FULLTEXT_ENABLED = False
+        legacy = time_search(term, options.runs)
+        Config.SEARCH_FULLTEXT_ENABLED = True
+        planned = time_search(term, options.runs)
+        print(f"{label:<12} {legacy[0]:>9.2f} / {legacy[1]:>8.2f} {planned[0]:>9.2f} / {planned[1]:>8.2f}   "
+              f"{access_path(term)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Stock Movement Stress Test
+==========================
+Hammers a few products with concurrent stock-in and stock-out calls and
+checks that no update was lost and no stock went negative.
+
+Every caller picks a product and a direction at random, so stock-outs
+regularly ask for more than is left and must be rejected. Afterwards each
+product's final quantity must equal its starting quantity plus the
+recorded stock-ins minus the recorded stock-outs, and must match the sum
+of its transactions rows. The run reports throughput, rejected oversells
+and deadlock retries; its transactions rows (created_by 'bench-stress')
+are deleted and the starting quantities restored.
+
+Usage:
+    python -m benchmarks.bench_stock_stress --movements 5000 --threads 32
+    python -m benchmarks.bench_stock_stress --products 2 --group-commit
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import Config
+from app.models.database import Database
+from app.models.transaction import Transaction
+
+CREATED_BY = 'bench-stress'
+
+
+def run(product_ids, movements, threads, max_quantity, seed):
+    """Post random movements from a pool of threads and tally the outcomes"""
+    def call(number):
+        rng = random.Random(seed + number)
+        product_id = rng.choice(product_ids)
+        quantity = rng.randint(1, max_quantity)
+        if rng.random() < 0.5:
+            result = Transaction.record_stock_in(product_id, quantity, 'STRESS', '', CREATED_BY)
+            return product_id, 'in', quantity, result
+        result = Transaction.record_stock_out(product_id, quantity, 'STRESS', '', CREATED_BY)
+        return product_id, 'out', quantity, result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        outcomes = list(executor.map(call, range(movements)))
+    return outcomes, time.perf_counter() - start
+
+
+def check(product_ids, start_stock, outcomes):
+    """
+    Compare final quantities with the recorded movements
+
+    Returns:
+        list: One message per inconsistency (empty when consistent)
+    """
+    expected = dict(start_stock)
+    for product_id, direction, quantity, result in outcomes:
+        if result['success']:
+            expected[product_id] += quantity if direction == 'in' else -quantity
+
+    final_stock = stock_levels(product_ids)
+    logged = {row['product_id']: int(row['net']) for row in Database.execute_query(
+        f"""SELECT product_id,
+                   SUM(CASE WHEN transaction_type = 'STOCK_IN' THEN quantity ELSE -quantity END) as net
+            FROM transactions
+            WHERE created_by = %s AND product_id IN ({', '.join(['%s'] * len(product_ids))})
+            GROUP BY product_id""",
+        (CREATED_BY, *product_ids)
+    )}
+
+    problems = []
+    for product_id in product_ids:
+        final = final_stock[product_id]
+        if final < 0:
+            problems.append(f"product {product_id}: negative stock {final}")
+        if final != expected[product_id]:
+            problems.append(f"product {product_id}: stock {final}, expected {expected[product_id]}")
+        if final != start_stock[product_id] + logged.get(product_id, 0):
+            problems.append(f"product {product_id}: stock {final} does not match its transactions "
+                            f"({start_stock[product_id]} + {logged.get(product_id, 0)})")
+    return problems
+
+
+def stock_levels(product_ids):
+    """Current quantity_in_stock per product, read from the primary"""
+    with Database.transaction():
+        rows = Database.execute_query(
+            f"SELECT product_id, quantity_in_stock FROM inventory "
+            f"WHERE product_id IN ({', '.join(['%s'] * len(product_ids))})",
+            tuple(product_ids)
+        )
+    return {row['product_id']: row['quantity_in_stock'] for row in rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--movements', type=int, default=2000, help='Total movements')
+    parser.add_argument('--threads', type=int, default=32, help='Concurrent callers')
+    parser.add_argument('--products', type=int, default=3, help='Distinct (hot) products moved')
+    parser.add_argument('--max-quantity', type=int, default=5, help='Largest quantity per movement')
+    parser.add_argument('--group-commit', action='store_true', help='Record through the group-commit queue')
+    parser.add_argument('--seed', type=int, default=1)
+    options = parser.parse_args()
+
+    product_ids = [row['product_id'] for row in Database.execute_query(
+        "SELECT product_id FROM inventory ORDER BY product_id LIMIT %s", (options.products,)
+    )]
+    if not product_ids:
+        raise SystemExit("No inventory rows; load sample_data.sql or run benchmarks.seed_data first")
+
+    Config.GROUP_COMMIT_ENABLED = options.group_commit
+    start_stock = stock_levels(product_ids)
+    retries_before = Database.get_pool_stats()['retries']
+    print(f"{options.movements} movements, {options.threads} callers, products {product_ids} "
+          f"({'group commit' if options.group_commit else 'stored procedures'})")
+    try:
+        outcomes, elapsed = run(product_ids, options.movements, options.threads,
+                                options.max_quantity, options.seed)
+
+        tally = Counter()
+        for _, direction, _, result in outcomes:
+            if result['success']:
+                tally[direction] += 1
+            elif result['error'].startswith('Insufficient stock'):
+                tally['oversells'] += 1
+            else:
+                tally['errors'] += 1
+        retries = Database.get_pool_stats()['retries']
+
+        print(f"  {len(outcomes) / elapsed:9.1f} movements/s   {tally['in']} in, {tally['out']} out, "
+              f"{tally['oversells']} oversells rejected, {tally['errors']} other errors")
+        print(f"  {retries['retries'] - retries_before['retries']} deadlock retries, "
+              f"{retries['exhausted'] - retries_before['exhausted']} exhausted")
+
+        problems = check(product_ids, start_stock, outcomes)
+        for problem in problems:
+            print(f"✗ {problem}")
+        if not problems:
+            print("✓ Final stock matches the recorded movements, none negative")
+    finally:
+        Config.GROUP_COMMIT_ENABLED = False
+        deleted = Database.execute_update("DELETE FROM transactions WHERE created_by = %s", (CREATED_BY,))
+        Database.execute_many(
+            "UPDATE inventory SET quantity_in_stock = %s WHERE product_id = %s",
+            [(quantity, product_id) for product_id, quantity in start_stock.items()]
+        )
+        print(f"✓ Removed {deleted} stress transactions and restored starting stock")
+
+    if problems:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
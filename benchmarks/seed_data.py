@@ -0,0 +1,112 @@
+"""
+Benchmark Data Seeder
+=====================
+Inserts synthetic products (with inventory rows) so that searches and list
+pages can be measured at realistic catalog sizes. Seeded products have SKUs
+starting with BENCH- and are removed again with --clean.
+
+Usage:
+    python -m benchmarks.seed_data --products 100000
+    python -m benchmarks.seed_data --products 1000000 --batch 10000
+    python -m benchmarks.seed_data --clean
+"""
+
+import argparse
+import random
+import time
+
+from app.models.database import Database
+
+SKU_PREFIX = 'BENCH-'
+
+BRANDS = ['Acme', 'Apex', 'Bolt', 'Crest', 'Delta', 'Echo', 'Fusion', 'Helix', 'Nova', 'Orion',
+          'Pulse', 'Quantum', 'Sigma', 'Titan', 'Vertex', 'Zenith']
+ADJECTIVES = ['Compact', 'Wireless', 'Portable', 'Premium', 'Smart', 'Heavy Duty', 'Ultra Slim',
+              'Ergonomic', 'Digital', 'Industrial', 'Rechargeable', 'Waterproof']
+NOUNS = ['Laptop', 'Monitor', 'Keyboard', 'Mouse', 'Printer', 'Router', 'Speaker', 'Headphones',
+         'Drill', 'Chair', 'Desk Lamp', 'Power Bank', 'Camera', 'Scanner', 'Projector', 'Tablet']
+
+
+def product_rows(start, count, category_ids, supplier_ids, rng):
+    """Generate product tuples for SKUs start .. start + count - 1"""
+    for number in range(start, start + count):
+        noun = rng.choice(NOUNS)
+        name = f"{rng.choice(BRANDS)} {rng.choice(ADJECTIVES)} {noun} {rng.randint(100, 9999)}"
+        code = noun[:3].upper()
+        yield (
+            name,
+            f"{SKU_PREFIX}{code}-{number:07d}",
+            f"Synthetic benchmark product {number}",
+            rng.choice(category_ids),
+            rng.choice(supplier_ids),
+            round(rng.uniform(50, 150000), 2),
+            rng.randint(5, 50)
+        )
+
+
+def seed(total, batch_size):
+    """Insert products and their inventory rows in batches"""
+    category_ids = [row['category_id'] for row in Database.execute_query("SELECT category_id FROM categories")]
+    supplier_ids = [row['supplier_id'] for row in Database.execute_query("SELECT supplier_id FROM suppliers")]
+    if not category_ids or not supplier_ids:
+        raise SystemExit("Load schema.sql and sample_data.sql first (categories and suppliers are required)")
+
+    existing = Database.execute_query(
+        "SELECT COUNT(*) as total FROM products WHERE sku LIKE %s", (f"{SKU_PREFIX}%",), fetch_one=True
+    )['total']
+    rng = random.Random(42 + existing)
+
+    started = time.perf_counter()
+    for offset in range(0, total, batch_size):
+        count = min(batch_size, total - offset)
+        rows = list(product_rows(existing + offset + 1, count, category_ids, supplier_ids, rng))
+        Database.execute_many("""
+            INSERT INTO products
+                (product_name, sku, description, category_id, supplier_id, unit_price, reorder_level)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """, rows)
+        print(f"  {offset + count:>9,} / {total:,} products", end='\r')
+
+    Database.execute_update("""
+        INSERT INTO inventory (product_id, quantity_in_stock, warehouse_location)
+        SELECT p.product_id, FLOOR(RAND() * 200), 'BENCH'
+        FROM products p
+        LEFT JOIN inventory i ON i.product_id = p.product_id
+        WHERE p.sku LIKE %s AND i.inventory_id IS NULL
+    """, (f"{SKU_PREFIX}%",))
+
+    # Fresh statistics for the optimizer (and for estimated totals)
+    with Database.get_cursor() as cursor:
+        cursor.execute("ANALYZE TABLE products, inventory")
+        cursor.fetchall()
+    print(f"\n✓ Seeded {total:,} products in {time.perf_counter() - started:.1f}s")
+
+
+def clean(batch_size):
+    """Delete every seeded product (inventory rows cascade)"""
+    deleted = 0
+    while True:
+        rows = Database.execute_update(
+            "DELETE FROM products WHERE sku LIKE %s LIMIT %s", (f"{SKU_PREFIX}%", batch_size)
+        )
+        if not rows:
+            break
+        deleted += rows
+    print(f"✓ Deleted {deleted:,} benchmark products")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=100000, help='Products to add')
+    parser.add_argument('--batch', type=int, default=5000, help='Rows per INSERT batch')
+    parser.add_argument('--clean', action='store_true', help='Remove seeded products instead')
+    options = parser.parse_args()
+
+    if options.clean:
+        clean(options.batch)
+    else:
+        seed(options.products, options.batch)
+
+
+if __name__ == '__main__':
+    main()
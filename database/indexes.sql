@@ -23,6 +23,16 @@ USE inventory_management;
 -- Use Case: "List all suppliers in Mumbai"
 -- Performance: Enables quick filtering without scanning entire table
 
+-- FULLTEXT INDEX: ft_supplier_search ON suppliers(company_name, contact_person, city) WITH PARSER ngram
+-- Justification: Supplier search matches substrings of three columns
+-- Use Case: "Find suppliers matching 'tech'"
+-- Performance: Replaces a full scan with three leading-wildcard LIKEs
+
+-- INDEX: idx_created_at ON suppliers(created_at, supplier_id)
+-- Justification: Sort order of the supplier list (newest first)
+-- Use Case: Keyset pagination "next 10 suppliers after cursor"
+-- Performance: Every page is one index seek, independent of page depth
+
 -- 2. CATEGORIES TABLE INDEXES
 -- --------------------------------------------
 -- INDEX: idx_category_name ON categories(category_name)
@@ -44,16 +54,32 @@ USE inventory_management;
 -- Performance: O(1) lookup due to UNIQUE constraint with B-tree index
 -- Note: Already enforced by UNIQUE constraint but explicitly indexed for clarity
 
--- INDEX: idx_category_id ON products(category_id)
+-- INDEX: idx_category_created ON products(category_id, created_at, product_id)
 -- Justification: Foreign key used in JOIN operations and category-based filtering
--- Use Case: "Show all products in category_id = 5"
--- Performance: Speeds up JOIN with categories table
--- Expected Improvement: 50x faster on large datasets
+-- Use Case: "Show all products in category_id = 5, newest first"
+-- Performance: Rows of the category come out in list order, so a page reads
+--              only its own rows instead of filesorting the whole category
+-- Note: Replaces idx_category_id (migrations/004_composite_indexes.sql)
+
+-- INDEX: idx_supplier_created ON products(supplier_id, created_at, product_id)
+-- Justification: Foreign key for supplier-wise product reports and filters
+-- Use Case: "List all products from supplier_id = 3, newest first"
+-- Performance: Same as idx_category_created for the supplier filter
+-- Note: Replaces idx_supplier_id (migrations/004_composite_indexes.sql)
+
+-- FULLTEXT INDEX: ft_product_search ON products(product_name, sku) WITH PARSER ngram
+-- Justification: Product search matches substrings of name or SKU, ranked by relevance
+-- Use Case: "Search for products containing 'laptop'"
+-- Performance: Substring search from the index instead of LIKE '%laptop%' full scans
+-- Note: SKU-shaped terms ('COMP-LAP-') use an idx_sku range scan instead, and
+--       terms shorter than ngram_token_size use prefix LIKEs on idx_product_name / idx_sku
 
--- INDEX: idx_supplier_id ON products(supplier_id)
--- Justification: Foreign key for supplier-wise product reports
--- Use Case: "List all products from supplier_id = 3"
--- Performance: Enables efficient JOIN with suppliers table
+-- INDEX: idx_created_at ON products(created_at, product_id)
+-- Justification: Sort order of the product list (newest first)
+-- Use Case: Keyset pagination "next 10 products after cursor"
+-- Performance: Every page is one index seek instead of scanning OFFSET rows
+-- Note: idx_product_name (implicitly product_name, product_id) serves the
+--       inventory list, which pages by product name
 
 -- 4. INVENTORY TABLE INDEXES
 -- --------------------------------------------
@@ -62,29 +88,36 @@ USE inventory_management;
 -- Use Case: "Get current stock for product_id = 10"
 -- Performance: O(log n) lookup instead of O(n) scan
 
--- INDEX: idx_quantity ON inventory(quantity_in_stock)
+-- INDEX: idx_quantity_product ON inventory(quantity_in_stock, product_id)
 -- Justification: Used for low-stock alerts and stock level filtering
 -- Use Case: "Find all products with stock < 10"
--- Performance: Range queries are optimized with this index
+-- Performance: Covering range scan; the product join needs no row lookups
+-- Note: Replaces idx_quantity (migrations/004_composite_indexes.sql)
 
 -- 5. TRANSACTIONS TABLE INDEXES
 -- --------------------------------------------
--- INDEX: idx_product_id ON transactions(product_id)
+-- INDEX: idx_product_date ON transactions(product_id, transaction_date, transaction_id)
 -- Justification: Transaction history queries are very frequent
--- Use Case: "Show all transactions for product_id = 15"
--- Performance: Critical for audit trails and history views
+-- Use Case: "Show all transactions for product_id = 15, newest first"
+-- Performance: Critical for audit trails and history views; rows come out in
+--              list order, so keyset pages of a product's history are index seeks
 -- Expected Improvement: 100x faster for products with many transactions
 
--- INDEX: idx_transaction_date ON transactions(transaction_date)
+-- INDEX: idx_date_covering ON transactions(transaction_date, transaction_id, transaction_type, product_id, quantity)
 -- Justification: Date-range queries for reports
 -- Use Case: "Show all transactions between 2024-01-01 and 2024-12-31"
--- Performance: Enables efficient range scans for report generation
--- Expected Improvement: Essential for monthly/yearly reports
-
--- INDEX: idx_transaction_type ON transactions(transaction_type)
+-- Performance: Range scan that covers the summary columns (no row lookups)
+-- Note: Replaces idx_transaction_date (migrations/004_composite_indexes.sql).
+--       transaction_id follows the date, so the keyset list order
+--       (transaction_date DESC, transaction_id DESC) is still read from the index.
+--       Date filters must be ranges on the column itself
+--       (transaction_date >= '2024-01-01' AND transaction_date < '2025-01-01');
+--       DATE(transaction_date) BETWEEN ... cannot use any index
+
+-- INDEX: idx_type_date ON transactions(transaction_type, transaction_date, transaction_id)
 -- Justification: Filtering by transaction type (STOCK_IN, STOCK_OUT, ADJUSTMENT)
--- Use Case: "Show all STOCK_OUT transactions"
--- Performance: Quick filtering for specific transaction analysis
+-- Use Case: "Show all STOCK_OUT transactions, newest first"
+-- Performance: Quick filtering for specific transaction analysis, already in list order
 
 -- INDEX: idx_reference_number ON transactions(reference_number)
 -- Justification: Lookup transactions by PO number, invoice number, etc.
@@ -115,13 +148,14 @@ USE inventory_management;
 -- These can be added if specific query patterns emerge:
 
 -- For product search with category filter:
--- CREATE INDEX idx_product_category_name ON products(category_id, product_name);
+-- Added as idx_category_created (migrations/004_composite_indexes.sql); the
+-- product list is ordered by created_at, not product_name
 
 -- For transaction reports by product and date:
--- CREATE INDEX idx_transaction_product_date ON transactions(product_id, transaction_date);
+-- Added as idx_product_date (migrations/001_keyset_pagination_indexes.sql)
 
 -- For low stock products by category:
--- CREATE INDEX idx_inventory_quantity_product ON inventory(quantity_in_stock, product_id);
+-- Added as idx_quantity_product (migrations/004_composite_indexes.sql)
 
 -- ============================================
 -- INDEX MAINTENANCE NOTES
@@ -151,7 +185,7 @@ USE inventory_management;
 
 -- Test 3: Transaction date range query
 -- EXPLAIN SELECT * FROM transactions
--- WHERE transaction_date BETWEEN '2024-01-01' AND '2024-12-31';
--- Expected: Using idx_transaction_date
+-- WHERE transaction_date >= '2024-01-01' AND transaction_date < '2025-01-01';
+-- Expected: Using idx_date_covering, partitions p202401..p202412 only
 
 -- ============================================
@@ -0,0 +1,38 @@
+-- ============================================
+-- Migration 001: Keyset pagination indexes
+-- ============================================
+-- Keyset (cursor) pagination seeks to the last row of the previous page and
+-- reads the next per_page rows in index order. Each list needs an index on
+-- its sort columns followed by the primary key (InnoDB appends the primary
+-- key to every secondary index, it is listed explicitly for clarity).
+--
+--   products      ORDER BY created_at DESC, product_id DESC
+--   suppliers     ORDER BY created_at DESC, supplier_id DESC
+--   inventory     ORDER BY product_name, product_id       -> idx_product_name
+--   transactions  ORDER BY transaction_date DESC, transaction_id DESC
+--                                                         -> idx_transaction_date
+--                      (idx_date_covering from migration 004 on)
+--
+-- Filtered transaction lists (by product or type) need the filter column
+-- first; the composite indexes replace the single-column ones, which they
+-- make redundant (the foreign key on product_id is served by the new index).
+--
+-- Apply with:
+--   mysql -u root -p inventory_management < database/migrations/001_keyset_pagination_indexes.sql
+-- ============================================
+
+USE inventory_management;
+
+ALTER TABLE products
+    ADD INDEX idx_created_at (created_at, product_id);
+
+ALTER TABLE suppliers
+    ADD INDEX idx_created_at (created_at, supplier_id);
+
+ALTER TABLE transactions
+    ADD INDEX idx_product_date (product_id, transaction_date, transaction_id),
+    ADD INDEX idx_type_date (transaction_type, transaction_date, transaction_id);
+
+ALTER TABLE transactions
+    DROP INDEX idx_product_id,
+    DROP INDEX idx_transaction_type;
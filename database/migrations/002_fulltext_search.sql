@@ -0,0 +1,27 @@
+-- ============================================
+-- Migration 002: Full-text search indexes
+-- ============================================
+-- Product and supplier searches used LIKE '%term%', which cannot use a
+-- B-tree index and scans the whole table. These ngram FULLTEXT indexes let
+-- the search planner (app/models/search.py) answer substring searches from
+-- an index and rank the matches by relevance.
+--
+-- The ngram parser splits text into ngram_token_size-character tokens
+-- (server default 2), so any substring of at least that length is indexed.
+-- Keep SEARCH_NGRAM_SIZE in .env equal to the server's ngram_token_size.
+--
+-- Adding the first FULLTEXT index to a table rebuilds it (hidden
+-- FTS_DOC_ID column); run during a quiet period on large tables.
+-- Set SEARCH_FULLTEXT_ENABLED=True once this migration has been applied.
+--
+-- Apply with:
+--   mysql -u root -p inventory_management < database/migrations/002_fulltext_search.sql
+-- ============================================
+
+USE inventory_management;
+
+ALTER TABLE products
+    ADD FULLTEXT INDEX ft_product_search (product_name, sku) WITH PARSER ngram;
+
+ALTER TABLE suppliers
+    ADD FULLTEXT INDEX ft_supplier_search (company_name, contact_person, city) WITH PARSER ngram;
@@ -0,0 +1,38 @@
+-- ============================================
+-- Migration 003: Monthly partitions for transactions
+-- ============================================
+-- The transactions log only grows, and every report scans a larger index.
+-- Range-partitioning it on transaction_date lets queries with a date range
+-- read only the months they cover, and lets old months be archived and
+-- dropped as a whole partition instead of by a huge DELETE.
+--
+-- MySQL requirements for partitioning:
+--   * every unique key must contain the partitioning column, so the primary
+--     key becomes (transaction_id, transaction_date);
+--   * partitioned InnoDB tables cannot have foreign keys, so
+--     fk_transactions_product is dropped. Product.delete already refuses to
+--     delete products that have transactions.
+--
+-- This migration leaves a single catch-all partition (pmax). Split it into
+-- monthly partitions (rebuilding the table once) with:
+--   flask --app run transaction-partitions maintain
+-- and run the same command monthly (e.g. from cron) so partitions for the
+-- coming months exist before they are needed.
+--
+-- Apply with:
+--   mysql -u root -p inventory_management < database/migrations/003_partition_transactions.sql
+-- ============================================
+
+USE inventory_management;
+
+ALTER TABLE transactions DROP FOREIGN KEY fk_transactions_product;
+
+ALTER TABLE transactions
+    MODIFY transaction_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (transaction_id, transaction_date);
+
+ALTER TABLE transactions
+    PARTITION BY RANGE (UNIX_TIMESTAMP(transaction_date)) (
+        PARTITION pmax VALUES LESS THAN MAXVALUE
+    );
@@ -0,0 +1,56 @@
+-- ============================================
+-- Migration 004: Composite and covering indexes for filtered lists and reports
+-- ============================================
+-- Date filters are now half-open ranges on transaction_date (no DATE()
+-- wrapper), so they can use these indexes:
+--
+--   products(category_id, created_at, product_id)
+--   products(supplier_id, created_at, product_id)
+--       Category / supplier filtered product lists are read in list order
+--       (newest first) instead of collecting and filesorting every product
+--       of the category. They replace idx_category_id / idx_supplier_id,
+--       which are their prefixes, and still back the foreign keys.
+--   inventory(quantity_in_stock, product_id)
+--       Covers the low-stock threshold scan (replaces idx_quantity).
+--   transactions(transaction_date, transaction_id, transaction_type, product_id, quantity)
+--       Covers date-range summaries, which then read only the index. It
+--       replaces idx_transaction_date, its prefix: transaction_id follows the
+--       date so the index still gives the keyset list order
+--       (transaction_date DESC, transaction_id DESC) without a filesort.
+--
+-- The per-product history (the most frequent slow query) is served by the
+-- existing idx_product_date once its date filter is a range.
+--
+-- Indexes are built online (ALGORITHM=INPLACE, LOCK=NONE): reads and writes
+-- continue while they build. Apply with the migration runner, which times
+-- the benchmark queries below before and after and records them in
+-- schema_migrations:
+--   flask --app run migrations apply
+--
+-- benchmark: SELECT transaction_id, transaction_type, quantity, transaction_date FROM transactions WHERE product_id = (SELECT MIN(product_id) FROM products) AND transaction_date >= CURDATE() - INTERVAL 90 DAY ORDER BY transaction_date DESC
+-- benchmark: SELECT transaction_type, COUNT(*), SUM(quantity) FROM transactions WHERE transaction_date >= CURDATE() - INTERVAL 30 DAY AND transaction_date < CURDATE() + INTERVAL 1 DAY GROUP BY transaction_type
+-- benchmark: SELECT product_id, product_name FROM products WHERE category_id = (SELECT MIN(category_id) FROM categories) ORDER BY created_at DESC, product_id DESC LIMIT 20
+-- benchmark: SELECT product_id, quantity_in_stock FROM inventory WHERE quantity_in_stock <= 5 ORDER BY quantity_in_stock
+-- ============================================
+
+USE inventory_management;
+
+ALTER TABLE products
+    ADD INDEX idx_category_created (category_id, created_at, product_id),
+    ADD INDEX idx_supplier_created (supplier_id, created_at, product_id),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE products
+    DROP INDEX idx_category_id,
+    DROP INDEX idx_supplier_id,
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE inventory
+    ADD INDEX idx_quantity_product (quantity_in_stock, product_id),
+    DROP INDEX idx_quantity,
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE transactions
+    ADD INDEX idx_date_covering (transaction_date, transaction_id, transaction_type, product_id, quantity),
+    DROP INDEX idx_transaction_date,
+    ALGORITHM=INPLACE, LOCK=NONE;
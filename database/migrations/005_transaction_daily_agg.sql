@@ -0,0 +1,55 @@
+-- ============================================
+-- Migration 005: Daily transaction aggregates
+-- ============================================
+-- Summary reports grouped the whole transactions table on every call.
+-- transaction_daily_agg keeps one row per (day, product, type) with the
+-- number of movements and the quantity moved; reports read those rows for
+-- past days and only touch raw transactions for today.
+--
+-- The table is maintained by triggers on transactions, so every write path
+-- (stock procedures, batch movements, group commit) updates it in the same
+-- transaction. Deleting transactions decrements it; dropping archived
+-- partitions does not (fire no triggers), so aggregates of archived months
+-- remain available to reports.
+--
+-- Values are not stored: reports price quantities at the current
+-- unit_price, as they always have.
+--
+-- After applying, fill in history and then set TRANSACTION_AGG_ENABLED=True:
+--   flask --app run transaction-agg backfill
+--
+-- Apply with:
+--   flask --app run migrations apply
+-- ============================================
+
+USE inventory_management;
+
+CREATE TABLE transaction_daily_agg (
+    agg_date DATE NOT NULL,
+    product_id INT NOT NULL,
+    transaction_type ENUM('STOCK_IN', 'STOCK_OUT', 'ADJUSTMENT') NOT NULL,
+    transaction_count INT NOT NULL DEFAULT 0,
+    total_quantity BIGINT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (agg_date, product_id, transaction_type),
+    INDEX idx_product_date (product_id, agg_date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TRIGGER trg_transactions_agg_insert
+    AFTER INSERT ON transactions
+    FOR EACH ROW
+    INSERT INTO transaction_daily_agg (agg_date, product_id, transaction_type, transaction_count, total_quantity)
+    VALUES (DATE(NEW.transaction_date), NEW.product_id, NEW.transaction_type, 1, NEW.quantity)
+    ON DUPLICATE KEY UPDATE
+        transaction_count = transaction_count + 1,
+        total_quantity = total_quantity + NEW.quantity;
+
+CREATE TRIGGER trg_transactions_agg_delete
+    AFTER DELETE ON transactions
+    FOR EACH ROW
+    UPDATE transaction_daily_agg
+    SET transaction_count = transaction_count - 1,
+        total_quantity = total_quantity - OLD.quantity
+    WHERE agg_date = DATE(OLD.transaction_date)
+        AND product_id = OLD.product_id
+        AND transaction_type = OLD.transaction_type;
@@ -27,7 +27,9 @@ CREATE TABLE suppliers (
     postal_code VARCHAR(10) NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_company_name (company_name),
-    INDEX idx_city (city)
+    INDEX idx_city (city),
+    INDEX idx_created_at (created_at, supplier_id),
+    FULLTEXT INDEX ft_supplier_search (company_name, contact_person, city) WITH PARSER ngram
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- ============================================
@@ -80,8 +82,10 @@ CREATE TABLE products (
     -- Indexes for performance optimization
     INDEX idx_product_name (product_name),
     INDEX idx_sku (sku),
-    INDEX idx_category_id (category_id),
-    INDEX idx_supplier_id (supplier_id)
+    INDEX idx_category_created (category_id, created_at, product_id),
+    INDEX idx_supplier_created (supplier_id, created_at, product_id),
+    INDEX idx_created_at (created_at, product_id),
+    FULLTEXT INDEX ft_product_search (product_name, sku) WITH PARSER ngram
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- ============================================
@@ -109,7 +113,7 @@ CREATE TABLE inventory (
 
     -- Index
     INDEX idx_product_id (product_id),
-    INDEX idx_quantity (quantity_in_stock)
+    INDEX idx_quantity_product (quantity_in_stock, product_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- ============================================
@@ -117,34 +121,72 @@ CREATE TABLE inventory (
 -- Purpose: Record all inventory movements (stock in, stock out, adjustments)
 -- Normalization: 3NF - Transaction log with product reference
 -- Maintains audit trail of all inventory changes
+-- Partitioned by month on transaction_date (see migration 003); the
+-- partitioning column must be part of the primary key, and partitioned
+-- tables cannot have foreign keys (Product.delete checks for transactions)
 -- ============================================
 CREATE TABLE transactions (
-    transaction_id INT AUTO_INCREMENT PRIMARY KEY,
+    transaction_id INT AUTO_INCREMENT,
     product_id INT NOT NULL,
     transaction_type ENUM('STOCK_IN', 'STOCK_OUT', 'ADJUSTMENT') NOT NULL,
     quantity INT NOT NULL,
-    transaction_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    transaction_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     reference_number VARCHAR(50),
     remarks TEXT,
     created_by VARCHAR(50) NOT NULL,
 
+    PRIMARY KEY (transaction_id, transaction_date),
+
     -- Constraints
     CONSTRAINT chk_quantity CHECK (quantity > 0),
 
-    -- Foreign Key
-    CONSTRAINT fk_transactions_product
-        FOREIGN KEY (product_id)
-        REFERENCES products(product_id)
-        ON DELETE RESTRICT
-        ON UPDATE CASCADE,
-
     -- Indexes for performance (transaction queries are frequent)
-    INDEX idx_product_id (product_id),
-    INDEX idx_transaction_date (transaction_date),
-    INDEX idx_transaction_type (transaction_type),
+    INDEX idx_product_date (product_id, transaction_date, transaction_id),
+    INDEX idx_date_covering (transaction_date, transaction_id, transaction_type, product_id, quantity),
+    INDEX idx_type_date (transaction_type, transaction_date, transaction_id),
     INDEX idx_reference_number (reference_number)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+-- Monthly partitions are split off pmax by: flask --app run transaction-partitions maintain
+PARTITION BY RANGE (UNIX_TIMESTAMP(transaction_date)) (
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+);
+
+-- ============================================
+-- TABLE: transaction_daily_agg
+-- Purpose: Movements per day, product and type for summary reports
+-- Kept current by the triggers below (see migration 005); reports read it
+-- for past days and raw transactions only for today
+-- ============================================
+CREATE TABLE transaction_daily_agg (
+    agg_date DATE NOT NULL,
+    product_id INT NOT NULL,
+    transaction_type ENUM('STOCK_IN', 'STOCK_OUT', 'ADJUSTMENT') NOT NULL,
+    transaction_count INT NOT NULL DEFAULT 0,
+    total_quantity BIGINT NOT NULL DEFAULT 0,
+
+    PRIMARY KEY (agg_date, product_id, transaction_type),
+    INDEX idx_product_date (product_id, agg_date)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+CREATE TRIGGER trg_transactions_agg_insert
+    AFTER INSERT ON transactions
+    FOR EACH ROW
+    INSERT INTO transaction_daily_agg (agg_date, product_id, transaction_type, transaction_count, total_quantity)
+    VALUES (DATE(NEW.transaction_date), NEW.product_id, NEW.transaction_type, 1, NEW.quantity)
+    ON DUPLICATE KEY UPDATE
+        transaction_count = transaction_count + 1,
+        total_quantity = total_quantity + NEW.quantity;
+
+CREATE TRIGGER trg_transactions_agg_delete
+    AFTER DELETE ON transactions
+    FOR EACH ROW
+    UPDATE transaction_daily_agg
+    SET transaction_count = transaction_count - 1,
+        total_quantity = total_quantity - OLD.quantity
+    WHERE agg_date = DATE(OLD.transaction_date)
+        AND product_id = OLD.product_id
+        AND transaction_type = OLD.transaction_type;
+
 -- ============================================
 -- TABLE: users
 -- Purpose: Store user authentication and authorization data
@@ -166,6 +208,26 @@ CREATE TABLE users (
     INDEX idx_role (role)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- ============================================
+-- TABLE: schema_migrations
+-- Purpose: Migrations in database/migrations/ already applied, with their
+-- timings (flask --app run migrations apply)
+-- This schema already contains every migration listed below
+-- ============================================
+CREATE TABLE schema_migrations (
+    version VARCHAR(100) PRIMARY KEY,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    duration_ms INT,
+    timings JSON
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT INTO schema_migrations (version) VALUES
+    ('001_keyset_pagination_indexes'),
+    ('002_fulltext_search'),
+    ('003_partition_transactions'),
+    ('004_composite_indexes'),
+    ('005_transaction_daily_agg');
+
 -- ============================================
 -- NORMALIZATION DOCUMENTATION
 -- ============================================
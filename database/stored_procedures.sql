@@ -30,10 +30,11 @@ CREATE PROCEDURE sp_record_stock_in(
 )
 BEGIN
     DECLARE v_error_message VARCHAR(255);
+    -- Roll back and re-raise, so callers see the real error (and can retry deadlocks)
     DECLARE EXIT HANDLER FOR SQLEXCEPTION
     BEGIN
         ROLLBACK;
-        SELECT 'Error: Transaction failed. Stock not added.' AS error_message;
+        RESIGNAL;
     END;
 
     -- Start transaction
@@ -89,43 +90,46 @@ CREATE PROCEDURE sp_record_stock_out(
     IN p_created_by VARCHAR(50)
 )
 BEGIN
-    DECLARE v_current_stock INT;
+    DECLARE v_remaining_stock INT;
     DECLARE v_error_message VARCHAR(255);
+    -- Roll back and re-raise, so callers see the real error (and can retry deadlocks)
     DECLARE EXIT HANDLER FOR SQLEXCEPTION
     BEGIN
         ROLLBACK;
-        SELECT 'Error: Transaction failed. Stock not removed.' AS error_message;
+        RESIGNAL;
     END;
 
     -- Start transaction
     START TRANSACTION;
 
-    -- Validate product exists
-    IF NOT EXISTS (SELECT 1 FROM products WHERE product_id = p_product_id) THEN
-        SET v_error_message = CONCAT('Error: Product ID ', p_product_id, ' does not exist.');
-        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = v_error_message;
-    END IF;
-
     -- Validate quantity
     IF p_quantity <= 0 THEN
         SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Error: Quantity must be greater than 0.';
     END IF;
 
-    -- Get current stock
-    SELECT quantity_in_stock INTO v_current_stock
-    FROM inventory
-    WHERE product_id = p_product_id;
-
-    -- Check if sufficient stock available
-    IF v_current_stock IS NULL OR v_current_stock < p_quantity THEN
-        SET v_error_message = CONCAT('Error: Insufficient stock. Available: ', COALESCE(v_current_stock, 0), ', Requested: ', p_quantity);
-        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = v_error_message;
-    END IF;
-
-    -- Update inventory
+    -- Check and decrement in one statement: the UPDATE locks the row and only
+    -- succeeds while enough stock is left, so concurrent stock-outs cannot oversell
     UPDATE inventory
     SET quantity_in_stock = quantity_in_stock - p_quantity,
         last_updated = NOW()
+    WHERE product_id = p_product_id
+      AND quantity_in_stock >= p_quantity;
+
+    IF ROW_COUNT() = 0 THEN
+        IF NOT EXISTS (SELECT 1 FROM products WHERE product_id = p_product_id) THEN
+            SET v_error_message = CONCAT('Error: Product ID ', p_product_id, ' does not exist.');
+        ELSE
+            SELECT COALESCE(MAX(quantity_in_stock), 0) INTO v_remaining_stock
+            FROM inventory
+            WHERE product_id = p_product_id;
+            SET v_error_message = CONCAT('Error: Insufficient stock. Available: ', v_remaining_stock, ', Requested: ', p_quantity);
+        END IF;
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = v_error_message;
+    END IF;
+
+    -- Stock after the decrement (the row is locked by this transaction)
+    SELECT quantity_in_stock INTO v_remaining_stock
+    FROM inventory
     WHERE product_id = p_product_id;
 
     -- Record transaction
@@ -137,7 +141,7 @@ BEGIN
     SELECT
         CONCAT('Success: ', p_quantity, ' units removed from product ID ', p_product_id) AS success_message,
         LAST_INSERT_ID() AS transaction_id,
-        (v_current_stock - p_quantity) AS remaining_stock;
+        v_remaining_stock AS remaining_stock;
 END$$
 
 -- ============================================
@@ -160,10 +164,11 @@ CREATE PROCEDURE sp_adjust_stock(
 BEGIN
     DECLARE v_current_stock INT;
     DECLARE v_difference INT;
+    -- Roll back and re-raise, so callers see the real error (and can retry deadlocks)
     DECLARE EXIT HANDLER FOR SQLEXCEPTION
     BEGIN
         ROLLBACK;
-        SELECT 'Error: Adjustment failed.' AS error_message;
+        RESIGNAL;
     END;
 
     START TRANSACTION;
@@ -178,10 +183,11 @@ BEGIN
         SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Error: New quantity cannot be negative.';
     END IF;
 
-    -- Get current stock
+    -- Get current stock, locking the row until the adjustment commits
     SELECT COALESCE(quantity_in_stock, 0) INTO v_current_stock
     FROM inventory
-    WHERE product_id = p_product_id;
+    WHERE product_id = p_product_id
+    FOR UPDATE;
 
     -- Calculate difference
     SET v_difference = ABS(p_new_quantity - COALESCE(v_current_stock, 0));
@@ -326,7 +332,9 @@ BEGIN
     FROM transactions t
     INNER JOIN products p ON t.product_id = p.product_id
     WHERE t.product_id = p_product_id
-        AND DATE(t.transaction_date) BETWEEN p_start_date AND p_end_date
+        -- Half-open range on the column itself, so idx_product_date applies
+        AND t.transaction_date >= p_start_date
+        AND t.transaction_date < p_end_date + INTERVAL 1 DAY
     ORDER BY t.transaction_date DESC;
 END$$
 
@@ -351,7 +359,8 @@ BEGIN
         SUM(t.quantity * p.unit_price) AS total_value
     FROM transactions t
     INNER JOIN products p ON t.product_id = p.product_id
-    WHERE DATE(t.transaction_date) BETWEEN p_start_date AND p_end_date
+    WHERE t.transaction_date >= p_start_date
+        AND t.transaction_date < p_end_date + INTERVAL 1 DAY
     GROUP BY t.transaction_type
     ORDER BY t.transaction_type;
 END$$